@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Simple collision checking of serial robots against primitive obstacles (spheres and boxes).
+
+The obstacles can be built from the objects in the Coppelia scene (robots.objects.Sphere, robots.objects.Cuboid),
+however, the checks are computed in python, without calling the simulator.
+
+LinkCollisionChecker samples points along the links of a single configuration. CapsuleCollisionChecker approximates
+the links by capsules obtained from the DH frames and checks the obstacles and the self collisions of a batch of
+configurations at once (e.g. the configurations along an edge of a planner or the solutions of the inverse kinematics).
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+
+class SphereObstacle():
+    def __init__(self, center, radius):
+        self.center = np.array(center, dtype=float)
+        self.radius = radius
+
+    def distance(self, points):
+        """
+        Signed distance from an (N, 3) array of points to the surface of the sphere (negative inside).
+        """
+        return np.linalg.norm(points - self.center, axis=-1) - self.radius
+
+
+class BoxObstacle():
+    def __init__(self, center, size, R=None):
+        """
+        center: center of the box.
+        size: [dx, dy, dz] lengths of the box edges.
+        R: 3x3 orientation of the box (identity if None).
+        """
+        self.center = np.array(center, dtype=float)
+        self.half_size = np.array(size, dtype=float) / 2.0
+        if R is None:
+            R = np.eye(3)
+        self.R = np.array(R)
+
+    def distance(self, points):
+        """
+        Signed distance from an (N, 3) array of points to the surface of the box (negative inside).
+        """
+        # points in the box reference frame
+        p = np.dot(points - self.center, self.R)
+        q = np.abs(p) - self.half_size
+        outside = np.linalg.norm(np.maximum(q, 0.0), axis=-1)
+        inside = np.minimum(np.max(q, axis=-1), 0.0)
+        return outside + inside
+
+
+def sphere_from_object(obj, radius):
+    """
+    Builds a SphereObstacle from a CoppeliaObject (e.g. robots.objects.Sphere). The radius is not read from Coppelia.
+    """
+    T = obj.get_transform()
+    return SphereObstacle(center=T.pos(), radius=radius)
+
+
+def box_from_object(obj, size):
+    """
+    Builds a BoxObstacle from a CoppeliaObject (e.g. robots.objects.Cuboid). The size is not read from Coppelia.
+    """
+    T = obj.get_transform()
+    return BoxObstacle(center=T.pos(), size=size, R=T.R().toarray())
+
+
+def link_frames(robot, q):
+    """
+    Returns the origins (n+2, 3) of the DH reference systems of the robot: base, each link and the TCP.
+    """
+    T = robot.T0.toarray()
+    origins = [T[0:3, 3]]
+    T = np.dot(T, robot.serialrobot.T0.toarray())
+    for i in range(len(robot.serialrobot.transformations)):
+        T = np.dot(T, robot.serialrobot.dh(q, i).toarray())
+        origins.append(T[0:3, 3])
+    T = np.dot(T, robot.Ttcp.toarray())
+    origins.append(T[0:3, 3])
+    return np.array(origins)
+
+
+def link_points(robot, q, n_per_link=5):
+    """
+    Points sampled on the segments between consecutive link origins.
+    """
+    origins = link_frames(robot, q)
+    t = np.linspace(0, 1, n_per_link)[:, None]
+    points = [origins[i] + t * (origins[i + 1] - origins[i]) for i in range(len(origins) - 1)]
+    return np.concatenate(points, axis=0)
+
+
+class LinkCollisionChecker():
+    """
+    Checks the robot links (sampled as points on the segments that join the link origins) against a list of
+    obstacles. A configuration is free if all the points are at a distance larger than margin to all obstacles.
+    Any object with an is_free(q) method can be used as a collision checker by the planners.
+    """
+    def __init__(self, robot, obstacles, margin=0.05, n_per_link=5):
+        self.robot = robot
+        self.obstacles = obstacles
+        self.margin = margin
+        self.n_per_link = n_per_link
+
+    def min_distance(self, q):
+        points = link_points(self.robot, q, n_per_link=self.n_per_link)
+        d = np.inf
+        for obstacle in self.obstacles:
+            d = min(d, np.min(obstacle.distance(points)))
+        return d
+
+    def is_free(self, q):
+        return self.min_distance(q) > self.margin
+
+
+def batch_dh(qs, link):
+    """
+    DH transformations (B, 4, 4) of a SerialLink for a batch of joint values qs (B,).
+    """
+    if link.link_type == 'P':
+        theta = link.th * np.ones_like(qs)
+        d = qs + link.d
+    else:
+        theta = qs + link.th
+        d = link.d * np.ones_like(qs)
+    ct = np.cos(theta)
+    st = np.sin(theta)
+    ca = np.cos(link.alpha)
+    sa = np.sin(link.alpha)
+    A = np.zeros((len(qs), 4, 4))
+    A[:, 0, 0] = ct
+    A[:, 0, 1] = -ca * st
+    A[:, 0, 2] = sa * st
+    A[:, 0, 3] = link.a * ct
+    A[:, 1, 0] = st
+    A[:, 1, 1] = ca * ct
+    A[:, 1, 2] = -sa * ct
+    A[:, 1, 3] = link.a * st
+    A[:, 2, 1] = sa
+    A[:, 2, 2] = ca
+    A[:, 2, 3] = d
+    A[:, 3, 3] = 1
+    return A
+
+
+def closest_points_segment_point(a, b, p):
+    """
+    Closest points on the segments [a, b] to the points p. All arrays are (..., 3).
+    """
+    ab = b - a
+    t = np.sum((p - a) * ab, axis=-1) / np.maximum(np.sum(ab * ab, axis=-1), 1e-12)
+    t = np.clip(t, 0.0, 1.0)
+    return a + t[..., None] * ab
+
+
+def segment_segment_distance(p1, q1, p2, q2):
+    """
+    Distance between the segments [p1, q1] and [p2, q2]. All arrays are (..., 3).
+    Closest points between segments as in C. Ericson, Real-Time Collision Detection, vectorized.
+    """
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = np.sum(d1 * d1, axis=-1)
+    e = np.sum(d2 * d2, axis=-1)
+    f = np.sum(d2 * r, axis=-1)
+    c = np.sum(d1 * r, axis=-1)
+    b = np.sum(d1 * d2, axis=-1)
+    eps = 1e-12
+    denom = a * e - b * b
+    # s for non parallel segments, 0 if parallel
+    s = np.where(denom > eps, np.clip((b * f - c * e) / np.maximum(denom, eps), 0.0, 1.0), 0.0)
+    t = (b * s + f) / np.maximum(e, eps)
+    # clamp t and recompute s
+    s = np.where(t < 0.0, np.clip(-c / np.maximum(a, eps), 0.0, 1.0), s)
+    s = np.where(t > 1.0, np.clip((b - c) / np.maximum(a, eps), 0.0, 1.0), s)
+    t = np.clip(t, 0.0, 1.0)
+    # degenerate segments (points)
+    s = np.where(a <= eps, 0.0, s)
+    t = np.where(e <= eps, np.clip(f / np.maximum(e, eps), 0.0, 1.0) * (e > eps), t)
+    c1 = p1 + s[..., None] * d1
+    c2 = p2 + t[..., None] * d2
+    return np.linalg.norm(c1 - c2, axis=-1)
+
+
+def segment_box_distance(a, b, box):
+    """
+    Signed distance between the segments [a, b] (N, 3) and a BoxObstacle (negative if the segment enters the box).
+    If the segment does not cross the box, the closest points are at an end of the segment or on an edge of the box.
+    Inside the box, the signed distance along the segment is piecewise linear and its minimum is at an end of the
+    segment, at a kink of |p_i| or where two faces are at the same distance. All the candidates are evaluated.
+    """
+    # segments in the box reference frame, p(t) = u + t*v
+    u = np.dot(a - box.center, box.R)
+    v = np.dot(b - a, box.R)
+    h = box.half_size
+    # edges of the box: 4 parallel to each axis
+    starts = []
+    ends = []
+    for k in range(3):
+        i, j = [m for m in range(3) if m != k]
+        for si in (-1, 1):
+            for sj in (-1, 1):
+                start = np.zeros(3)
+                start[i] = si * h[i]
+                start[j] = sj * h[j]
+                start[k] = -h[k]
+                end = start.copy()
+                end[k] = h[k]
+                starts.append(start)
+                ends.append(end)
+    d_edges = segment_segment_distance(u[:, None, :], (u + v)[:, None, :], np.array(starts)[None], np.array(ends)[None])
+    # candidates t: ends, kinks and pairs of faces
+    eps = 1e-12
+    t = [np.zeros(len(u)), np.ones(len(u))]
+    for i in range(3):
+        t.append(-u[:, i] / np.where(np.abs(v[:, i]) > eps, v[:, i], np.inf))
+        for j in range(i + 1, 3):
+            for si in (-1, 1):
+                for sj in (-1, 1):
+                    denom = si * v[:, i] - sj * v[:, j]
+                    t.append((h[i] - h[j] - si * u[:, i] + sj * u[:, j]) / np.where(np.abs(denom) > eps, denom, np.inf))
+    t = np.clip(np.array(t).T, 0.0, 1.0)
+    points = np.dot(u[:, None, :] + t[:, :, None] * v[:, None, :], box.R.T) + box.center
+    d_candidates = box.distance(points)
+    return np.minimum(np.min(d_edges, axis=1), np.min(d_candidates, axis=1))
+
+
+class CapsuleCollisionChecker():
+    """
+    The links of the robot are approximated by capsules (segments with a radius). Each DH transformation produces
+    two segments: along z (d) and along x (a). Segments with zero length are removed.
+    The capsules are checked against the obstacles (spheres and boxes) and against each other (self collisions)
+    for a whole batch of configurations at once. A broadphase based on axis aligned bounding boxes avoids computing
+    the distances of pairs that are far away.
+    """
+    def __init__(self, robot, obstacles, radius=0.05, margin=0.0, self_collision=True, ignore_base=True,
+                 min_link_gap=2):
+        """
+        radius: radius of the capsules (a single value or one value per segment, see n_segments).
+        margin: configurations at a distance lower than margin are considered in collision.
+        ignore_base: the capsules that do not move (the base) are not checked against the obstacles (usually the
+                     robot is placed on the floor or a table).
+        min_link_gap: capsules closer than min_link_gap positions in the kinematic chain are not checked for
+                      self collisions (they are connected by a joint).
+        """
+        self.robot = robot
+        self.obstacles = obstacles
+        self.margin = margin
+        self.self_collision = self_collision
+        self.ignore_base = ignore_base
+        # points of the chain: base, then for each link (middle point, link origin), then the tcp
+        # middle point = origin of the previous system + d*z
+        # point index: 0 base, 1 serialrobot T0, 2+2i middle point of link i, 3+2i origin of link i, last tcp
+        links = robot.serialrobot.transformations
+        n_points = 3 + 2 * len(links)
+        # (start point, end point, link, length). The link is 0 for the base and DOF+1 for the tcp
+        candidates = [(0, 1, 0, np.linalg.norm(robot.serialrobot.T0.pos()))]
+        for i in range(len(links)):
+            length_d = 1.0 if (links[i].link_type == 'P' or links[i].d != 0) else 0.0
+            previous = 1 if i == 0 else 3 + 2 * (i - 1)
+            candidates.append((previous, 2 + 2 * i, i + 1, length_d))
+            candidates.append((2 + 2 * i, 3 + 2 * i, i + 1, abs(links[i].a)))
+        candidates.append((n_points - 2, n_points - 1, len(links) + 1, np.linalg.norm(robot.Ttcp.pos())))
+        segments = []
+        segment_links = []
+        for start, end, link, length in candidates:
+            if length > 0:
+                segments.append((start, end))
+                segment_links.append(link)
+        self.segments = np.array(segments)
+        self.segment_links = np.array(segment_links)
+        self.n_segments = len(segments)
+        self.n_points = n_points
+        self.radius = radius * np.ones(self.n_segments)
+        # the base and the first segment along z do not move with q (fixed base)
+        self.fixed = np.zeros(self.n_segments, dtype=bool)
+        self.fixed[self.segment_links == 0] = True
+        if len(links) and links[0].link_type == 'R' and links[0].d != 0:
+            self.fixed[np.where(self.segment_links == 1)[0][0]] = True
+        # pairs for self collision: capsules not consecutive in the chain. The pairs that are already in contact in
+        # the zero configuration (e.g. short offsets between joints) are not checked
+        pairs = []
+        for i in range(self.n_segments):
+            for j in range(i + min_link_gap, self.n_segments):
+                pairs.append((i, j))
+        self.pairs = np.array(pairs, dtype=int).reshape(-1, 2)
+        if len(self.pairs):
+            a, b = self.capsules(np.zeros(len(links)))
+            d = self.self_distances(a, b)[0]
+            self.pairs = self.pairs[d > self.margin]
+
+    def chain_points(self, qs):
+        """
+        Returns the points (B, n_points, 3) of the chain for a batch of configurations qs (B, DOF).
+        """
+        qs = np.atleast_2d(qs)
+        B = len(qs)
+        points = np.zeros((B, self.n_points, 3))
+        T = np.tile(self.robot.T0.toarray(), (B, 1, 1))
+        points[:, 0] = T[:, 0:3, 3]
+        T = np.matmul(T, self.robot.serialrobot.T0.toarray())
+        points[:, 1] = T[:, 0:3, 3]
+        links = self.robot.serialrobot.transformations
+        for i in range(len(links)):
+            d = qs[:, i] + links[i].d if links[i].link_type == 'P' else links[i].d * np.ones(B)
+            # middle point: origin + d*z of the previous system
+            points[:, 2 + 2 * i] = T[:, 0:3, 3] + d[:, None] * T[:, 0:3, 2]
+            T = np.matmul(T, batch_dh(qs[:, i], links[i]))
+            points[:, 3 + 2 * i] = T[:, 0:3, 3]
+        T = np.matmul(T, self.robot.Ttcp.toarray())
+        points[:, -1] = T[:, 0:3, 3]
+        return points
+
+    def capsules(self, qs):
+        points = self.chain_points(qs)
+        return points[:, self.segments[:, 0]], points[:, self.segments[:, 1]]
+
+    def obstacle_distances(self, a, b):
+        """
+        Distance (B, S, O) from each capsule to each obstacle, computed only for the pairs whose bounding boxes
+        overlap (inf otherwise).
+        """
+        B, S = a.shape[0], a.shape[1]
+        O = len(self.obstacles)
+        distances = np.full((B, S, O), np.inf)
+        lower = np.minimum(a, b) - (self.radius + self.margin)[None, :, None]
+        upper = np.maximum(a, b) + (self.radius + self.margin)[None, :, None]
+        for k in range(O):
+            obstacle = self.obstacles[k]
+            omin, omax = obstacle_aabb(obstacle)
+            overlap = np.all((lower <= omax) & (upper >= omin), axis=-1)
+            if self.ignore_base:
+                overlap[:, self.fixed] = False
+            bi, si = np.nonzero(overlap)
+            if len(bi) == 0:
+                continue
+            sa = a[bi, si]
+            sb = b[bi, si]
+            if isinstance(obstacle, SphereObstacle):
+                closest = closest_points_segment_point(sa, sb, obstacle.center)
+                d = obstacle.distance(closest)
+            else:
+                d = segment_box_distance(sa, sb, obstacle)
+            distances[bi, si, k] = d - self.radius[si]
+        return distances
+
+    def self_distances(self, a, b):
+        """
+        Distance (B, P) between the pairs of capsules (inf if their bounding boxes do not overlap).
+        """
+        B = a.shape[0]
+        i = self.pairs[:, 0]
+        j = self.pairs[:, 1]
+        distances = np.full((B, len(self.pairs)), np.inf)
+        r = self.radius + self.margin / 2
+        lower = np.minimum(a, b) - r[None, :, None]
+        upper = np.maximum(a, b) + r[None, :, None]
+        overlap = np.all((lower[:, i] <= upper[:, j]) & (upper[:, i] >= lower[:, j]), axis=-1)
+        bi, pi = np.nonzero(overlap)
+        if len(bi) == 0:
+            return distances
+        d = segment_segment_distance(a[bi, i[pi]], b[bi, i[pi]], a[bi, j[pi]], b[bi, j[pi]])
+        distances[bi, pi] = d - self.radius[i[pi]] - self.radius[j[pi]]
+        return distances
+
+    def check_batch(self, qs):
+        """
+        Returns a boolean array with True for the configurations in qs (B, DOF) that are free of collisions.
+        """
+        a, b = self.capsules(qs)
+        free = np.ones(len(a), dtype=bool)
+        if len(self.obstacles) > 0:
+            d = self.obstacle_distances(a, b)
+            free &= np.all(d.reshape(len(a), -1) > self.margin, axis=1)
+        if self.self_collision and len(self.pairs) > 0:
+            d = self.self_distances(a, b)
+            free &= np.all(d > self.margin, axis=1)
+        return free
+
+    def is_free(self, q):
+        return bool(self.check_batch(np.atleast_2d(q))[0])
+
+    def min_distance(self, q):
+        """
+        Minimum distance from the capsules to the obstacles (inf if no obstacle is close).
+        """
+        a, b = self.capsules(np.atleast_2d(q))
+        return np.min(self.obstacle_distances(a, b))
+
+
+def obstacle_aabb(obstacle):
+    """
+    Axis aligned bounding box of an obstacle.
+    """
+    if isinstance(obstacle, SphereObstacle):
+        return obstacle.center - obstacle.radius, obstacle.center + obstacle.radius
+    extent = np.dot(np.abs(obstacle.R), obstacle.half_size)
+    return obstacle.center - extent, obstacle.center + extent
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Signed distance field of a static scene.
+
+The distance to a set of primitive obstacles (artelib.collision.SphereObstacle, BoxObstacle) is precomputed on a
+regular 3D grid. Afterwards, the distance and its gradient at any point are obtained with a trilinear interpolation,
+so that obstacle avoidance terms can be computed without reading the distance from the simulator.
+
+NullSpaceObstacleAvoidance uses the field to compute a joint speed in the null space of the Jacobian that moves the
+links of the robot away from the obstacles.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.collision import CapsuleCollisionChecker, batch_dh
+from artelib.path_planning import potentials
+from artelib.tools import null_space_projector
+
+
+class DistanceField():
+    def __init__(self, obstacles, pmin, pmax, resolution=0.02):
+        """
+        obstacles: list of obstacles with a distance(points) method.
+        pmin, pmax: corners of the box (m) where the field is computed.
+        resolution: size of the cells of the grid (m).
+        """
+        self.pmin = np.array(pmin, dtype=float)
+        self.resolution = resolution
+        self.shape = np.ceil((np.array(pmax, dtype=float) - self.pmin) / resolution).astype(int) + 1
+        self.pmax = self.pmin + (self.shape - 1) * resolution
+        self.field = self.compute(obstacles)
+
+    def compute(self, obstacles):
+        axes = [self.pmin[i] + self.resolution * np.arange(self.shape[i]) for i in range(3)]
+        X, Y, Z = np.meshgrid(axes[0], axes[1], axes[2], indexing='ij')
+        points = np.stack((X.ravel(), Y.ravel(), Z.ravel()), axis=-1)
+        field = np.full(len(points), np.inf)
+        for obstacle in obstacles:
+            field = np.minimum(field, obstacle.distance(points))
+        return field.reshape(self.shape)
+
+    def query(self, points):
+        """
+        Returns the distance (N,) and its gradient (N, 3) at the points (N, 3).
+        Outside the grid, the distance to the grid is added to the distance at the closest point of the grid.
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        clipped = np.clip(points, self.pmin, self.pmax)
+        outside = np.linalg.norm(points - clipped, axis=1)
+        u = (clipped - self.pmin) / self.resolution
+        i0 = np.clip(np.floor(u).astype(int), 0, self.shape - 2)
+        f = u - i0
+        x, y, z = f[:, 0], f[:, 1], f[:, 2]
+        i, j, k = i0[:, 0], i0[:, 1], i0[:, 2]
+        F = self.field
+        c000 = F[i, j, k]
+        c100 = F[i + 1, j, k]
+        c010 = F[i, j + 1, k]
+        c110 = F[i + 1, j + 1, k]
+        c001 = F[i, j, k + 1]
+        c101 = F[i + 1, j, k + 1]
+        c011 = F[i, j + 1, k + 1]
+        c111 = F[i + 1, j + 1, k + 1]
+        # interpolate along x, then y, then z
+        c00 = c000 + x * (c100 - c000)
+        c10 = c010 + x * (c110 - c010)
+        c01 = c001 + x * (c101 - c001)
+        c11 = c011 + x * (c111 - c011)
+        c0 = c00 + y * (c10 - c00)
+        c1 = c01 + y * (c11 - c01)
+        d = c0 + z * (c1 - c0)
+        # derivatives of the interpolation
+        gx = (1 - y) * (1 - z) * (c100 - c000) + y * (1 - z) * (c110 - c010) + \
+             (1 - y) * z * (c101 - c001) + y * z * (c111 - c011)
+        gy = (1 - z) * (c10 - c00) + z * (c11 - c01)
+        gz = c1 - c0
+        gradient = np.stack((gx, gy, gz), axis=-1) / self.resolution
+        return d + outside, gradient
+
+    def distance(self, points):
+        d, _ = self.query(points)
+        return d
+
+    def gradient(self, points):
+        _, g = self.query(points)
+        return g
+
+
+class NullSpaceObstacleAvoidance():
+    """
+    Computes a joint speed that increases the distance of the links to the obstacles without modifying the position
+    and orientation of the end effector. Each link is approximated by the segments of a CapsuleCollisionChecker.
+    Each point p on the links is pushed by a force f = potential(d)*grad(d), that is mapped to the joints as
+    qd0 = sum(Jp^T f). Finally qd0 is projected on the null space of the manipulator Jacobian.
+    """
+    def __init__(self, robot, field, n_per_segment=5, K=0.03, rs=0.1, rmax=0.6):
+        self.robot = robot
+        self.field = field
+        self.capsules = CapsuleCollisionChecker(robot, [], self_collision=False)
+        self.t = np.linspace(0, 1, n_per_segment)
+        self.K = K
+        self.rs = rs
+        self.rmax = rmax
+        # number of joints that move each point of the chain (see CapsuleCollisionChecker.chain_points)
+        links = robot.serialrobot.transformations
+        moved_by = [0, 0]
+        for i in range(len(links)):
+            moved_by.append(i + 1 if links[i].link_type == 'P' else i)
+            moved_by.append(i + 1)
+        moved_by.append(len(links))
+        self.moved_by = np.array(moved_by)
+
+    def joint_frames(self, q):
+        """
+        Origins and z axes (n, 3) of the reference systems where each joint acts.
+        """
+        links = self.robot.serialrobot.transformations
+        T = np.dot(self.robot.T0.toarray(), self.robot.serialrobot.T0.toarray())
+        origins = []
+        axes = []
+        for i in range(len(links)):
+            origins.append(T[0:3, 3])
+            axes.append(T[0:3, 2])
+            T = np.dot(T, batch_dh(np.array([q[i]]), links[i])[0])
+        return np.array(origins), np.array(axes)
+
+    def points_jacobians(self, q):
+        """
+        Points (N, 3) sampled on the links and their position Jacobians (N, 3, DOF).
+        """
+        links = self.robot.serialrobot.transformations
+        chain = self.capsules.chain_points(q)[0]
+        origins, axes = self.joint_frames(q)
+        # Jacobians of the points of the chain
+        Jc = np.zeros((len(chain), 3, len(links)))
+        for j in range(len(links)):
+            moved = self.moved_by > j
+            if links[j].link_type == 'P':
+                Jc[moved, :, j] = axes[j]
+            else:
+                Jc[moved, :, j] = np.cross(axes[j], chain[moved] - origins[j])
+        # the points and their Jacobians are interpolated along each segment
+        start = self.capsules.segments[:, 0]
+        end = self.capsules.segments[:, 1]
+        t = self.t[None, :, None]
+        points = chain[start][:, None, :] + t * (chain[end] - chain[start])[:, None, :]
+        t = self.t[None, :, None, None]
+        J = Jc[start][:, None] + t * (Jc[end] - Jc[start])[:, None]
+        return points.reshape(-1, 3), J.reshape(-1, 3, len(links))
+
+    def min_distance(self, q):
+        a, b = self.capsules.capsules(q)
+        t = self.t[None, None, :, None]
+        points = a[:, :, None, :] + t * (b - a)[:, :, None, :]
+        return np.min(self.field.distance(points.reshape(-1, 3)))
+
+    def compute(self, q):
+        """
+        Returns the joint speed in the null space and the minimum distance of the links to the obstacles.
+        """
+        points, J = self.points_jacobians(q)
+        d, gradient = self.field.query(points)
+        f = potentials(d, K=self.K, rs=self.rs, rmax=self.rmax)[:, None] * gradient
+        qd0 = np.einsum('nij,ni->j', J, f)
+        Jm, _, _ = self.robot.manipulator_jacobian(q)
+        P = null_space_projector(Jm)
+        return np.dot(P, qd0), np.min(d)
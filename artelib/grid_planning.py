@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Global path planning on 2D occupancy grids (A* and Dijkstra).
+
+The grids are boolean arrays indexed as occupied[row, col] (see artelib.occupancy_grid). The planners work on flat
+cell indices with a binary heap and precomputed neighbor offsets. An optional cost map (e.g. computed from the
+distance transform of the obstacles) keeps the paths away from the obstacles.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import heapq
+import numpy as np
+
+# neighbor offsets (drow, dcol) and the length of each movement
+NEIGHBORS_4 = [(-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0)]
+NEIGHBORS_8 = NEIGHBORS_4 + [(-1, -1, np.sqrt(2)), (-1, 1, np.sqrt(2)), (1, -1, np.sqrt(2)), (1, 1, np.sqrt(2))]
+
+
+def distance_transform(occupied, max_distance=None):
+    """
+    Chamfer (3-4) distance in cells from each free cell to the closest occupied cell.
+    The distance is propagated with whole array operations, max_distance (cells) limits the number of
+    iterations, since the cost is only needed close to the obstacles. Farther cells keep the value max_distance.
+    """
+    n_rows, n_cols = occupied.shape
+    if max_distance is None:
+        max_distance = n_rows + n_cols
+    d = np.where(occupied, 0.0, np.inf)
+    for i in range(int(np.ceil(max_distance))):
+        d_prev = d
+        d = d.copy()
+        # orthogonal neighbors
+        d[1:, :] = np.minimum(d[1:, :], d_prev[:-1, :] + 1)
+        d[:-1, :] = np.minimum(d[:-1, :], d_prev[1:, :] + 1)
+        d[:, 1:] = np.minimum(d[:, 1:], d_prev[:, :-1] + 1)
+        d[:, :-1] = np.minimum(d[:, :-1], d_prev[:, 1:] + 1)
+        # diagonal neighbors
+        diag = 4.0 / 3.0
+        d[1:, 1:] = np.minimum(d[1:, 1:], d_prev[:-1, :-1] + diag)
+        d[1:, :-1] = np.minimum(d[1:, :-1], d_prev[:-1, 1:] + diag)
+        d[:-1, 1:] = np.minimum(d[:-1, 1:], d_prev[1:, :-1] + diag)
+        d[:-1, :-1] = np.minimum(d[:-1, :-1], d_prev[1:, 1:] + diag)
+        if np.array_equal(d, d_prev):
+            break
+    return np.minimum(d, max_distance)
+
+
+def clearance_cost(occupied, robot_radius, influence_radius, weight=5.0):
+    """
+    Build a cost map from the distance transform (all distances in cells).
+    Cells closer than robot_radius to an obstacle are not traversable (cost inf).
+    The cost decreases linearly from weight at robot_radius to zero at influence_radius.
+    """
+    d = distance_transform(occupied, max_distance=influence_radius)
+    cost = weight * np.clip((influence_radius - d) / max(influence_radius - robot_radius, 1e-9), 0.0, 1.0)
+    cost[d < robot_radius] = np.inf
+    return cost
+
+
+def astar(occupied, start, goal, connectivity=8, cost_map=None, heuristic_weight=1.0):
+    """
+    Find a path between the start and goal cells (row, col).
+    The cost of a movement is its length times (1 + cost_map[cell]) at the destination cell.
+    heuristic_weight=0 turns the planner into Dijkstra, values > 1 find paths faster, but not optimal.
+    Diagonal movements are not allowed if they cut the corner of an occupied cell.
+    Returns an (N, 2) array with the cells of the path or None if the goal cannot be reached.
+    Raises ValueError if the start or the goal cell is out of the grid or occupied (or has an infinite cost).
+    """
+    n_rows, n_cols = occupied.shape
+    for name, cell in (('START', start), ('GOAL', goal)):
+        if not (0 <= int(cell[0]) < n_rows and 0 <= int(cell[1]) < n_cols):
+            raise ValueError('GRID PLANNER ERROR: %s CELL %s IS OUT OF THE GRID (%d x %d)' % (name, tuple(cell),
+                                                                                               n_rows, n_cols))
+    blocked = occupied.reshape(-1)
+    if cost_map is not None:
+        blocked = blocked | np.isinf(cost_map.reshape(-1))
+        extra = cost_map.reshape(-1).tolist()
+    else:
+        extra = None
+    blocked = blocked.tolist()
+    s = int(start[0]) * n_cols + int(start[1])
+    g = int(goal[0]) * n_cols + int(goal[1])
+    if blocked[s] or blocked[g]:
+        raise ValueError('GRID PLANNER ERROR: %s CELL IS OCCUPIED' % ('START' if blocked[s] else 'GOAL'))
+    neighbors = NEIGHBORS_8 if connectivity == 8 else NEIGHBORS_4
+    # precompute the flat offsets
+    offsets = [(dr, dc, dr * n_cols + dc, length) for dr, dc, length in neighbors]
+    goal_row, goal_col = divmod(g, n_cols)
+    sqrt2_minus_2 = np.sqrt(2) - 2
+
+    def heuristic(row, col):
+        dr = abs(row - goal_row)
+        dc = abs(col - goal_col)
+        if connectivity == 8:
+            # octile distance
+            return heuristic_weight * (dr + dc + sqrt2_minus_2 * min(dr, dc))
+        return heuristic_weight * (dr + dc)
+
+    cost_so_far = {s: 0.0}
+    parent = {s: -1}
+    closed = bytearray(n_rows * n_cols)
+    heap = [(heuristic(*divmod(s, n_cols)), 0.0, s)]
+    while heap:
+        f, cost, current = heapq.heappop(heap)
+        if current == g:
+            break
+        if closed[current]:
+            continue
+        closed[current] = 1
+        row, col = divmod(current, n_cols)
+        for dr, dc, offset, length in offsets:
+            r = row + dr
+            c = col + dc
+            if r < 0 or r >= n_rows or c < 0 or c >= n_cols:
+                continue
+            n = current + offset
+            if blocked[n] or closed[n]:
+                continue
+            if dr != 0 and dc != 0 and (blocked[current + dr * n_cols] or blocked[current + dc]):
+                continue
+            if extra is None:
+                new_cost = cost + length
+            else:
+                new_cost = cost + length * (1.0 + extra[n])
+            if new_cost < cost_so_far.get(n, np.inf):
+                cost_so_far[n] = new_cost
+                parent[n] = current
+                heapq.heappush(heap, (new_cost + heuristic(r, c), new_cost, n))
+    if g not in parent:
+        print('GRID PLANNER ERROR: THE GOAL CANNOT BE REACHED')
+        return None
+    path = []
+    n = g
+    while n != -1:
+        path.append(divmod(n, n_cols))
+        n = parent[n]
+    return np.array(path[::-1])
+
+
+def dijkstra(occupied, start, goal, connectivity=8, cost_map=None):
+    """
+    A* without heuristic (see astar).
+    """
+    return astar(occupied, start, goal, connectivity=connectivity, cost_map=cost_map, heuristic_weight=0.0)
+
+
+def line_of_sight(occupied, cell_a, cell_b):
+    """
+    Returns True if the straight line between both cells does not cross any occupied cell.
+    """
+    n = int(np.max(np.abs(np.array(cell_b) - np.array(cell_a)))) * 2 + 1
+    rows = np.round(np.linspace(cell_a[0], cell_b[0], n)).astype(int)
+    cols = np.round(np.linspace(cell_a[1], cell_b[1], n)).astype(int)
+    return not np.any(occupied[rows, cols])
+
+
+def simplify_path(occupied, path):
+    """
+    Remove the cells of the path that can be skipped by going straight (line of sight) to a later cell.
+    """
+    if path is None or len(path) <= 2:
+        return path
+    simplified = [path[0]]
+    i = 0
+    while i < len(path) - 1:
+        j = i + 1
+        # advance while the next cell is visible from cell i
+        while j < len(path) - 1 and line_of_sight(occupied, path[i], path[j + 1]):
+            j += 1
+        simplified.append(path[j])
+        i = j
+    return np.array(simplified)
+
+
+def plan_waypoints(grid, start, goal, robot_radius=0.4, influence_radius=1.0, z=0.0, occupied=None):
+    """
+    Plan on an OccupancyGrid between the XY positions start and goal.
+    robot_radius and influence_radius (m) are used to build the clearance cost map.
+    Returns an (N, 3) array of waypoints [x, y, z], that can be followed, for example, with HuskyRobot.goto2.
+    """
+    if occupied is None:
+        occupied = grid.get_occupied()
+    cost_map = clearance_cost(occupied, robot_radius=robot_radius / grid.resolution,
+                              influence_radius=influence_radius / grid.resolution)
+    rows, cols = grid.world_to_cell(np.array([start[0:2], goal[0:2]]))
+    path = astar(occupied, (rows[0], cols[0]), (rows[1], cols[1]), cost_map=cost_map)
+    if path is None:
+        return None
+    # check line of sight against the inflated obstacles
+    path = simplify_path(np.isinf(cost_map), path)
+    xy = grid.cell_to_world(path[:, 0], path[:, 1])
+    # the first cell is the start of the robot
+    xy = xy[1:]
+    return np.column_stack((xy, z * np.ones(len(xy))))
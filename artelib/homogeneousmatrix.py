@@ -9,7 +9,6 @@ import numpy as np
 # from artelib.euler import Euler
 from artelib.tools import rot2quaternion, buildT
 from artelib import quaternion, rotationmatrix, euler, vector
-import matplotlib.pyplot as plt
 
 
 class HomogeneousMatrix():
@@ -113,6 +112,7 @@ class HomogeneousMatrix():
         """
         Plot a rotation and translation using matplotlib's quiver method
         """
+        import matplotlib.pyplot as plt
         fig = plt.figure()
         ax = fig.add_subplot(projection='3d')
         # first drawing the "-" . Next drawing two lines for each head ">"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Numerical integration of ordinary differential equations dx/dt = f(t, x).
+
+The state x is a numpy array: (n,) for a single system or (B, n) for a batch of B initial conditions, that are
+integrated at the same time. f must accept and return arrays with the same shape as x.
+
+- euler_step, rk4_step: fixed step methods (as in runge_kutta/euler_example1.py and runge_kutta/rk4_example1.py).
+- rk45_step: Dormand-Prince step. Returns the fifth order solution and an estimate of its error.
+- integrate: fixed step integration, returns the state at every step.
+- integrate_adaptive: RK45 with error control. The step is common to the whole batch and is chosen with the largest
+  error of the batch.
+
+arm_dynamics and planar_base build f for the forward dynamics of an arm (artelib.dynamics.RobotDynamics) and for the
+kinematics of a mobile base, so that they can be simulated offline, without Coppelia.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+# Dormand-Prince coefficients
+DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DP_A = [[],
+        [1 / 5],
+        [3 / 40, 9 / 40],
+        [44 / 45, -56 / 15, 32 / 9],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+        [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]]
+# fifth order solution and difference with the fourth order solution
+DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_E = DP_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def euler_step(f, t, x, h):
+    return x + h * f(t, x)
+
+
+def rk4_step(f, t, x, h):
+    f1 = h * f(t, x)
+    f2 = h * f(t + h / 2, x + f1 / 2)
+    f3 = h * f(t + h / 2, x + f2 / 2)
+    f4 = h * f(t + h, x + f3)
+    return x + (1 / 6) * (f1 + 2 * f2 + 2 * f3 + f4)
+
+
+def rk45_step(f, t, x, h):
+    """
+    Dormand-Prince step. Returns the new state (fifth order) and the estimated error (same shape as x).
+    """
+    k = []
+    for i in range(7):
+        xi = x
+        for j in range(i):
+            if DP_A[i][j] != 0:
+                xi = xi + h * DP_A[i][j] * k[j]
+        k.append(f(t + DP_C[i] * h, xi))
+    x_new = x + h * sum(DP_B[i] * k[i] for i in range(6))
+    error = h * sum(DP_E[i] * k[i] for i in range(7) if DP_E[i] != 0)
+    return x_new, error
+
+
+STEPS = {'euler': euler_step,
+         'rk4': rk4_step}
+
+
+def integrate(f, x0, t0, t1, h, method='rk4'):
+    """
+    Integrates from t0 to t1 with a fixed step h (the last step is shortened to reach t1).
+    Returns the times t (m,) and the states (m, ...) (one row per time, for a single system or a batch).
+    """
+    if method not in STEPS:
+        raise Exception('Unknown integration method: ' + str(method))
+    step = STEPS[method]
+    n = int(np.ceil((t1 - t0) / h - 1e-9))
+    ts = np.minimum(t0 + h * np.arange(n + 1), t1)
+    xs = np.zeros((n + 1,) + np.shape(x0))
+    x = np.array(x0, dtype=float)
+    xs[0] = x
+    for i in range(n):
+        x = step(f, ts[i], x, ts[i + 1] - ts[i])
+        xs[i + 1] = x
+    return ts, xs
+
+
+def integrate_adaptive(f, x0, t0, t1, h=None, rtol=1e-6, atol=1e-8, max_step=np.inf, max_iterations=100000):
+    """
+    Integrates from t0 to t1 with the Dormand-Prince method and step size control. A step is accepted if the error
+    of every component of every system of the batch is lower than atol + rtol*|x|.
+    Returns the accepted times t (m,), the states (m, ...) and the number of rejected steps.
+    """
+    x = np.array(x0, dtype=float)
+    t = t0
+    if h is None:
+        h = min(0.01 * (t1 - t0), max_step)
+    ts = [t]
+    xs = [x]
+    rejected = 0
+    for i in range(max_iterations):
+        if t >= t1:
+            break
+        h = min(h, t1 - t, max_step)
+        x_new, error = rk45_step(f, t, x, h)
+        scale = atol + rtol * np.maximum(np.abs(x), np.abs(x_new))
+        e = np.amax(np.abs(error) / scale)
+        if e <= 1.0:
+            t = t + h
+            x = x_new
+            ts.append(t)
+            xs.append(x)
+        else:
+            rejected += 1
+        # new step with a safety factor, limiting the change of the step size
+        factor = 5.0 if e == 0 else 0.9 * e ** (-1 / 5)
+        h = h * min(5.0, max(0.2, factor))
+    else:
+        print('INTEGRATE_ADAPTIVE: MAX ITERATIONS REACHED AT t=', t)
+    return np.array(ts), np.array(xs), rejected
+
+
+def arm_dynamics(dynamics, torques=None):
+    """
+    Returns f(t, x) for the forward dynamics of an arm, with the state x = [q, qd] ((2n,) or (B, 2n)).
+    dynamics: artelib.dynamics.RobotDynamics.
+    torques: function tau(t, q, qd) that returns the joint torques (e.g. a controller). None: zero torques (the
+             robot falls with the gravity).
+    """
+    n = dynamics.n
+
+    def f(t, x):
+        x2 = np.atleast_2d(x)
+        q = x2[:, 0:n]
+        qd = x2[:, n:]
+        if torques is None:
+            tau = np.zeros(q.shape)
+        else:
+            tau = torques(t, q, qd)
+        qdd = dynamics.forward_dynamics(q, qd, tau)
+        return np.hstack((qd, qdd)).reshape(np.shape(x))
+    return f
+
+
+def planar_base(speeds):
+    """
+    Returns f(t, x) for the kinematics of a mobile base, with the pose x = [x, y, theta] ((3,) or (B, 3)).
+    speeds: function u(t) that returns the speed [vx, vy, w] in the robot frame (a (3,) or a (B, 3) array).
+    """
+    def f(t, x):
+        u = np.asarray(speeds(t))
+        c = np.cos(x[..., 2])
+        s = np.sin(x[..., 2])
+        return np.stack((c * u[..., 0] - s * u[..., 1],
+                         s * u[..., 0] + c * u[..., 1],
+                         np.broadcast_to(u[..., 2], c.shape)), axis=-1)
+    return f
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Joint speed controllers.
+
+The joints in Coppelia are commanded in speed. JointPID computes the speed command of all the joints at once:
+the planned speed (feedforward) plus a PID correction on the position error, with a gain per joint.
+The state (integral and last error) is stored in numpy arrays.
+
+JointModel is a simple model of a speed controlled joint (first order response to the command and max speed) that
+allows tuning the controllers without a simulator (see tests/joint_control_benchmark.py).
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+
+class JointPID():
+    def __init__(self, kp, ki, kd, kff=1.0, integral_limit=None, output_limit=None, delta_time=0.05):
+        """
+        kp, ki, kd: gains (a value for all joints or an array with a value per joint).
+        kff: gain of the speed feedforward.
+        integral_limit: max absolute value of the integral of the error of each joint (anti windup).
+        output_limit: max absolute speed command of each joint (e.g. the max joint speeds). The integral is not
+                      updated while the command is saturated (anti windup).
+        """
+        self.kp = np.array(kp, dtype=float)
+        self.ki = np.array(ki, dtype=float)
+        self.kd = np.array(kd, dtype=float)
+        self.kff = np.array(kff, dtype=float)
+        self.integral_limit = integral_limit
+        self.output_limit = output_limit
+        self.delta_time = delta_time
+        self.integral = 0.0
+        self.e_prev = 0.0
+
+    def reset(self):
+        """
+        Call before following a new trajectory.
+        """
+        self.integral = 0.0
+        self.e_prev = 0.0
+
+    def compute(self, q_ref, qd_ref, q):
+        """
+        Speed command for the joints given the reference position and speed and the current position.
+        """
+        e = q_ref - q
+        de = (e - self.e_prev) / self.delta_time
+        self.e_prev = e
+        integral = self.integral + e * self.delta_time
+        if self.integral_limit is not None:
+            integral = np.clip(integral, -self.integral_limit, self.integral_limit)
+        u = self.kff * qd_ref + self.kp * e + self.ki * integral + self.kd * de
+        if self.output_limit is not None:
+            saturated = np.abs(u) > self.output_limit
+            u = np.clip(u, -self.output_limit, self.output_limit)
+            # conditional integration: keep the integral of the saturated joints
+            integral = np.where(saturated, self.integral, integral)
+        self.integral = integral
+        return u
+
+
+class JointModel():
+    """
+    Joints commanded in speed. The speed of each joint follows the command with a first order response (time
+    constant tau) and is limited to qdmax.
+    """
+    def __init__(self, n, tau=0.03, qdmax=None, delta_time=0.05):
+        self.q = np.zeros(n)
+        self.qd = np.zeros(n)
+        self.tau = tau
+        self.qdmax = qdmax
+        self.delta_time = delta_time
+
+    def step(self, u):
+        if self.qdmax is not None:
+            u = np.clip(u, -self.qdmax, self.qdmax)
+        alpha = 1 - np.exp(-self.delta_time / self.tau)
+        qd = self.qd + alpha * (u - self.qd)
+        self.q = self.q + 0.5 * (self.qd + qd) * self.delta_time
+        self.qd = qd
+        return self.q, self.qd
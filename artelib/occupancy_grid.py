@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+A 2D occupancy grid that accumulates laser scans using a log-odds representation.
+
+Cells are indexed as grid[row, col], with row along the Y axis and col along the X axis.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+
+class OccupancyGrid():
+    def __init__(self, xmin, ymin, width, height, resolution=0.05):
+        """
+        xmin, ymin: coordinates (m) of the lower left corner of the grid.
+        width, height: size of the grid (m).
+        resolution: size of each cell (m).
+        """
+        self.xmin = xmin
+        self.ymin = ymin
+        self.resolution = resolution
+        self.n_cols = int(np.ceil(width / resolution))
+        self.n_rows = int(np.ceil(height / resolution))
+        self.log_odds = np.zeros((self.n_rows, self.n_cols))
+        # log odds added on each hit/miss and saturation values
+        self.l_occ = 0.85
+        self.l_free = -0.4
+        self.l_min = -4.0
+        self.l_max = 4.0
+
+    def world_to_cell(self, points):
+        """
+        Returns the (row, col) indices of an (N, 2) array of XY points.
+        """
+        points = np.asarray(points)
+        cols = np.floor((points[..., 0] - self.xmin) / self.resolution).astype(int)
+        rows = np.floor((points[..., 1] - self.ymin) / self.resolution).astype(int)
+        return rows, cols
+
+    def cell_to_world(self, rows, cols):
+        """
+        Returns the XY coordinates of the center of the cells.
+        """
+        x = self.xmin + (np.asarray(cols) + 0.5) * self.resolution
+        y = self.ymin + (np.asarray(rows) + 0.5) * self.resolution
+        return np.column_stack((x, y))
+
+    def inside(self, rows, cols):
+        return (rows >= 0) & (rows < self.n_rows) & (cols >= 0) & (cols < self.n_cols)
+
+    def add_scan(self, scan, pose, max_range=5.0):
+        """
+        Accumulates a LaserScan taken at pose = [x, y, theta] (pose of the sensor in the global frame).
+        The cells at the end of each beam are marked as occupied, the cells traversed by the beam are marked as free.
+        Beams at max_range (no detection) only mark free space.
+        """
+        ranges = np.minimum(np.where(np.isfinite(scan.ranges), scan.ranges, max_range), max_range)
+        angles = scan.angles + pose[2]
+        # sample all beams at half the resolution at once
+        n_samples = int(np.ceil(max_range / (0.5 * self.resolution)))
+        t = np.linspace(0, 1, n_samples, endpoint=False)
+        d = ranges[:, None] * t[None, :]
+        xs = pose[0] + d * np.cos(angles)[:, None]
+        ys = pose[1] + d * np.sin(angles)[:, None]
+        rows, cols = self.world_to_cell(np.stack((xs, ys), axis=-1))
+        valid = self.inside(rows, cols)
+        free = np.unique(rows[valid] * self.n_cols + cols[valid])
+        # hits
+        hit = ranges < max_range
+        hx = pose[0] + ranges[hit] * np.cos(angles[hit])
+        hy = pose[1] + ranges[hit] * np.sin(angles[hit])
+        hrows, hcols = self.world_to_cell(np.column_stack((hx, hy)))
+        valid = self.inside(hrows, hcols)
+        occupied = np.unique(hrows[valid] * self.n_cols + hcols[valid])
+        # each cell is updated once per scan
+        free = np.setdiff1d(free, occupied, assume_unique=True)
+        flat = self.log_odds.reshape(-1)
+        flat[free] += self.l_free
+        flat[occupied] += self.l_occ
+        np.clip(self.log_odds, self.l_min, self.l_max, out=self.log_odds)
+
+    def get_probability(self):
+        return 1.0 - 1.0 / (1.0 + np.exp(self.log_odds))
+
+    def get_occupied(self, threshold=0.65):
+        """
+        Returns a boolean grid with the occupied cells.
+        """
+        return self.get_probability() > threshold
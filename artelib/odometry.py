@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Wheel odometry for mobile robots.
+
+The pose [x, y, theta] of the robot is obtained by integrating the speed of the wheels. The kinematic model is
+integrated with Euler or with a fourth order Runge-Kutta (RK4) method (artelib.integrators).
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.integrators import euler_step, rk4_step, planar_base
+
+
+class Odometry():
+    """
+    Base class. The derived classes compute the speed of the robot u = [vx, vy, w] from the wheel speeds.
+    """
+    def __init__(self, pose=None, method='rk4'):
+        if pose is None:
+            pose = [0, 0, 0]
+        self.pose = np.array(pose, dtype=float)
+        self.method = method
+        self.t = 0.0
+
+    def reset(self, pose=None):
+        if pose is None:
+            pose = [0, 0, 0]
+        self.pose = np.array(pose, dtype=float)
+        self.t = 0.0
+
+    def wheels_to_speed(self, wheel_speeds):
+        raise Exception('wheels_to_speed must be implemented in the derived class')
+
+    def update(self, wheel_speeds, dt):
+        """
+        Integrates the wheel speeds (rad/s) during dt seconds. Returns the new pose [x, y, theta].
+        """
+        u = self.wheels_to_speed(wheel_speeds)
+        f = planar_base(lambda t: u)
+        if self.method == 'rk4':
+            self.pose = rk4_step(f, self.t, self.pose, dt)
+        else:
+            self.pose = euler_step(f, self.t, self.pose, dt)
+        self.pose[2] = np.arctan2(np.sin(self.pose[2]), np.cos(self.pose[2]))
+        self.t += dt
+        return self.pose
+
+
+class DifferentialOdometry(Odometry):
+    def __init__(self, wheel_radius, width, pose=None, method='rk4'):
+        """
+        wheel_radius: radius of the wheels (m)
+        width: distance between the left and right wheels (m)
+        """
+        Odometry.__init__(self, pose=pose, method=method)
+        self.wheel_radius = wheel_radius
+        self.width = width
+
+    def wheels_to_speed(self, wheel_speeds):
+        """
+        wheel_speeds = [wl, wr]
+        """
+        wl, wr = wheel_speeds
+        v = self.wheel_radius * (wr + wl) / 2
+        w = self.wheel_radius * (wr - wl) / self.width
+        return np.array([v, 0.0, w])
+
+
+class MecanumOdometry(Odometry):
+    def __init__(self, wheel_matrix, pose=None, method='rk4'):
+        """
+        wheel_matrix: (4, 3) matrix that maps the speed of the robot [vx, vy, w] to the speed of the four wheels
+        (rad/s). The speed of the robot is computed with its pseudoinverse.
+        """
+        Odometry.__init__(self, pose=pose, method=method)
+        self.wheel_matrix = np.array(wheel_matrix)
+        self.inverse_wheel_matrix = np.linalg.pinv(self.wheel_matrix)
+
+    def wheels_to_speed(self, wheel_speeds):
+        return np.dot(self.inverse_wheel_matrix, np.array(wheel_speeds))
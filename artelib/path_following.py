@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Path following for unicycle-like mobile robots (differential drive, skid steering).
+
+The PurePursuit controller precomputes the arc length of a path, so that, at each control step, the closest point
+and the lookahead point are found with a few vectorized operations.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+
+def densify_path(path, resolution=0.05):
+    """
+    Returns the path (N, 2) with points interpolated every resolution (m) along each segment.
+    """
+    path = np.asarray(path, dtype=float)[:, 0:2]
+    points = [path[0:1]]
+    for i in range(len(path) - 1):
+        d = np.linalg.norm(path[i + 1] - path[i])
+        n = max(int(np.ceil(d / resolution)), 1)
+        t = np.linspace(0, 1, n + 1)[1:, None]
+        points.append(path[i] + t * (path[i + 1] - path[i]))
+    return np.concatenate(points, axis=0)
+
+
+class PurePursuit():
+    def __init__(self, path, lookahead=0.8, vmax=0.5, wmax=np.pi/4, goal_tolerance=0.2, resolution=0.05):
+        """
+        path: (N, 2) or (N, 3) array of waypoints (only XY are used).
+        lookahead: distance (m) along the path of the point that is followed.
+        vmax, wmax: max linear (m/s) and angular (rad/s) speeds.
+        goal_tolerance: distance (m) to the last point to consider that the path is finished.
+        """
+        self.path = densify_path(path, resolution=resolution)
+        segments = np.linalg.norm(np.diff(self.path, axis=0), axis=1)
+        self.s = np.concatenate(([0.0], np.cumsum(segments)))
+        self.lookahead = lookahead
+        self.vmax = vmax
+        self.wmax = wmax
+        self.goal_tolerance = goal_tolerance
+        # index of the closest point. The search only goes forward
+        self.closest = 0
+        self.search_window = max(int(np.ceil(2 * lookahead / resolution)), 10)
+
+    def reset(self):
+        self.closest = 0
+
+    def lookahead_point(self, position):
+        """
+        Finds the closest point on the path (looking forward from the last closest point) and returns the point that
+        is at a distance lookahead along the path.
+        """
+        window = self.path[self.closest:self.closest + self.search_window]
+        d = np.sum((window - position) ** 2, axis=1)
+        self.closest = self.closest + int(np.argmin(d))
+        s_target = self.s[self.closest] + self.lookahead
+        if s_target >= self.s[-1]:
+            return self.path[-1]
+        x = np.interp(s_target, self.s, self.path[:, 0])
+        y = np.interp(s_target, self.s, self.path[:, 1])
+        return np.array([x, y])
+
+    def compute(self, pose):
+        """
+        Given the pose = [x, y, theta] of the robot, returns the linear and angular speed commands (v, w) and True when
+        the end of the path has been reached.
+        """
+        position = np.array(pose[0:2])
+        if np.linalg.norm(self.path[-1] - position) < self.goal_tolerance:
+            return 0.0, 0.0, True
+        target = self.lookahead_point(position)
+        # target point in the robot reference frame
+        dx = target[0] - position[0]
+        dy = target[1] - position[1]
+        c = np.cos(pose[2])
+        s = np.sin(pose[2])
+        xl = c * dx + s * dy
+        yl = -s * dx + c * dy
+        L2 = max(xl ** 2 + yl ** 2, 1e-9)
+        curvature = 2.0 * yl / L2
+        # reduce the speed if the curvature is high (or the target is behind the robot)
+        v = self.vmax
+        if xl < 0:
+            v = 0.0
+            w = np.sign(yl) * self.wmax if yl != 0 else self.wmax
+            return v, w, False
+        w = v * curvature
+        if np.abs(w) > self.wmax:
+            v = v * self.wmax / np.abs(w)
+            w = np.sign(w) * self.wmax
+        # slow down when approaching the end of the path
+        remaining = self.s[-1] - self.s[self.closest]
+        if remaining < self.lookahead:
+            factor = max(remaining / self.lookahead, 0.2)
+            v = factor * v
+            w = factor * w
+        return v, w, False
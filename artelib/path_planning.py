@@ -204,28 +204,184 @@ def path_planning_line_factors(current_position, current_orientation, target_pos
 
 
 
-def move_target_positions_obstacles(target_positions, sphere_position):
+def potentials(r, K=0.3, rs=0.1, rmax=0.3):
     """
-    Moves a series of points on a path considering a repulsion potential field.
+    Vectorized version of potential(r) for an array of distances r.
+    """
+    r = np.maximum(r, rs)
+    return np.maximum(K * (1 / r - 1 / rmax), 0.0)
+
+
+def repulsion(points, obstacles, K=0.3, rs=0.1, rmax=0.3):
+    """
+    Repulsion of a set of obstacles on a set of points.
+    points: (N, 3) array.
+    obstacles: (M, 3) array with the centers of the obstacles.
+    Returns the (N, 3) repulsion vectors (the sum of potential*u for all the obstacles, being u the unit vector from
+    the obstacle to the point) and the (N,) total potential at each point.
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    obstacles = np.atleast_2d(np.asarray(obstacles, dtype=float))
+    # (N, M, 3) vectors from the obstacles to the points
+    u = points[:, None, :] - obstacles[None, :, :]
+    r = np.linalg.norm(u, axis=-1)
+    u = u / np.where(r > 0, r, 1.0)[..., None]
+    p = potentials(r, K=K, rs=rs, rmax=rmax)
+    return np.sum(p[..., None] * u, axis=1), np.sum(p, axis=1)
+
+
+def deform_path_obstacles(points, obstacles, step=0.01, tol=0.01, max_iterations=10000, K=0.3, rs=0.1, rmax=0.3):
+    """
+    Moves all the points (N, 3) of a path away from the obstacles (M, 3) following the repulsion potential field.
+    The iterations stop when the total potential on the path is below tol or after max_iterations.
+    Returns the new points and a dictionary with the number of iterations, the final total potential, whether the
+    method converged and the maximum displacement of a point.
     """
-    sphere_position = np.array(sphere_position)
-    final_positions = target_positions
-    while True:
-        total_potential = 0
-        for i in range(len(final_positions)):
-            r = np.linalg.norm(sphere_position-final_positions[i])
-            u = final_positions[i]-sphere_position
-            if r > 0:
-                u = u/r
-            pot = potential(r)
-            # modify current position in the direction of u considering potential > 0
-            final_positions[i] = final_positions[i] + 0.01*pot*u
-            total_potential += pot
-        if total_potential < 0.01:
+    initial = np.atleast_2d(np.array(points, dtype=float))
+    points = initial.copy()
+    total_potential = 0.0
+    converged = False
+    k = 0
+    for k in range(max_iterations):
+        vrep, p = repulsion(points, obstacles, K=K, rs=rs, rmax=rmax)
+        # points with a potential of 0 are not modified
+        points += step * vrep
+        total_potential = np.sum(p)
+        if total_potential < tol:
+            converged = True
             break
+    info = {'iterations': k + 1,
+            'total_potential': total_potential,
+            'converged': converged,
+            'max_displacement': np.max(np.linalg.norm(points - initial, axis=1))}
+    return points, info
+
+
+def move_target_positions_obstacles(target_positions, sphere_position, max_iterations=10000):
+    """
+    Moves a series of points on a path considering a repulsion potential field.
+    """
+    final_positions, info = deform_path_obstacles(target_positions, [sphere_position], max_iterations=max_iterations)
+    if not info['converged']:
+        print('WARNING: THE REPULSION DID NOT CONVERGE AFTER ', info['iterations'], ' ITERATIONS')
+    if isinstance(target_positions, list):
+        return list(final_positions)
     return final_positions
 
 
+def time_optimal_trapezoidal(delta_q, qdmax, qddmax):
+    """
+    Minimum time to move each joint delta_q (rad) starting and ending at rest, given the max speeds qdmax and max
+    accelerations qddmax of each joint. A triangular profile is used if qdmax cannot be reached.
+    """
+    delta_q = np.abs(delta_q)
+    # distance needed to accelerate to qdmax and decelerate back to zero
+    triangular = delta_q < qdmax ** 2 / qddmax
+    t_trapezoidal = delta_q / qdmax + qdmax / qddmax
+    t_triangular = 2 * np.sqrt(delta_q / qddmax)
+    return np.where(triangular, t_triangular, t_trapezoidal)
+
+
+def path_plan_isochronous_time_optimal(q_current, q_target, qdmax, qddmax, delta_time=0.05):
+    """
+    Plans an isochronous movement from q_current to q_target (starting and ending at rest) that respects the max
+    speed qdmax and max acceleration qddmax of each joint. The total time is the minimum time of the slowest joint
+    (rounded to delta_time). The rest of the joints follow a trapezoidal profile with their max acceleration and the
+    lowest constant speed that finishes at the same time.
+    Returns the time t (n,), the joint positions (DOF x n) and the joint speeds (DOF x n).
+    """
+    q_current = np.array(q_current, dtype=float)
+    delta_q = np.array(q_target, dtype=float) - q_current
+    qdmax = np.array(qdmax, dtype=float)
+    qddmax = np.array(qddmax, dtype=float)
+    ttotal = np.amax(time_optimal_trapezoidal(delta_q, qdmax, qddmax))
+    n = int(np.ceil(ttotal / delta_time - 1e-9))
+    ttotal = n * delta_time
+    t = delta_time * np.arange(n + 1)
+    if n == 0:
+        return t, q_current[:, None], np.zeros((len(q_current), 1))
+    # constant speed of each joint so that all of them finish at ttotal: |dq| = v*(ttotal - v/a)
+    d = np.abs(delta_q)
+    v = (qddmax * ttotal - np.sqrt(np.maximum((qddmax * ttotal) ** 2 - 4 * qddmax * d, 0.0))) / 2
+    Ta = (v / qddmax)[:, None]
+    a = qddmax[:, None]
+    v = v[:, None]
+    ti = t[None, :]
+    # position and speed along each phase (acceleration, constant speed and deceleration)
+    s = np.where(ti <= Ta, 0.5 * a * ti ** 2,
+                 np.where(ti <= ttotal - Ta, 0.5 * a * Ta ** 2 + v * (ti - Ta),
+                          d[:, None] - 0.5 * a * (ttotal - ti) ** 2))
+    sd = np.where(ti <= Ta, a * ti, np.where(ti <= ttotal - Ta, v, a * (ttotal - ti)))
+    sign = np.sign(delta_q)[:, None]
+    qs = q_current[:, None] + sign * s
+    qds = sign * sd
+    return t, qs, qds
+
+
+def path_plan_blended(q_waypoints, qdmax, qddmax, zone=0.0, delta_time=0.05):
+    """
+    Plans a continuous movement through a set of joint waypoints (DOF x n) without stopping at the intermediate
+    ones. The segments between waypoints are traversed at constant speed (limited by qdmax) and joined with
+    parabolic blends (limited by qddmax), as in the linear segments with parabolic blends (LSPB) method.
+    The movement starts and ends at rest.
+    zone: blend radius at each intermediate waypoint, a single value or an array with n-2 values. It is a distance in
+    joint space (rad, norm of the joint vector), not a Cartesian distance of the end effector. The blend starts at
+    this distance before the waypoint, so that the waypoint is not reached exactly (similar to the zones of ABB
+    robots). With zone=0 the blend is as short as the accelerations allow. Each zone is limited to half the length of
+    the segments before and after the waypoint.
+    The segments that are too short for their blends are slowed down. A warning is printed if the blends still
+    overlap after 50 iterations.
+    Returns the time t, the joint positions (DOF x m) and the joint speeds (DOF x m).
+    """
+    W = np.array(q_waypoints, dtype=float)
+    qdmax = np.array(qdmax, dtype=float)[:, None]
+    qddmax = np.array(qddmax, dtype=float)[:, None]
+    n = W.shape[1]
+    zones = np.zeros(n)
+    zones[1:n - 1] = zone
+    delta = np.diff(W, axis=1)
+    lengths = np.linalg.norm(delta, axis=0)
+    zones[1:n - 1] = np.minimum(zones[1:n - 1], np.minimum(lengths[0:n - 2], lengths[1:n - 1]) / 2)
+    # time of each segment at the max speed of the slowest joint
+    T = np.maximum(np.amax(np.abs(delta) / qdmax, axis=0), delta_time)
+    for k in range(51):
+        # speeds at the knots. The robot starts and ends at rest
+        V = np.hstack((np.zeros((W.shape[0], 1)), delta / T, np.zeros((W.shape[0], 1))))
+        dV = np.diff(V, axis=1)
+        tb = np.amax(np.abs(dV) / qddmax, axis=0)
+        speed = np.linalg.norm(V[:, 0:n], axis=0)
+        tb = np.maximum(tb, np.where(speed > 0, 2 * zones / np.maximum(speed, 1e-9), 0.0))
+        # consecutive blends must not overlap: slow down the segments that are too short
+        ratio = (tb[0:n - 1] + tb[1:n]) / 2 / T
+        if np.all(ratio <= 1.0 + 1e-9):
+            break
+        if k == 50:
+            print('WARNING: path_plan_blended: THE BLENDS OVERLAP (MAX RATIO %.3f). TRY A SMALLER ZONE' % np.max(ratio))
+            break
+        T = T * np.maximum(ratio, 1.0)
+    # time at each knot
+    tau = tb[0] / 2 + np.concatenate(([0.0], np.cumsum(T)))
+    ttotal = tau[-1] + tb[-1] / 2
+    m = int(np.ceil(ttotal / delta_time - 1e-9))
+    t = delta_time * np.arange(m + 1)
+    t[-1] = min(t[-1], ttotal)
+    # linear part: the line of the segment that contains each sample (the incoming line of each knot)
+    j = np.clip(np.searchsorted(tau, t, side='right') - 1, 0, n - 1)
+    qs = W[:, j] + V[:, j + 1] * (t - tau[j])
+    qds = V[:, j + 1].copy()
+    # parabolic blends around each knot
+    for k in range(n):
+        t0 = tau[k] - tb[k] / 2
+        idx = np.where((t >= t0) & (t <= tau[k] + tb[k] / 2))[0]
+        if len(idx) == 0 or tb[k] == 0:
+            continue
+        a = dV[:, k:k + 1] / tb[k]
+        dt = t[idx] - t0
+        qs[:, idx] = W[:, k:k + 1] + V[:, k:k + 1] * (t[idx] - tau[k]) + 0.5 * a * dt ** 2
+        qds[:, idx] = V[:, k:k + 1] + a * dt
+    return t, qs, qds
+
+
 def compute_3D_coordinates(index, n_x, n_y, n_z, piece_length, piece_gap):
     """
     Compute 3D coordinates for cubic pieces in a 3D array.
@@ -250,11 +406,9 @@ def compute_3D_coordinates(index, n_x, n_y, n_z, piece_length, piece_gap):
         return pxyz[index, :]
 
 
-def path_trapezoidal_i(qA, qB, qdA, ttotal, endpoint=False):
+def path_trapezoidal_i(qA, qB, qdA, ttotal, endpoint=False, Ta=0.2, Td=0.2):
     delta_time = 0.05
     if endpoint:
-        Ta = 0.2
-        Td = 0.2
         qdB = 0
         # Waypoint CaseA
         Tcte = ttotal - Ta - Td
@@ -262,8 +416,6 @@ def path_trapezoidal_i(qA, qB, qdA, ttotal, endpoint=False):
             Tcte = 0
         qdcte = (qB - qA - 0.5 * (qdA * Ta + qdB * Td)) / (Tcte + 0.5 * (Ta + Td))
     else:
-        Ta = 0.2
-        Td = 0.2
         # Waypoint CaseA
         Tcte = ttotal - Ta - Td
         if Tcte <= 0:
@@ -307,24 +459,21 @@ def path_trapezoidal_i(qA, qB, qdA, ttotal, endpoint=False):
     return t, np.array(qt), np.array(qdt)
 
 
-def time_trapezoidal_path_i(qA, qB, qdA, qdmax, endpoint=False):
+def time_trapezoidal_path_i(qA, qB, qdA, qdmax, endpoint=False, Ta=0.2, Td=0.2):
     """
     Computes the time needed for a trapezoidal speed profile for joint i.
     The joint must move form joint position qA to joint position qB
     The starting speed at position qA is qdA.
     The joint is assumed to move at a max speed of qdmax.
+    Ta and Td are the acceleration and deceleration times.
     In case of an endpoint
     """
     delta_time = 0.05
     # and end point with three segments
     if endpoint:
-        Ta = 0.2
-        Td = 0.2
         qdB = 0
     # Waypoint Case
     else:
-        Ta = 0.2
-        Td = 0.2
         qdB = qdmax
     Tcte = (np.abs(qB - qA) - 0.5 * (qdA + qdmax)*Ta - 0.5 * (qdB + qdmax)*Td) / qdmax
     # if the time at constant speed is negative, then clip to zero
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+A chunked container to store long recordings of point clouds (e.g. LiDAR scans).
+
+Each scan is stored as one or more independent blocks (one block per spatial tile if a tile_size is given).
+Each block holds float32 XYZ points or, optionally, int16 points quantized with a per-block scale and offset.
+Blocks are compressed with zlib (or lzma) from the standard library. An index is written at the end of the file,
+so that a single scan or the blocks that intersect a region of space can be read without loading the whole file.
+
+File layout:
+    header: magic + version
+    blocks: compressed point blocks, one after another
+    index: compressed JSON list describing each block (scan, tile, offset, size, bounding box...)
+    footer: index offset + index size + magic
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import json
+import lzma
+import struct
+import zlib
+import numpy as np
+
+HEADER_MAGIC = b'PCDC'
+FOOTER_MAGIC = b'PCDI'
+VERSION = 1
+HEADER_FORMAT = '<4sI'
+FOOTER_FORMAT = '<QI4s'
+INT16_MAX = 32767
+
+
+def compress(data, compression, level):
+    if compression == 'zlib':
+        return zlib.compress(data, level)
+    elif compression == 'lzma':
+        return lzma.compress(data)
+    elif compression is None:
+        return data
+    raise Exception('Unknown compression method: ' + str(compression))
+
+
+def decompress(data, compression):
+    if compression == 'zlib':
+        return zlib.decompress(data)
+    elif compression == 'lzma':
+        return lzma.decompress(data)
+    elif compression is None:
+        return data
+    raise Exception('Unknown compression method: ' + str(compression))
+
+
+def quantize_points(points):
+    """
+    Quantize an (N, 3) array of points to int16, using an offset at the center of the bounding box and
+    a scale so that the bounding box spans [-INT16_MAX, INT16_MAX].
+    Returns the quantized points, the scale and the offset.
+    """
+    pmin = np.min(points, axis=0)
+    pmax = np.max(points, axis=0)
+    offset = (pmax + pmin) / 2.0
+    scale = np.maximum((pmax - pmin) / (2.0 * INT16_MAX), 1e-9)
+    qpoints = np.round((points - offset) / scale)
+    qpoints = np.clip(qpoints, -INT16_MAX, INT16_MAX).astype(np.int16)
+    return qpoints, scale, offset
+
+
+def dequantize_points(qpoints, scale, offset):
+    return (qpoints.astype(np.float32) * np.array(scale, dtype=np.float32) +
+            np.array(offset, dtype=np.float32))
+
+
+class PointCloudWriter():
+    def __init__(self, filename, quantize=False, compression='zlib', level=6, tile_size=None, append=False):
+        """
+        filename: output file.
+        quantize: store points as int16 with a scale and offset per block (lossy, resolution is
+                  bounding_box_size/65534 at each block).
+        compression: 'zlib', 'lzma' or None.
+        tile_size: if given (m), each scan is split in XY tiles of this size, that can be loaded independently.
+        append: open an existing file and keep adding scans to it.
+        """
+        self.filename = filename
+        self.quantize = quantize
+        self.compression = compression
+        self.level = level
+        self.tile_size = tile_size
+        self.index = []
+        self.n_scans = 0
+        if append:
+            reader = PointCloudReader(filename)
+            self.index = reader.index
+            self.n_scans = reader.get_n_scans()
+            index_offset = reader.index_offset
+            reader.close()
+            self.file = open(filename, 'r+b')
+            # the index is rewritten on close
+            self.file.seek(index_offset)
+            self.file.truncate()
+        else:
+            self.file = open(filename, 'wb')
+            self.file.write(struct.pack(HEADER_FORMAT, HEADER_MAGIC, VERSION))
+
+    def append(self, points, timestamp=None):
+        """
+        Append a scan to the file. points is an (N, 3) array.
+        Returns the index of the scan in the file.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        # numpy scalars (e.g. a float32 simulation time) cannot be written in the JSON index
+        if timestamp is not None:
+            timestamp = float(timestamp)
+        scan = self.n_scans
+        if self.tile_size is None or len(points) == 0:
+            self.write_block(points, scan, None, timestamp)
+        else:
+            keys = np.floor(points[:, 0:2] / self.tile_size).astype(np.int64)
+            tiles, inverse = np.unique(keys, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            # group the points of each tile with a single sort
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.searchsorted(inverse[order], np.arange(len(tiles) + 1))
+            for i in range(len(tiles)):
+                tile_points = points[order[bounds[i]:bounds[i + 1]]]
+                self.write_block(tile_points, scan, tiles[i].tolist(), timestamp)
+        self.n_scans += 1
+        return scan
+
+    def write_block(self, points, scan, tile, timestamp):
+        entry = {'scan': scan,
+                 'tile': tile,
+                 'timestamp': timestamp,
+                 'n_points': len(points),
+                 'compression': self.compression}
+        if len(points) > 0:
+            entry['bbox'] = [np.min(points, axis=0).tolist(), np.max(points, axis=0).tolist()]
+        else:
+            entry['bbox'] = None
+        if self.quantize and len(points) > 0:
+            qpoints, scale, offset = quantize_points(points)
+            data = qpoints.tobytes()
+            entry['dtype'] = 'int16'
+            entry['scale'] = scale.tolist()
+            entry['offset_xyz'] = offset.tolist()
+        else:
+            data = points.tobytes()
+            entry['dtype'] = 'float32'
+        data = compress(data, self.compression, self.level)
+        entry['offset'] = self.file.tell()
+        entry['nbytes'] = len(data)
+        self.file.write(data)
+        self.index.append(entry)
+
+    def close(self):
+        """
+        Writes the index and the footer. The file cannot be read correctly if close is not called.
+        """
+        index_offset = self.file.tell()
+        index = zlib.compress(json.dumps(self.index).encode('utf-8'))
+        self.file.write(index)
+        self.file.write(struct.pack(FOOTER_FORMAT, index_offset, len(index), FOOTER_MAGIC))
+        self.file.close()
+
+
+class PointCloudReader():
+    def __init__(self, filename):
+        """
+        Opens the file and reads the index only. The blocks are read when requested.
+        """
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        magic, version = struct.unpack(HEADER_FORMAT, self.file.read(struct.calcsize(HEADER_FORMAT)))
+        if magic != HEADER_MAGIC:
+            raise Exception('Not a point cloud container: ' + str(filename))
+        footer_size = struct.calcsize(FOOTER_FORMAT)
+        self.file.seek(-footer_size, 2)
+        index_offset, index_size, magic = struct.unpack(FOOTER_FORMAT, self.file.read(footer_size))
+        if magic != FOOTER_MAGIC:
+            raise Exception('Point cloud container without index (was the writer closed?): ' + str(filename))
+        self.file.seek(index_offset)
+        self.index = json.loads(zlib.decompress(self.file.read(index_size)).decode('utf-8'))
+        self.index_offset = index_offset
+        # blocks of each scan
+        self.scans = {}
+        for i in range(len(self.index)):
+            self.scans.setdefault(self.index[i]['scan'], []).append(i)
+
+    def get_n_scans(self):
+        return len(self.scans)
+
+    def get_timestamp(self, scan):
+        return self.index[self.scans[scan][0]]['timestamp']
+
+    def read_block(self, i):
+        entry = self.index[i]
+        if entry['n_points'] == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+        self.file.seek(entry['offset'])
+        data = decompress(self.file.read(entry['nbytes']), entry['compression'])
+        if entry['dtype'] == 'int16':
+            qpoints = np.frombuffer(data, dtype=np.int16).reshape(-1, 3)
+            return dequantize_points(qpoints, entry['scale'], entry['offset_xyz'])
+        return np.frombuffer(data, dtype=np.float32).reshape(-1, 3)
+
+    def read_scan(self, scan):
+        """
+        Returns the (N, 3) points of a scan.
+        """
+        blocks = [self.read_block(i) for i in self.scans[scan]]
+        if len(blocks) == 1:
+            return blocks[0]
+        return np.concatenate(blocks, axis=0)
+
+    def read_region(self, pmin, pmax, scans=None):
+        """
+        Returns the points inside the axis aligned box [pmin, pmax]. Only the blocks whose bounding box intersect the
+        region are read from disk. If scans is None, all scans are considered.
+        """
+        pmin = np.array(pmin, dtype=np.float32)
+        pmax = np.array(pmax, dtype=np.float32)
+        if scans is None:
+            scans = sorted(self.scans.keys())
+        blocks = []
+        for scan in scans:
+            for i in self.scans[scan]:
+                bbox = self.index[i]['bbox']
+                if bbox is None:
+                    continue
+                if np.any(np.array(bbox[0]) > pmax) or np.any(np.array(bbox[1]) < pmin):
+                    continue
+                points = self.read_block(i)
+                inside = np.all((points >= pmin) & (points <= pmax), axis=1)
+                blocks.append(points[inside])
+        if len(blocks) == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+        return np.concatenate(blocks, axis=0)
+
+    def close(self):
+        self.file.close()
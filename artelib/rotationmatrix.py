@@ -8,7 +8,6 @@ The Rotation Matrix class
 import numpy as np
 from artelib.tools import rot2quaternion, rot2euler
 from artelib import euler, quaternion, homogeneousmatrix, vector
-import matplotlib.pyplot as plt
 
 
 class RotationMatrix():
@@ -92,6 +91,7 @@ class RotationMatrix():
         """
         Plot the rotation matrix as 2D or 3D vectors
         """
+        import matplotlib.pyplot as plt
         n = self.array.shape[0]
         fig = plt.figure()
         if n == 2:
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Sampling based path planning in joint space (RRT-Connect).
+
+Two trees grow from the start and goal configurations towards random samples (random_q) and try to connect with
+each other. The collisions are checked with any object that provides an is_free(q) method
+(e.g. artelib.collision.LinkCollisionChecker). If the checker also provides check_batch(qs)
+(artelib.collision.CapsuleCollisionChecker), all the configurations along an edge are checked in a single call. The
+path is finally smoothed with random shortcuts.
+
+The returned paths are arrays with a joint configuration per column, that can be played with Robot.moveAbsPath.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+TRAPPED = 0
+ADVANCED = 1
+REACHED = 2
+
+
+class NodeIndex():
+    """
+    Stores the nodes of a tree in a preallocated array (that doubles its size when full), so that the nearest node is
+    found with a single vectorized operation. Each node keeps the index of its parent.
+    """
+    def __init__(self, dim, capacity=1024):
+        self.nodes = np.zeros((capacity, dim))
+        self.parents = np.zeros(capacity, dtype=int)
+        self.n = 0
+
+    def add(self, q, parent):
+        if self.n == len(self.nodes):
+            self.nodes = np.concatenate((self.nodes, np.zeros_like(self.nodes)), axis=0)
+            self.parents = np.concatenate((self.parents, np.zeros_like(self.parents)))
+        self.nodes[self.n] = q
+        self.parents[self.n] = parent
+        self.n += 1
+        return self.n - 1
+
+    def nearest(self, q):
+        d = np.sum((self.nodes[0:self.n] - q) ** 2, axis=1)
+        return int(np.argmin(d))
+
+    def path_to_root(self, i):
+        path = []
+        while i != -1:
+            path.append(self.nodes[i])
+            i = self.parents[i]
+        return path
+
+
+class RRTConnect():
+    def __init__(self, robot, collision_checker, step_size=0.2, resolution=0.05, max_iterations=5000, seed=None):
+        """
+        robot: the robot (its DOF and joint_ranges are used to sample).
+        collision_checker: any object with an is_free(q) method.
+        step_size: max distance (rad, norm of the joint vector) of each extension of the trees.
+        resolution: max distance between the configurations checked along an edge.
+        seed: seed of the random generator of the planner (the global numpy generator is not modified).
+        """
+        self.robot = robot
+        self.collision_checker = collision_checker
+        self.step_size = step_size
+        self.resolution = resolution
+        self.max_iterations = max_iterations
+        self.rng = np.random.default_rng(seed)
+
+    def random_q(self):
+        """
+        A random q uniformly distributed in the joint ranges of the robot (as artelib.path_planning.random_q).
+        """
+        n = self.robot.DOF
+        return self.rng.uniform(self.robot.joint_ranges[0, 0:n], self.robot.joint_ranges[1, 0:n])
+
+    def is_free(self, q):
+        return self.collision_checker.is_free(q)
+
+    def edge_is_free(self, qa, qb):
+        """
+        Checks the configurations along the straight line in joint space between qa and qb (qa is not checked).
+        """
+        n = int(np.ceil(np.linalg.norm(qb - qa) / self.resolution))
+        if n == 0:
+            return True
+        t = np.linspace(0, 1, n + 1)[1:, None]
+        qs = qa + t * (qb - qa)
+        if hasattr(self.collision_checker, 'check_batch'):
+            return bool(np.all(self.collision_checker.check_batch(qs)))
+        for q in qs:
+            if not self.is_free(q):
+                return False
+        return True
+
+    def extend(self, tree, q):
+        i = tree.nearest(q)
+        q_near = tree.nodes[i]
+        delta = q - q_near
+        d = np.linalg.norm(delta)
+        if d <= self.step_size:
+            q_new = q
+            status = REACHED
+        else:
+            q_new = q_near + self.step_size * delta / d
+            status = ADVANCED
+        if not self.edge_is_free(q_near, q_new):
+            return TRAPPED, None
+        j = tree.add(q_new, i)
+        return status, j
+
+    def connect(self, tree, q):
+        while True:
+            status, j = self.extend(tree, q)
+            if status != ADVANCED:
+                return status, j
+
+    def plan(self, q_start, q_goal, smooth=True):
+        """
+        Plans a collision free path from q_start to q_goal.
+        Returns an array (DOF x n) with the configurations of the path or None if no path was found.
+        """
+        q_start = np.array(q_start, dtype=float)
+        q_goal = np.array(q_goal, dtype=float)
+        if not self.is_free(q_start) or not self.is_free(q_goal):
+            print('RRT ERROR: THE START OR GOAL CONFIGURATIONS ARE IN COLLISION')
+            return None
+        tree_a = NodeIndex(len(q_start))
+        tree_b = NodeIndex(len(q_start))
+        tree_a.add(q_start, -1)
+        tree_b.add(q_goal, -1)
+        # tree_a always starts at q_start
+        swapped = False
+        for k in range(self.max_iterations):
+            q_rand = self.random_q()
+            status, i = self.extend(tree_a, q_rand)
+            if status != TRAPPED:
+                status, j = self.connect(tree_b, tree_a.nodes[i])
+                if status == REACHED:
+                    path_a = tree_a.path_to_root(i)[::-1]
+                    path_b = tree_b.path_to_root(j)[1:]
+                    path = np.array(path_a + path_b)
+                    if swapped:
+                        path = path[::-1]
+                    print('RRT: PATH FOUND AFTER ', k + 1, ' ITERATIONS')
+                    if smooth:
+                        path = self.shortcut(path)
+                    return path.T
+            tree_a, tree_b = tree_b, tree_a
+            swapped = not swapped
+        print('RRT ERROR: NO PATH FOUND. TRY INCREASING max_iterations')
+        return None
+
+    def shortcut(self, path, n_iterations=100):
+        """
+        Random shortcut smoothing: two random configurations of the path are joined if the straight line in joint
+        space between them is free. path is an (n, DOF) array.
+        """
+        path = list(path)
+        for k in range(n_iterations):
+            if len(path) <= 2:
+                break
+            i, j = np.sort(self.rng.choice(len(path), 2, replace=False))
+            if j - i <= 1:
+                continue
+            if self.edge_is_free(path[i], path[j]):
+                path = path[0:i + 1] + path[j:]
+        return np.array(path)
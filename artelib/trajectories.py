@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Smooth joint trajectories.
+
+Fifth order polynomials (quintic) and jerk limited (double S) profiles with closed form expressions for the position,
+speed and acceleration. All the functions operate on arrays, so that all the joints (and all the segments of a path)
+are computed at once. The joints are returned with one row per joint and one column per time sample, as in
+artelib.path_planning.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+
+
+def quintic_coefficients(q0, q1, qd0, qd1, qdd0, qdd1, T):
+    """
+    Coefficients k (6, ...) of the polynomials q(t) = k0 + k1*t + ... + k5*t^5, with t in [0, T], that join the
+    position, speed and acceleration (q0, qd0, qdd0) with (q1, qd1, qdd1). All the arguments may be arrays
+    (e.g. one value per joint or per segment).
+    """
+    q0, q1, qd0, qd1, qdd0, qdd1, T = np.broadcast_arrays(*[np.asarray(x, dtype=float)
+                                                            for x in (q0, q1, qd0, qd1, qdd0, qdd1, T)])
+    h = q1 - q0
+    k0 = q0
+    k1 = qd0
+    k2 = qdd0 / 2
+    k3 = (20 * h - (8 * qd1 + 12 * qd0) * T - (3 * qdd0 - qdd1) * T ** 2) / (2 * T ** 3)
+    k4 = (-30 * h + (14 * qd1 + 16 * qd0) * T + (3 * qdd0 - 2 * qdd1) * T ** 2) / (2 * T ** 4)
+    k5 = (12 * h - 6 * (qd1 + qd0) * T - (qdd0 - qdd1) * T ** 2) / (2 * T ** 5)
+    return np.stack((k0, k1, k2, k3, k4, k5))
+
+
+def quintic_evaluate(k, t):
+    """
+    Position, speed and acceleration of the polynomials with coefficients k (6, ...) at times t.
+    t must broadcast with k[0] (e.g. k (6, DOF, 1) and t (m,) return (DOF, m) arrays).
+    """
+    q = k[0] + t * (k[1] + t * (k[2] + t * (k[3] + t * (k[4] + t * k[5]))))
+    qd = k[1] + t * (2 * k[2] + t * (3 * k[3] + t * (4 * k[4] + t * 5 * k[5])))
+    qdd = 2 * k[2] + t * (6 * k[3] + t * (12 * k[4] + t * 20 * k[5]))
+    return q, qd, qdd
+
+
+def time_quintic(delta_q, qdmax, qddmax):
+    """
+    Minimum time of a quintic that starts and ends at rest, given the max speed and acceleration.
+    The peak speed is 15/8*|dq|/T and the peak acceleration is 10/sqrt(3)*|dq|/T^2.
+    """
+    delta_q = np.abs(delta_q)
+    return np.maximum(15 / 8 * delta_q / qdmax, np.sqrt(10 / np.sqrt(3) * delta_q / qddmax))
+
+
+def quintic(q0, q1, T, delta_time=0.05, qd0=0, qd1=0, qdd0=0, qdd1=0):
+    """
+    Quintic from q0 to q1 (arrays with a value per joint) in T seconds, sampled every delta_time.
+    Returns the time t (m,) and the positions, speeds and accelerations (DOF x m).
+    """
+    n = int(np.floor(T / delta_time + 1e-9))
+    t = np.linspace(0, n * delta_time, n + 1)
+    if n * delta_time < T - 1e-9:
+        t = np.append(t, T)
+    k = quintic_coefficients(np.atleast_1d(q0), np.atleast_1d(q1), qd0, qd1, qdd0, qdd1, T)
+    q, qd, qdd = quintic_evaluate(k[:, :, None], t)
+    return t, q, qd, qdd
+
+
+def quintic_path(q_waypoints, times, delta_time=0.05):
+    """
+    Joins the waypoints (DOF x n) with quintics. times (n-1,) is the duration of each segment.
+    The speed at the intermediate waypoints is the mean of the speeds of the adjacent segments (zero if they have
+    different sign) and the acceleration is zero. The robot starts and ends at rest.
+    Returns the time t and the positions, speeds and accelerations (DOF x m).
+    """
+    W = np.array(q_waypoints, dtype=float)
+    times = np.array(times, dtype=float)
+    v = np.diff(W, axis=1) / times
+    qd = np.zeros(W.shape)
+    qd[:, 1:-1] = np.where(np.sign(v[:, :-1]) == np.sign(v[:, 1:]), (v[:, :-1] + v[:, 1:]) / 2, 0.0)
+    # coefficients (6, DOF, n-1) of all the segments
+    k = quintic_coefficients(W[:, :-1], W[:, 1:], qd[:, :-1], qd[:, 1:], 0, 0, times[None, :])
+    t0 = np.concatenate(([0.0], np.cumsum(times)))
+    m = int(np.ceil(t0[-1] / delta_time - 1e-9))
+    t = np.minimum(delta_time * np.arange(m + 1), t0[-1])
+    j = np.clip(np.searchsorted(t0, t, side='right') - 1, 0, len(times) - 1)
+    q, qd, qdd = quintic_evaluate(k[:, :, j], t - t0[j])
+    return t, q, qd, qdd
+
+
+def scurve_times(delta_q, qdmax, qddmax, qdddmax):
+    """
+    Durations of the phases of a jerk limited (double S) profile that starts and ends at rest:
+    Tj (time with constant jerk), Ta (acceleration time) and Tv (time at constant speed).
+    The total time is 2*Ta + Tv. All the arguments may be arrays.
+    """
+    h, v, a, j = np.broadcast_arrays(*[np.abs(np.asarray(x, dtype=float)) for x in (delta_q, qdmax, qddmax, qdddmax)])
+    # acceleration phase assuming that the max speed is reached
+    reach_a = v * j >= a ** 2
+    Tj = np.where(reach_a, a / j, np.sqrt(v / j))
+    Ta = np.where(reach_a, Tj + v / a, 2 * Tj)
+    Tv = h / v - Ta
+    # the max speed is not reached
+    short = Tv < 0
+    Tv = np.where(short, 0.0, Tv)
+    reach_a = h >= 2 * a ** 3 / j ** 2
+    Tj_short = np.where(reach_a, a / j, np.cbrt(h / (2 * j)))
+    Ta_short = np.where(reach_a, (Tj_short + np.sqrt(Tj_short ** 2 + 4 * h / a)) / 2, 2 * Tj_short)
+    Tj = np.where(short, Tj_short, Tj)
+    Ta = np.where(short, Ta_short, Ta)
+    return Tj, Ta, Tv
+
+
+def scurve_evaluate(delta_q, Tj, Ta, Tv, t):
+    """
+    Position, speed and acceleration of the double S profiles at times t. The profile is symmetric: the
+    deceleration is evaluated from the acceleration phase at time T-t.
+    """
+    h = np.abs(delta_q)
+    sign = np.sign(delta_q)
+    T = 2 * Ta + Tv
+    with np.errstate(divide='ignore', invalid='ignore'):
+        j = np.where(Tj > 0, h / (Tj * (Ta - Tj) * (Ta + Tv)), 0.0)
+    alim = j * Tj
+    vlim = alim * (Ta - Tj)
+    t = np.clip(t, 0, T)
+    mirrored = t > T / 2
+    s = np.where(mirrored, T - t, t)
+    # acceleration phase: jerk +j, constant acceleration, jerk -j and constant speed
+    q = np.where(s < Tj, j * s ** 3 / 6,
+                 np.where(s < Ta - Tj, alim / 6 * (3 * s ** 2 - 3 * Tj * s + Tj ** 2),
+                          np.where(s < Ta, vlim * Ta / 2 - vlim * (Ta - s) + j * (Ta - s) ** 3 / 6,
+                                   vlim * Ta / 2 + vlim * (s - Ta))))
+    qd = np.where(s < Tj, j * s ** 2 / 2,
+                  np.where(s < Ta - Tj, alim * (s - Tj / 2),
+                           np.where(s < Ta, vlim - j * (Ta - s) ** 2 / 2, vlim)))
+    qdd = np.where(s < Tj, j * s, np.where(s < Ta - Tj, alim, np.where(s < Ta, j * (Ta - s), 0.0)))
+    q = np.where(mirrored, h - q, q)
+    qdd = np.where(mirrored, -qdd, qdd)
+    return sign * q, sign * qd, sign * qdd
+
+
+def scurve(q0, q1, qdmax, qddmax, qdddmax, delta_time=0.05):
+    """
+    Isochronous jerk limited movement from q0 to q1 (a value per joint) starting and ending at rest.
+    The slowest joint moves in its minimum time. The profiles of the rest of joints are scaled in time so that all
+    of them finish at the same time.
+    Returns the time t (m,) and the positions, speeds and accelerations (DOF x m).
+    """
+    q0 = np.atleast_1d(np.array(q0, dtype=float))
+    delta_q = np.atleast_1d(np.array(q1, dtype=float)) - q0
+    Tj, Ta, Tv = scurve_times(delta_q, qdmax, qddmax, qdddmax)
+    Ti = 2 * Ta + Tv
+    T = np.amax(Ti)
+    m = int(np.ceil(T / delta_time - 1e-9))
+    t = np.minimum(delta_time * np.arange(m + 1), T)
+    if T == 0:
+        return t, q0[:, None], np.zeros((len(q0), 1)), np.zeros((len(q0), 1))
+    # time scaling of each joint
+    ratio = (Ti / T)[:, None]
+    q, qd, qdd = scurve_evaluate(delta_q[:, None], Tj[:, None], Ta[:, None], Tv[:, None], ratio * t[None, :])
+    return t, q0[:, None] + q, ratio * qd, ratio ** 2 * qdd
+
+
+def path_plan_isochronous_profile(q_current, q_target, qdmax, qddmax, qdddmax=None, profile='quintic',
+                                  delta_time=0.05):
+    """
+    Isochronous movement from q_current to q_target starting and ending at rest with a quintic or a jerk limited
+    (scurve) profile. If qdddmax is None, the max acceleration is reached in 0.1 s.
+    Returns the time t and the joint positions and speeds (DOF x m).
+    """
+    q_current = np.array(q_current, dtype=float)
+    q_target = np.array(q_target, dtype=float)
+    if profile == 'quintic':
+        T = np.amax(time_quintic(q_target - q_current, qdmax, qddmax))
+        # round to the next sample time
+        T = delta_time * max(np.ceil(T / delta_time - 1e-9), 1)
+        t, qs, qds, _ = quintic(q_current, q_target, T, delta_time=delta_time)
+    elif profile == 'scurve':
+        if qdddmax is None:
+            qdddmax = np.array(qddmax) / 0.1
+        t, qs, qds, _ = scurve(q_current, q_target, qdmax, qddmax, qdddmax, delta_time=delta_time)
+    else:
+        raise Exception('Unknown profile: ' + str(profile))
+    return t, qs, qds
@@ -8,7 +8,6 @@ This allows multiplication by the clases RotationMatrix and HomogeneousMatrix.
 """
 import numpy as np
 from artelib import homogeneousmatrix
-import matplotlib.pyplot as plt
 
 
 class Vector():
@@ -60,6 +59,7 @@ class Vector():
         """
         Plot a Vector using matplotlib's quiver method
         """
+        import matplotlib.pyplot as plt
         n = self.array.shape[0]
         fig = plt.figure()
         if n == 2:
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Please open the scenes/more/husky_robot.ttt scene before running this script.
+
+A path is planned with A* on an occupancy grid. The waypoints are followed by the Husky robot with a pure pursuit
+controller (HuskyRobot.follow_path).
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.grid_planning import plan_waypoints
+from artelib.occupancy_grid import OccupancyGrid
+from robots.objects import CoppeliaObject
+from robots.simulation import Simulation
+from robots.husky import HuskyRobot
+
+
+def build_map():
+    """
+    A 20x20 m map with two walls. The occupied cells are given the maximum log odds.
+    """
+    grid = OccupancyGrid(xmin=-10, ymin=-10, width=20, height=20, resolution=0.05)
+    walls = [[-3, -10, -2, 4],
+             [2, -4, 3, 10]]
+    for wall in walls:
+        rows, cols = grid.world_to_cell(np.array([[wall[0], wall[1]], [wall[2], wall[3]]]))
+        grid.log_odds[rows[0]:rows[1], cols[0]:cols[1]] = grid.l_max
+    return grid
+
+
+def simulate():
+    # Start simulation
+    simulation = Simulation()
+    simulation.start()
+    # Connect to the robot
+    robot = HuskyRobot(simulation=simulation)
+    robot.start(base_name='/HUSKY')
+    # A dummy object ath the robot center
+    robot_center = CoppeliaObject(simulation=simulation)
+    robot_center.start(name='/HuskyCenter')
+
+    grid = build_map()
+    start = robot_center.get_transform().pos()
+    goal = np.array([8.0, 8.0])
+    waypoints = plan_waypoints(grid, start, goal, robot_radius=0.5, influence_radius=1.5, z=start[2])
+    if waypoints is None:
+        print('NO PATH FOUND')
+        simulation.stop()
+        return
+    print('WAYPOINTS: ', waypoints)
+    path = np.vstack((start, waypoints))
+    rate = robot.follow_path(robot_center, path, lookahead=0.8, vmax=0.5)
+    print('CONTROL LOOP RATE (Hz): ', rate)
+    simulation.stop()
+
+
+if __name__ == "__main__":
+    simulate()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Please open the scenes/irb140.ttt scene before running this script.
+
+Runs several episodes of a palletizing task (robots.episodes) on the same connection. In each episode, the pallet
+(the ReferenceFrame) is placed at a different position and the robot visits the positions of the first pieces. The
+scene (robot, gripper, pallet and suction signal) is restored before each episode, instead of restarting the
+simulation. The time of each episode is reported.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.euler import Euler
+from artelib.homogeneousmatrix import HomogeneousMatrix
+from artelib.path_planning import compute_3D_coordinates
+from artelib.rotationmatrix import RotationMatrix
+from artelib.vector import Vector
+from robots.abbirb140 import RobotABBIRB140
+from robots.episodes import SceneState, EpisodeRunner
+from robots.grippers import GripperRG2
+from robots.objects import ReferenceFrame
+from robots.simulation import Simulation
+
+
+def episodes():
+    simulation = Simulation()
+    simulation.start()
+    robot = RobotABBIRB140(simulation=simulation)
+    robot.start()
+    gripper = GripperRG2(simulation=simulation)
+    gripper.start(name='/IRB140/RG2/RG2_openCloseJoint')
+    robot.set_TCP(HomogeneousMatrix(Vector([0, 0, 0.19]), RotationMatrix(np.eye(3))))
+    frame = ReferenceFrame(simulation=simulation)
+    frame.start()
+
+    state = SceneState(simulation)
+    state.start(robots=[robot, gripper], objects=[frame], signals=['enable_suction_pad'])
+    runner = EpisodeRunner(simulation, state)
+    # pallet layouts: position of the pallet
+    layouts = [Vector([0.5, -0.3, 0.2]), Vector([0.55, -0.25, 0.2]), Vector([0.45, -0.35, 0.25])]
+    orientation = Euler([0, np.pi, 0])
+
+    def palletize(pallet_position):
+        frame.set_position_and_orientation(pallet_position, Euler([0, 0, 0]))
+        q0 = np.array([0, 0, 0, 0, np.pi / 2, 0])
+        robot.moveAbsJ(q0, endpoint=True, precision=True)
+        for i in range(4):
+            p = pallet_position + Vector(compute_3D_coordinates(index=i, n_x=2, n_y=2, n_z=1, piece_length=0.08,
+                                                                piece_gap=0.01))
+            robot.moveJ(target_position=p + Vector([0, 0, 0.1]), target_orientation=orientation)
+            robot.moveL(target_position=p, target_orientation=orientation, endpoint=True)
+            robot.moveL(target_position=p + Vector([0, 0, 0.1]), target_orientation=orientation, endpoint=True)
+        return robot.get_joint_positions()
+
+    runner.run(palletize, parameters=layouts)
+    simulation.stop()
+    runner.print_summary()
+
+
+if __name__ == "__main__":
+    episodes()
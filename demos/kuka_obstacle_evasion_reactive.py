@@ -12,6 +12,7 @@ import numpy as np
 
 from artelib.homogeneousmatrix import HomogeneousMatrix
 from artelib.inverse_kinematics import moore_penrose_damped
+from artelib.path_planning import repulsion
 from artelib.euler import Euler
 from artelib.plottools import plot_vars, plot_xy
 from artelib.tools import buildT, compute_kinematic_errors
@@ -52,26 +53,12 @@ def potential0(r):
     return p
 
 
-def potential(r):
-    K = 0.4
-    rs = 0.1 # radius of the sphere
-    rmax = 0.3
-    if r < rs:
-        r = rs
-    p = K * (1 / r - 1 / rmax)
-    if p < 0:
-        p = 0
-    return p
-
-
 def compute_repulsion(pe, ps):
-    u = pe - ps
-    r = np.linalg.norm(u)
-    if r > 0.0:
-        u = u / r
-    p = potential(r)
-    vrep = np.dot(p, u)
-    vrep = np.hstack((vrep, np.array([0, 0, 0])))
+    """
+    Repulsion of the obstacles ps (a point or an (M, 3) array) on the end effector pe.
+    """
+    vrep, _ = repulsion(pe, ps, K=0.4, rs=0.1, rmax=0.3)
+    vrep = np.hstack((vrep[0], np.array([0, 0, 0])))
     return vrep
 
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Please open the scenes/kuka_14_R820_1.ttt scene before running this script.
+The demo plans a collision free path in joint space with RRT-Connect, so that the KUKA LBR IIWA robot avoids a sphere.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.collision import CapsuleCollisionChecker, sphere_from_object
+from artelib.rrt_planning import RRTConnect
+from robots.kukalbr import RobotKUKALBR
+from robots.objects import Sphere
+from robots.simulation import Simulation
+
+
+def application():
+    simulation = Simulation()
+    simulation.start()
+    robot = RobotKUKALBR(simulation=simulation)
+    robot.start()
+    sphere = Sphere(simulation=simulation)
+    sphere.start()
+    sphere.set_position([0.55, 0.0, 0.45])
+
+    # the radius of the sphere is not read from Coppelia
+    obstacles = [sphere_from_object(sphere, radius=0.1)]
+    # the links are approximated by capsules. Thousands of configurations are checked in a single call
+    checker = CapsuleCollisionChecker(robot, obstacles, radius=0.05, margin=0.02)
+    planner = RRTConnect(robot, checker, step_size=0.2, seed=0)
+
+    q0 = np.array([-np.pi / 4, np.pi / 8, 0, -np.pi / 2, 0, np.pi / 4, 0])
+    q1 = np.array([np.pi / 4, np.pi / 8, 0, -np.pi / 2, 0, np.pi / 4, 0])
+    q_path = planner.plan(q0, q1)
+    if q_path is None:
+        simulation.stop()
+        return
+    robot.moveAbsJ(q0, precision=True)
+    robot.moveAbsPath(q_path=q_path, precision=False, endpoint=False)
+    robot.wait(15)
+    simulation.stop()
+    robot.plot_trajectories()
+
+
+if __name__ == "__main__":
+    application()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Please open the scenes/ur5.ttt scene before running this script.
+
+The demo moves the robot with moveAbsJ, moveJ and moveL and measures the time spent in the inverse kinematics, the
+path planning, the joint control, the remote calls and the simulation steps (robots.instrumentation).
+The results are saved in ur5_profiling.json and ur5_profiling.folded (e.g. flamegraph.pl ur5_profiling.folded > a.svg).
+
+@Authors: Arturo Gil
+@Time: October 2026
+
+"""
+import numpy as np
+from artelib.euler import Euler
+from artelib.vector import Vector
+from robots.instrumentation import Profiler
+from robots.simulation import Simulation
+from robots.ur5 import RobotUR5
+
+
+def profiling():
+    simulation = Simulation()
+    simulation.start()
+    robot = RobotUR5(simulation=simulation)
+    robot.start()
+    profiler = Profiler()
+    profiler.instrument_simulation(simulation)
+    profiler.instrument_robot(robot)
+
+    q0 = np.array([-np.pi/4, -np.pi/8, np.pi/2, 0.1, 0.1, 0.1])
+    robot.moveAbsJ(q_target=q0)
+    robot.moveJ(target_position=Vector([0.2, -0.45, 0.4]), target_orientation=Euler([-np.pi, 0, 0]))
+    robot.moveL(target_position=Vector([0.6, -0.2, 0.25]), target_orientation=Euler([-np.pi/2, 0, -np.pi/2]))
+
+    profiler.uninstrument()
+    simulation.stop()
+    profiler.print_summary()
+    profiler.save_json('ur5_profiling.json')
+    profiler.save_folded('ur5_profiling.folded')
+
+
+if __name__ == "__main__":
+    profiling()
@@ -1,46 +1,50 @@
 #!/usr/bin/env python
 # encoding: utf-8
 """
-Please open the scenes/ur5.ttt scene before running this script.
+Please open the scenes/more/youbot_laser.ttt scene before running this script.
+
+The youBot base moves while the 2D laser scans are accumulated on an occupancy grid.
 
 @Authors: Arturo Gil arturo.gil@umh.es
 @Time: April 2021
 """
 import numpy as np
+import matplotlib.pyplot as plt
+from artelib.occupancy_grid import OccupancyGrid
+from robots.objects import CoppeliaObject
 from robots.simulation import Simulation
-from robots.youbot import YouBotRobot
-from robots.grippers import YouBotGripper
-from robots.camera import Camera
+from robots.youbot import YouBotBase
 from robots.laserscans import LaserScanner2D
 
 
 def youbot_move():
     """
-    Move the robot base and arm joints
+    Move the robot base and build a map with the laser data
     """
     simulation = Simulation()
-    clientID = simulation.start()
-    robot = YouBotRobot(clientID=clientID)
+    simulation.start()
+    robot = YouBotBase(simulation=simulation)
     robot.start()
-    # gripper = YouBotGripper(clientID=clientID)
-    # gripper.start()
-    # camera = Camera(clientID=clientID)
-    # camera.start()
-
-    pos0, ori0 = robot.get_true_position_and_orientation()
-    robot.set_base_speed(0.5, 0, 0.1)
-    simulation.wait(250)
-    pos1, ori1 = robot.get_true_position_and_orientation()
-
-
-
-
-    laser = LaserScanner2D()
+    laser = LaserScanner2D(simulation=simulation)
     laser.start()
-    distancies = laser.get_laser_data()
+    # the laser is considered to be at the robot reference
+    youbot_ref = CoppeliaObject(simulation=simulation)
+    youbot_ref.start(name='/youBot/youBot_ref')
+    grid = OccupancyGrid(xmin=-5, ymin=-5, width=10, height=10, resolution=0.05)
 
+    robot.set_base_speed(0.5, 0, 0.1)
+    for i in range(250):
+        simulation.wait()
+        scan = laser.get_laser_data()
+        if scan is None:
+            continue
+        T = youbot_ref.get_transform()
+        grid.add_scan(scan, pose=T.t2v(n=2), max_range=5.0)
     simulation.stop()
-    robot.plot_trajectories()
+
+    plt.imshow(grid.get_probability(), origin='lower', cmap='gray_r')
+    plt.title('OCCUPANCY GRID')
+    plt.show(block=True)
 
 
 if __name__ == "__main__":
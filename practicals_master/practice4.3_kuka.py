@@ -15,7 +15,9 @@ from artelib.inverse_kinematics import moore_penrose_damped
 from artelib.euler import Euler
 from artelib.path_planning import n_movements, generate_target_positions, generate_target_orientations_Q, move_target_positions_obstacles, potential
 from artelib.plottools import plot_xy
-from artelib.tools import null_space, compute_kinematic_errors
+from artelib.collision import SphereObstacle
+from artelib.distance_field import DistanceField, NullSpaceObstacleAvoidance
+from artelib.tools import compute_kinematic_errors
 from robots.grippers import GripperRG2
 from robots.kukalbr import RobotKUKALBR
 from robots.objects import Sphere
@@ -37,23 +39,17 @@ def potentialo(d):
     return p
 
 
-def increase_distance_to_obstacles(robot, q):
-    robot.set_joint_target_trajectory([q], precision='low')
-    d1 = robot.get_min_distance_to_objects()
-    f1 = potentialo(d1)
-    J, Jv, Jw = robot.manipulator_jacobian(q)
-    qd = null_space(J, 6)
-    q = q + f1*qd
-    robot.set_joint_target_trajectory([q], precision='low')
-    d2 = robot.get_min_distance_to_objects()
-    f2 = potentialo(d2)
-    if f2 < f1:
-        return f2*qd, d2-d1
-    else:
-        return -f1*qd, d1-d2
+def increase_distance_to_obstacles(avoidance, q):
+    """
+    The distance to the obstacles is computed from a precomputed distance field (no simulation steps are needed).
+    Returns the joint speed in the null space and the increment in the min distance to the obstacles.
+    """
+    qd, d1 = avoidance.compute(q)
+    d2 = avoidance.min_distance(q + qd)
+    return qd, d2-d1
 
 
-def inversekinematics_obstacles(robot, target_position, target_orientation, q0):
+def inversekinematics_obstacles(robot, avoidance, target_position, target_orientation, q0):
     """
     fine: whether to reach the target point with precision or not.
     vmax: linear velocity of the planner.
@@ -72,14 +68,14 @@ def inversekinematics_obstacles(robot, target_position, target_orientation, q0):
         J, Jv, Jw = robot.manipulator_jacobian(q)
         # compute joint speed to achieve the reference
         qda = moore_penrose_damped(J, e)
-        [qdb, ds] = increase_distance_to_obstacles(robot, q)
+        [qdb, ds] = increase_distance_to_obstacles(avoidance, q)
         Dds_global.append(ds)
         # qdb = 0.8*np.linalg.norm(qda) * qdb
         q = q + qda + qdb
     return q
 
 
-def inversekinematics_path(robot, target_positions, target_orientations, q0):
+def inversekinematics_path(robot, avoidance, target_positions, target_orientations, q0):
     """
         Solve iteratively q for each of the target positions and orientation specified
     """
@@ -89,7 +85,7 @@ def inversekinematics_path(robot, target_positions, target_orientations, q0):
     Dds = []
     for i in range(30):
         print('Increasing distance at line start. Iteration: ', i)
-        [qd, Dd] = increase_distance_to_obstacles(robot, q)
+        [qd, Dd] = increase_distance_to_obstacles(avoidance, q)
         q = q + qd
         Dds.append(Dd)
     # plot_xy(np.arange(len(Dds)), np.array(Dds))
@@ -97,7 +93,7 @@ def inversekinematics_path(robot, target_positions, target_orientations, q0):
 
     # now try to reach each target position on the line
     for i in range(len(target_positions)):
-        q = inversekinematics_obstacles(robot=robot, target_position=target_positions[i],
+        q = inversekinematics_obstacles(robot=robot, avoidance=avoidance, target_position=target_positions[i],
                                         target_orientation=target_orientations[i], q0=q)
         q_path.append(q)
     return q_path
@@ -132,7 +128,11 @@ def follow_line_obstacle(robot, sphere):
     path_o = generate_target_orientations_Q(Euler(target_orientations[0]), Euler(target_orientations[1]), n)
     path_p = move_target_positions_obstacles(path_p, sphere_position)
 
-    q1_path = inversekinematics_path(robot=robot, target_positions=path_p,
+    # distance field of the static scene, computed once
+    field = DistanceField([SphereObstacle(sphere_position, radius=0.1)], pmin=[-1, -1, 0], pmax=[1.2, 1, 1.4],
+                          resolution=0.02)
+    avoidance = NullSpaceObstacleAvoidance(robot, field, K=0.03, rs=0.1, rmax=0.6)
+    q1_path = inversekinematics_path(robot=robot, avoidance=avoidance, target_positions=path_p,
                                      target_orientations=path_o, q0=q0)
 
     # plot_xy(np.arange(len(Dds_global)), np.array(Dds_global))
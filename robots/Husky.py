@@ -16,16 +16,11 @@ class HuskyRobot(Robot):
         Robot.__init__(self, simulation=simulation)
 
     def start (self, base_name='/HUSKY'):
-        wheelRL = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointRLW')
-        wheelFL = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointFLW')
-        wheelRR = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointRRW')
-        wheelFR = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointFRW')
-        wheeljoints = []
-        wheeljoints.append(wheelRL)
-        wheeljoints.append(wheelFL)
-        wheeljoints.append(wheelRR)
-        wheeljoints.append(wheelFR)
-        self.joints = wheeljoints
+        # handles of the wheels [RL, FL, RR, FR] resolved in a single call
+        self.joints = self.simulation.get_objects([base_name + '/' + name for name in ['Revolute_jointRLW',
+                                                                                      'Revolute_jointFLW',
+                                                                                      'Revolute_jointRRW',
+                                                                                      'Revolute_jointFRW']])
         self.width = 0.555
         self.wheel_radius = 0.165
         self.Vmax = 0.5
@@ -12,6 +12,7 @@ This is the 40/255 Variant
 """
 import numpy as np
 from artelib.homogeneousmatrix import HomogeneousMatrix
+from artelib.dynamics import RobotDynamics, uniform_link_inertias
 # from artelib.path_planning import filter_path, path_trapezoidal_i
 from artelib.seriallink import SerialRobot
 from robots.robot import Robot
@@ -29,18 +30,23 @@ class RobotABBIRB4600(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([200, 200, 245, 348, 360, 450])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([400, 400, 500, 800, 800, 1000])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges. joints 4 and 6 can be configured as unlimited
         # default joint limits:
         # q1 (+-180), q2 (-90,110), q3 (-230, 50), q4 (+-200), q5 (+-115), q6 (+-400)
         # here, the joint range for q4 has been extended
         joint_ranges = np.array([[-180, -90, -180, -400, -125, -400],
                                  [180,   150,  75,  400,  120, 400]])
-        self.pid_controllers = np.array([[0.8, 0, 0.2],
-                                [0.1, 0, 0.1],
-                                [0.2, 0, 0.1],
-                                [0.1, 0, 0.1],
-                                [0.1, 0, 0.1],
-                                [0.1, 0, 0.1]])
+        # gains [kp, ki, kd] of the speed controller of each joint (see artelib.joint_control.JointPID)
+        # CAUTION: placeholders, the default gains for every joint. They have not been tuned per joint
+        self.joint_gains = np.array([[5.5, 0, 0.4],
+                                     [5.5, 0, 0.4],
+                                     [5.5, 0, 0.4],
+                                     [5.5, 0, 0.4],
+                                     [5.5, 0, 0.4],
+                                     [5.5, 0, 0.4]])
         self.joint_ranges = joint_ranges * np.pi / 180.0
         self.max_iterations_inverse_kinematics = 15000
         self.max_error_dist_inversekinematics = 0.01
@@ -61,26 +67,15 @@ class RobotABBIRB4600(Robot):
         self.serialrobot.append(th=0, d=0.96, a=0, alpha=np.pi / 2, link_type='R')
         self.serialrobot.append(th=0, d=0, a=0, alpha=-np.pi / 2, link_type='R')
         self.serialrobot.append(th=np.pi, d=0.135, a=0, alpha=0, link_type='R')
+        # inertial parameters: approximate masses of the links (kg). The centers of mass and inertia tensors are
+        # approximated by uniform cylinders between the origins of the DH systems
+        masses = np.array([120.0, 95.0, 60.0, 30.0, 10.0, 3.0])
+        coms, inertias = uniform_link_inertias(self.serialrobot, masses, radius=0.15)
+        self.dynamics = RobotDynamics(self.serialrobot, masses, coms, inertias)
 
     def start(self, base_name='/IRB4600', joint_name='joint'):
-        armjoints = []
-        # Get the handles of the relevant objects
-        robotbase = self.simulation.sim.getObject(base_name)
-        q1 = self.simulation.sim.getObject(base_name + '/' + joint_name + '1')
-        q2 = self.simulation.sim.getObject(base_name + '/' + joint_name + '2')
-        q3 = self.simulation.sim.getObject(base_name + '/' + joint_name + '3')
-        q4 = self.simulation.sim.getObject(base_name + '/' + joint_name + '4')
-        q5 = self.simulation.sim.getObject(base_name + '/' + joint_name + '5')
-        q6 = self.simulation.sim.getObject(base_name + '/' + joint_name + '6')
-
-        armjoints.append(q1)
-        armjoints.append(q2)
-        armjoints.append(q3)
-        armjoints.append(q4)
-        armjoints.append(q5)
-        armjoints.append(q6)
-        # must store the joints
-        self.joints = armjoints
+        # Get the handles of the relevant objects (resolved in a single call)
+        self.joints = self.simulation.get_objects([base_name + '/' + joint_name + str(i) for i in range(1, 7)])
 
     def inversekinematics(self, target_position, target_orientation, q0=None, extended=False):
         """
@@ -7,7 +7,6 @@ Classes to manage an accelerometer in Coppelia simulations (a LiDAR sensor)
 @Time: April 2024
 """
 import numpy as np
-import open3d as o3d
 
 
 class Accelerometer():
@@ -16,7 +15,7 @@ class Accelerometer():
         self.handle = None
 
     def start(self, name='/Accelerometer'):
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
     def get_accel_data(self):
@@ -8,9 +8,7 @@ Classes to manage a camera in Coppelia simulations (a vision sensor)
 @Time: April 2021
 
 """
-from PIL import Image, ImageOps
 import numpy as np
-import cv2
 from artelib.vector import Vector
 from artelib.rotationmatrix import RotationMatrix
 from artelib.homogeneousmatrix import HomogeneousMatrix
@@ -31,7 +29,7 @@ class Camera():
         self.fxy = self.wh / (2 * np.tan(self.fov / 2))
 
     def start(self, name='camera'):
-        camera = self.simulation.sim.getObject(name)
+        camera = self.simulation.get_object(name)
         self.camera = camera
 
     def get_image(self):
@@ -43,7 +41,8 @@ class Camera():
         # image = np.array(image, dtype=np.uint8)
         # image.resize([resolution[1], resolution[0], 3])
         # image = cv2.flip(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), 0)
-        image = cv2.flip(image, 0)
+        # flip vertically (as cv2.flip(image, 0)), without importing cv2
+        image = np.flipud(image).copy()
         # image.resize([resY, resX, 3])
         # cv2.imshow('', image)
         # cv2.waitKey(1)
@@ -81,6 +80,7 @@ class Camera():
         """
         Captures an image and saves it to filename.
         """
+        from PIL import Image
         image = self.get_image()
         img = Image.fromarray(image)
         # img = ImageOps.flip(img)
@@ -99,6 +99,7 @@ class Camera():
         # CAUTION: this is true for the simulations in this particular library
         # ARUCO_SIZE = 0.07  # in meters, size of the ARUCO marker in simulation
         # ARUCO_SIZE = 0.0695  # in meters, size of the ARUCO marker in simulation
+        import cv2
         gray_image = self.get_image()
         # gray_image = cv2.cvtColor(color_image, cv2.COLOR_BGR2GRAY)
         # The dictionary should be defined as the one used in demos/aruco_markers/aruco_creation.py
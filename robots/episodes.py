@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Fast reset of a scene and batch execution of episodes on a single connection.
+
+SceneState stores the joint positions of the robots (and grippers), the poses of a set of objects and the values of
+some integer signals. save() reads them with a single remote call and restore() writes them back with another one
+(the dynamic objects are reset). A scene is restored in milliseconds. Stopping and starting the simulation takes
+seconds. If the Lua code cannot be executed, one remote call per value is used instead. The fallback is reported (see
+Simulation.lua_fallback) and the path used is stored in save_path and restore_path ('lua' or 'per call').
+
+EpisodeRunner restores the initial state before each episode and measures the time of each episode: the reset time,
+the execution time and the simulation steps.
+
+Usage:
+    state = SceneState(simulation)
+    state.start(robots=[robot, gripper], objects=[frame], signals=['enable_suction_pad'])
+    runner = EpisodeRunner(simulation, state)
+    results = runner.run(episode, parameters=layouts)   # calls episode(layout) for each layout
+    runner.print_summary()
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import time
+import numpy as np
+
+
+class SceneState():
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.joints = []
+        self.handles = []
+        self.signals = []
+        # path used by the last save() and restore(): 'lua' (single call) or 'per call'
+        self.save_path = None
+        self.restore_path = None
+
+    def start(self, robots=None, objects=None, signals=None):
+        """
+        robots: robots or grippers (any object with a list of joints).
+        objects: CoppeliaObject, ObjectCollection or handles.
+        signals: names of integer signals.
+        """
+        self.joints = []
+        self.handles = []
+        for robot in (robots or []):
+            self.joints.extend(robot.joints)
+        for obj in (objects or []):
+            if hasattr(obj, 'handles'):
+                self.handles.extend(obj.handles)
+            elif hasattr(obj, 'handle'):
+                self.handles.append(obj.handle)
+            else:
+                self.handles.append(obj)
+        self.signals = list(signals or [])
+
+    def save(self):
+        """
+        Returns a snapshot: {'transforms': (N, 4, 4) array, 'q': joint positions, 'signals': {name: value}}.
+        The value of a signal that is not set is None.
+        """
+        code = 'local r = {} ' \
+               'for i, h in ipairs({%s}) do local m = sim.getObjectMatrix(h, sim.handle_world) ' \
+               'for j = 1, 12 do r[#r + 1] = m[j] end end ' \
+               'for i, h in ipairs({%s}) do r[#r + 1] = sim.getJointPosition(h) end ' \
+               'local s = {} for i, n in ipairs({%s}) do s[i] = sim.getInt32Signal(n) or false end ' \
+               'return {r, s}' % (','.join([str(h) for h in self.handles]),
+                                  ','.join([str(h) for h in self.joints]),
+                                  ','.join([repr(name) for name in self.signals]))
+        try:
+            values, signals = self.simulation.execute_lua(code)
+            values = np.array(list(values), dtype=float)
+            signals = [None if s is False else s for s in signals]
+            self.save_path = 'lua'
+        except Exception as e:
+            # one call per value
+            self.simulation.lua_fallback('SceneState.save', e)
+            self.save_path = 'per call'
+            values = []
+            for h in self.handles:
+                values.extend(self.simulation.sim.getObjectMatrix(h, -1))
+            values.extend([self.simulation.sim.getJointPosition(h) for h in self.joints])
+            values = np.array(values, dtype=float)
+            signals = [self.simulation.sim.getInt32Signal(name) for name in self.signals]
+        n = 12 * len(self.handles)
+        T = np.zeros((len(self.handles), 4, 4))
+        T[:, 0:3, :] = values[0:n].reshape(-1, 3, 4)
+        T[:, 3, 3] = 1
+        return {'transforms': T,
+                'q': values[n:],
+                'signals': dict(zip(self.signals, signals))}
+
+    def restore(self, snapshot):
+        """
+        Writes the snapshot in Coppelia. The joints are placed at the saved positions with zero target velocity and the
+        dynamic objects are reset. The signals that were not set are cleared.
+        """
+        T = snapshot['transforms']
+        q = snapshot['q']
+        matrices = ['{%s}' % ','.join([repr(float(x)) for x in T[i, 0:3, :].ravel()]) for i in range(len(T))]
+        set_signals = ' '.join(['sim.setInt32Signal(%r, %d)' % (name, value) for name, value in
+                                snapshot['signals'].items() if value is not None])
+        clear_signals = ' '.join(['sim.clearInt32Signal(%r)' % name for name, value in snapshot['signals'].items()
+                                  if value is None])
+        code = 'local hs = {%s} local ms = {%s} for i, h in ipairs(hs) do ' \
+               'sim.setObjectMatrix(h, sim.handle_world, ms[i]) sim.resetDynamicObject(h) end ' \
+               'local js = {%s} local qs = {%s} for i, h in ipairs(js) do sim.setJointPosition(h, qs[i]) ' \
+               'sim.setJointTargetPosition(h, qs[i]) sim.setJointTargetVelocity(h, 0) sim.resetDynamicObject(h) end ' \
+               '%s %s' % (','.join([str(h) for h in self.handles]), ','.join(matrices),
+                          ','.join([str(h) for h in self.joints]), ','.join([repr(float(x)) for x in q]),
+                          set_signals, clear_signals)
+        try:
+            self.simulation.execute_lua(code)
+            self.restore_path = 'lua'
+        except Exception as e:
+            self.simulation.lua_fallback('SceneState.restore', e)
+            self.restore_path = 'per call'
+            sim = self.simulation.sim
+            for i in range(len(T)):
+                sim.setObjectMatrix(self.handles[i], -1, T[i, 0:3, :].ravel().tolist())
+                sim.resetDynamicObject(self.handles[i])
+            for i in range(len(self.joints)):
+                sim.setJointPosition(self.joints[i], float(q[i]))
+                sim.setJointTargetPosition(self.joints[i], float(q[i]))
+                sim.setJointTargetVelocity(self.joints[i], 0)
+                sim.resetDynamicObject(self.joints[i])
+            for name, value in snapshot['signals'].items():
+                if value is None:
+                    sim.clearInt32Signal(name)
+                else:
+                    sim.setInt32Signal(name, value)
+        for h in self.handles:
+            self.simulation.invalidate_pose(h)
+
+
+class EpisodeRunner():
+    def __init__(self, simulation, state, settle_steps=1):
+        """
+        settle_steps: simulation steps performed after each reset, before the episode.
+        """
+        self.simulation = simulation
+        self.state = state
+        self.settle_steps = settle_steps
+        self.initial = None
+        # one dict per episode: reset_time, time (s), steps, reset_path and result
+        self.episodes = []
+
+    def run(self, episode, parameters):
+        """
+        Saves the current state and, for each element p of parameters, restores it and calls episode(p).
+        Returns the list of results of the episodes.
+        """
+        self.initial = self.state.save()
+        print('INITIAL STATE SAVED (%s)' % self.state.save_path)
+        self.episodes = []
+        for i, p in enumerate(parameters):
+            t0 = time.perf_counter()
+            self.state.restore(self.initial)
+            self.simulation.wait(steps=self.settle_steps)
+            t1 = time.perf_counter()
+            steps = self.simulation.steps
+            result = episode(p)
+            t2 = time.perf_counter()
+            self.episodes.append({'reset_time': t1 - t0,
+                                  'time': t2 - t1,
+                                  'steps': self.simulation.steps - steps,
+                                  'reset_path': self.state.restore_path,
+                                  'result': result})
+            print('EPISODE %d: RESET %.1f ms (%s), TIME %.3f s, %d STEPS' % (i, 1000 * (t1 - t0),
+                                                                               self.state.restore_path, t2 - t1,
+                                                                               self.simulation.steps - steps))
+        return [e['result'] for e in self.episodes]
+
+    def print_summary(self):
+        if len(self.episodes) == 0:
+            print('NO EPISODES')
+            return
+        reset_times = np.array([e['reset_time'] for e in self.episodes])
+        times = np.array([e['time'] for e in self.episodes])
+        steps = np.array([e['steps'] for e in self.episodes])
+        per_call = len([e for e in self.episodes if e['reset_path'] != 'lua'])
+        print('%d EPISODES' % len(self.episodes))
+        if per_call > 0:
+            print('WARNING: %d RESETS USED ONE REMOTE CALL PER VALUE (THE LUA CODE COULD NOT BE EXECUTED)' % per_call)
+        print('RESET (ms):    mean %8.1f  max %8.1f' % (1000 * np.mean(reset_times), 1000 * np.max(reset_times)))
+        print('EPISODE (s):   mean %8.3f  max %8.3f  total %8.3f' % (np.mean(times), np.max(times), np.sum(times)))
+        print('STEPS:         mean %8.1f  total %8d' % (np.mean(steps), np.sum(steps)))
+        if np.sum(times) > 0:
+            print('STEPS PER SECOND: %.1f' % (np.sum(steps) / np.sum(times)))
@@ -16,8 +16,7 @@ class GripperRG2():
         self.joints = None
 
     def start(self, name='/IRB140/RG2_openCloseJoint'):
-        gripper_joint1 = self.simulation.sim.getObject(name)
-        self.joints = [gripper_joint1]
+        self.joints = [self.simulation.get_object(name)]
 
     def open(self, precision=True):
         self.simulation.sim.setJointTargetVelocity(self.joints[0], 0.1)
@@ -36,9 +35,7 @@ class GripperBarretHand():
         self.joints = None
 
     def start(self, name='Barrett_openCloseJoint'):
-        gripper_joint1 = self.simulation.sim.getObject(name)
-        gripper_joint2 = self.simulation.sim.getObject(name + '0')
-        self.joints = [gripper_joint1, gripper_joint2]
+        self.joints = self.simulation.get_objects([name, name + '0'])
 
     def open(self, precision=False):
         self.simulation.sim.setJointTargetVelocity(self.joints[0], 0.1)
@@ -101,9 +98,7 @@ class YouBotGripper():
         self.joints = None
 
     def start(self, name='/youBot/youBotGripperJoint'):
-        gripper_joint1 = self.simulation.sim.getObject(name+'1')
-        gripper_joint2 = self.simulation.sim.getObject(name + '2')
-        self.joints = [gripper_joint1, gripper_joint2]
+        self.joints = self.simulation.get_objects([name + '1', name + '2'])
 
     def open(self, precision=False):
         self.simulation.sim.setJointTargetPosition(self.joints[0], -0.05)
@@ -6,9 +6,11 @@ Please open the scenes/more/husky_robot.ttt scene before running this script.
 @Authors: Víctor Márquez
 @Time: February 2024
 """
+import time
 from robots.robot import Robot
 import numpy as np
 from artelib.euler import Euler
+from artelib.path_following import PurePursuit
 from artelib.vector import Vector
 from artelib.homogeneousmatrix import HomogeneousMatrix
 
@@ -18,23 +20,25 @@ from artelib.rotationmatrix import RotationMatrix
 class HuskyRobot(Robot):
     def __init__ (self, simulation):
         Robot.__init__(self, simulation=simulation)
+        # last wheel speeds sent to Coppelia [wl, wr]
+        self.wheel_speeds = None
+        # measured rate (Hz) of the last follow_path control loop
+        self.control_rate = None
 
     def start (self, base_name='/HUSKY'):
-        robotbase = self.simulation.sim.getObject(base_name)
-        wheelRL = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointRLW')
-        wheelFL = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointFLW')
-        wheelRR = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointRRW')
-        wheelFR = self.simulation.sim.getObject(base_name + '/' + 'Revolute_jointFRW')
-        wheeljoints = []
-        wheeljoints.append(wheelRL)
-        wheeljoints.append(wheelFL)
-        wheeljoints.append(wheelRR)
-        wheeljoints.append(wheelFR)
-        self.joints = wheeljoints
+        # handles of the wheels [RL, FL, RR, FR] resolved in a single call
+        self.joints = self.simulation.get_objects([base_name + '/' + name for name in ['Revolute_jointRLW',
+                                                                                      'Revolute_jointFLW',
+                                                                                      'Revolute_jointRRW',
+                                                                                      'Revolute_jointFRW']])
         self.width = 0.555
         self.wheel_radius = 0.165
         self.radius = 0.165
+        self.wheel_speeds = None
 
+    def get_wheel_speeds(self):
+        [wl1, wl2, wr1, wr2] = self.simulation.get_joint_velocities(self.joints)
+        return [(wl1 + wl2) / 2, (wr1 + wr2) / 2]
 
     def mov_orientacion (self, base, objetivo):
         T_base = base.get_transform()
@@ -290,10 +294,7 @@ class HuskyRobot(Robot):
                 print('wl despues', wl, 'wr despues', wr)
                 print('error', np.linalg.norm(punto - base.get_transform().pos()))
 
-                self.simulation.sim.setJointTargetVelocity(self.joints[0], wl)
-                self.simulation.sim.setJointTargetVelocity(self.joints[1], wl)
-                self.simulation.sim.setJointTargetVelocity(self.joints[2], wr)
-                self.simulation.sim.setJointTargetVelocity(self.joints[3], wr)
+                self.set_wheel_speeds(wl, wr)
                 self.wait()
 
 
@@ -357,32 +358,56 @@ class HuskyRobot(Robot):
         b = self.width
         wl = (v - w * (b / 2)) / r
         wr = (v + w * (b / 2)) / r
-
-        self.simulation.sim.setJointTargetVelocity(self.joints[0], wl)
-        self.simulation.sim.setJointTargetVelocity(self.joints[1], wl)
-        self.simulation.sim.setJointTargetVelocity(self.joints[2], wr)
-        self.simulation.sim.setJointTargetVelocity(self.joints[3], wr)
+        self.set_wheel_speeds(wl, wr)
+
+    def set_wheel_speeds(self, wl, wr, tolerance=1e-3):
+        """
+        Sends the left and right wheel speeds to the four wheels in a single remote call. The call is skipped if the
+        speeds have not changed (within tolerance rad/s) since the last command.
+        """
+        if self.wheel_speeds is not None and \
+                abs(wl - self.wheel_speeds[0]) < tolerance and abs(wr - self.wheel_speeds[1]) < tolerance:
+            return
+        self.simulation.set_joint_target_velocities(self.joints, [wl, wl, wr, wr])
+        self.wheel_speeds = [wl, wr]
+
+    def follow_path(self, base, path, lookahead=0.8, vmax=0.5, wmax=np.pi/4, goal_tolerance=0.2, max_steps=5000):
+        """
+        Follows a path (N, 2) or (N, 3) with a pure pursuit controller (see artelib.path_following).
+        The pose of the base is read once per simulation step and the wheel speeds are only sent when they change.
+        The measured control loop rate (Hz, wall time) is stored in self.control_rate and returned.
+        """
+        controller = PurePursuit(path, lookahead=lookahead, vmax=vmax, wmax=wmax, goal_tolerance=goal_tolerance)
+        t0 = time.perf_counter()
+        n_steps = 0
+        done = False
+        for i in range(max_steps):
+            pose = base.get_transform().t2v(n=2)
+            v, w, done = controller.compute(pose)
+            if done:
+                break
+            self.move(v, w)
+            self.wait()
+            n_steps += 1
+        self.set_wheel_speeds(0.0, 0.0)
+        if n_steps > 0:
+            self.control_rate = n_steps / (time.perf_counter() - t0)
+        if not done:
+            print('FOLLOW PATH WARNING: max_steps reached before the end of the path')
+        return self.control_rate
 
     def forward(self):
-        wheel_speeds = [3, 3, 3, 3]
         print('va')
-        for i in range(4):
-            self.simulation.sim.setJointTargetVelocity(self.joints[i], wheel_speeds[i])
+        self.set_wheel_speeds(3, 3)
 
     def backward(self):
-        wheel_speeds = [-3, -3, -3, -3]
-        for i in range(4):
-            self.simulation.sim.setJointTargetVelocity(self.joints[i], wheel_speeds[i])
+        self.set_wheel_speeds(-3, -3)
 
     def left(self):
-        wheel_speeds = [0, 0, 3, 3]
-        for i in range(4):
-            self.simulation.sim.setJointTargetVelocity(self.joints[i], wheel_speeds[i])
+        self.set_wheel_speeds(0, 3)
 
     def right(self):
-        wheel_speeds = [3, 3, 0, 0]
-        for i in range(4):
-            self.simulation.sim.setJointTargetVelocity(self.joints[i], wheel_speeds[i])
+        self.set_wheel_speeds(3, 0)
 
     def get_wheel_torques(self):
         torques = []
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Opt-in instrumentation of the robots and the simulation.
+
+Profiler wraps the motion methods of a robot (moveJ, moveL, moveAbsJ, inversekinematics, path planning and joint
+control) and all the remote calls to Coppelia (simulation.sim.* and simulation.client.step) with timers. Nothing is
+measured unless instrument_robot/instrument_simulation are called, and uninstrument restores the original objects.
+
+After a run:
+- summary(): number of calls, latency statistics and a latency histogram of each method, and the remote calls per
+  simulation step.
+- save_json(filename): the summary in JSON format.
+- save_folded(filename): the self time of each call stack (e.g. moveJ;apply_speed_joint_control;sim.getJointPosition)
+  in microseconds, in the folded format read by flamegraph.pl or speedscope.
+
+Usage:
+    profiler = Profiler()
+    profiler.instrument_simulation(simulation)
+    profiler.instrument_robot(robot)
+    robot.moveJ(...)
+    profiler.print_summary()
+    profiler.save_folded('moveJ.folded')
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import json
+import time
+import numpy as np
+
+ROBOT_METHODS = ['moveJ', 'moveL', 'moveAbsJ', 'moveAbsPath', 'inversekinematics', 'inversekinematics_line',
+                 'path_plan_isochronous_trapezoidal', 'apply_speed_joint_control', 'apply_position_joint_control']
+
+
+class SimProxy():
+    """
+    Replaces simulation.sim. The functions of sim are timed with the name sim.<function>. Other attributes (e.g.
+    constants such as sim.handle_world) are returned unchanged.
+    """
+    def __init__(self, sim, profiler):
+        self.sim = sim
+        self.profiler = profiler
+        self.functions = {}
+
+    def __getattr__(self, name):
+        function = self.functions.get(name)
+        if function is not None:
+            return function
+        attribute = getattr(self.sim, name)
+        if not callable(attribute):
+            return attribute
+        function = self.profiler.wrap('sim.' + name, attribute)
+        self.functions[name] = function
+        return function
+
+
+class Profiler():
+    def __init__(self):
+        # latencies (s) of each name
+        self.latencies = {}
+        # self time (s) of each call stack
+        self.stacks = {}
+        self.stack = []
+        self.children = [0.0]
+        self.robots = []
+        self.simulations = []
+
+    def reset(self):
+        self.latencies = {}
+        self.stacks = {}
+        self.stack = []
+        self.children = [0.0]
+
+    def wrap(self, name, function):
+        """
+        Returns a function that calls function and records its latency with the given name.
+        """
+        def timed(*args, **kwargs):
+            self.stack.append(name)
+            self.children.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                children = self.children.pop()
+                key = ';'.join(self.stack)
+                self.stacks[key] = self.stacks.get(key, 0.0) + elapsed - children
+                self.stack.pop()
+                self.children[-1] += elapsed
+                if name in self.latencies:
+                    self.latencies[name].append(elapsed)
+                else:
+                    self.latencies[name] = [elapsed]
+        timed.wrapped = function
+        return timed
+
+    def instrument_robot(self, robot, methods=None):
+        """
+        Wraps the methods of the robot (ROBOT_METHODS by default) that exist in its class.
+        """
+        if methods is None:
+            methods = ROBOT_METHODS
+        wrapped = []
+        for name in methods:
+            if not hasattr(robot, name) or name in robot.__dict__:
+                continue
+            setattr(robot, name, self.wrap(name, getattr(robot, name)))
+            wrapped.append(name)
+        self.robots.append((robot, wrapped))
+
+    def instrument_simulation(self, simulation):
+        """
+        Wraps the remote calls: simulation.sim is replaced by a SimProxy and simulation.client.step is timed.
+        """
+        if isinstance(simulation.sim, SimProxy):
+            return
+        simulation.sim = SimProxy(simulation.sim, self)
+        simulation.client.step = self.wrap('client.step', simulation.client.step)
+        self.simulations.append(simulation)
+
+    def uninstrument(self):
+        for robot, wrapped in self.robots:
+            for name in wrapped:
+                delattr(robot, name)
+        for simulation in self.simulations:
+            simulation.sim = simulation.sim.sim
+            del simulation.client.step
+        self.robots = []
+        self.simulations = []
+
+    def summary(self):
+        """
+        Statistics of the latencies (ms) of each name. The histogram counts the calls in buckets of powers of 2
+        microseconds (bucket k: [2^k, 2^(k+1)) us).
+        """
+        result = {}
+        for name in self.latencies:
+            t = np.array(self.latencies[name]) * 1000
+            buckets = np.floor(np.log2(np.maximum(t * 1000, 1))).astype(int)
+            histogram = np.bincount(buckets)
+            result[name] = {'calls': len(t),
+                            'total_ms': float(np.sum(t)),
+                            'mean_ms': float(np.mean(t)),
+                            'min_ms': float(np.min(t)),
+                            'p50_ms': float(np.percentile(t, 50)),
+                            'p90_ms': float(np.percentile(t, 90)),
+                            'p99_ms': float(np.percentile(t, 99)),
+                            'max_ms': float(np.max(t)),
+                            'histogram_us': {str(2 ** k): int(histogram[k]) for k in range(len(histogram))
+                                             if histogram[k] > 0}}
+        steps = len(self.latencies.get('client.step', []))
+        remote = sum([len(self.latencies[name]) for name in self.latencies if name.startswith('sim.')])
+        result['remote_calls_per_step'] = remote / steps if steps > 0 else None
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        print('%-40s %8s %10s %9s %9s %9s' % ('NAME', 'CALLS', 'TOTAL(ms)', 'MEAN(ms)', 'P90(ms)', 'MAX(ms)'))
+        names = [name for name in summary if name != 'remote_calls_per_step']
+        names.sort(key=lambda name: -summary[name]['total_ms'])
+        for name in names:
+            s = summary[name]
+            print('%-40s %8d %10.2f %9.3f %9.3f %9.3f' % (name, s['calls'], s['total_ms'], s['mean_ms'],
+                                                          s['p90_ms'], s['max_ms']))
+        print('REMOTE CALLS PER SIMULATION STEP: ', summary['remote_calls_per_step'])
+
+    def save_json(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def save_folded(self, filename):
+        with open(filename, 'w') as file:
+            for key in self.stacks:
+                file.write('%s %d\n' % (key, int(round(self.stacks[key] * 1e6))))
@@ -11,6 +11,7 @@ RobotKUKALBR is a derived class of the Robot base class that particularizes some
 """
 import numpy as np
 from artelib.homogeneousmatrix import HomogeneousMatrix
+from artelib.dynamics import RobotDynamics, uniform_link_inertias
 from artelib.inverse_kinematics import delta_q
 from artelib.seriallink import SerialRobot
 from artelib.tools import compute_kinematic_errors, minimize_w_lateral
@@ -28,6 +29,9 @@ class RobotKUKALBR(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([180, 180, 180, 180, 180, 180, 180, 180])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([600, 600, 600, 600, 600, 600, 600])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges
         joint_ranges = np.array([[-180, -180, -180, -180, -180, -180, -180],
                                  [180,   180,  180,  180,  180,  180,  180]])
@@ -55,26 +59,15 @@ class RobotKUKALBR(Robot):
         self.serialrobot.append(th=0, d=0.4,   a=0, alpha=-np.pi/2, link_type='R')
         self.serialrobot.append(th=0, d=0,     a=0, alpha=np.pi/2, link_type='R')
         self.serialrobot.append(th=0, d=0.111, a=0, alpha=0)
+        # inertial parameters: approximate masses of the links (kg). The centers of mass and inertia tensors are
+        # approximated by uniform cylinders between the origins of the DH systems
+        masses = np.array([4.0, 4.0, 3.0, 2.7, 1.7, 1.8, 0.3])
+        coms, inertias = uniform_link_inertias(self.serialrobot, masses, radius=0.06)
+        self.dynamics = RobotDynamics(self.serialrobot, masses, coms, inertias)
 
     def start(self, base_name='/LBR_iiwa_14_R820', joint_name='joint'):
-        robotbase = self.simulation.sim.getObject(base_name)
-        q1 = self.simulation.sim.getObject(base_name + '/' + joint_name + '1')
-        q2 = self.simulation.sim.getObject(base_name + '/' + joint_name + '2')
-        q3 = self.simulation.sim.getObject(base_name + '/' + joint_name + '3')
-        q4 = self.simulation.sim.getObject(base_name + '/' + joint_name + '4')
-        q5 = self.simulation.sim.getObject(base_name + '/' + joint_name + '5')
-        q6 = self.simulation.sim.getObject(base_name + '/' + joint_name + '6')
-        q7 = self.simulation.sim.getObject(base_name + '/' + joint_name + '7')
-
-        joints = []
-        joints.append(q1)
-        joints.append(q2)
-        joints.append(q3)
-        joints.append(q4)
-        joints.append(q5)
-        joints.append(q6)
-        joints.append(q7)
-        self.joints = joints
+        # handles resolved in a single call
+        self.joints = self.simulation.get_objects([base_name + '/' + joint_name + str(i) for i in range(1, 8)])
 
     def get_symbolic_jacobian(self, q):
         J, Jv, Jw = eval_symbolic_jacobian_KUKALBR(q)
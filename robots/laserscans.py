@@ -5,25 +5,90 @@ Classes to manage a 2D Laser Scanner e.g. Sick LMS laser scanner from Sick GmBh
 
 @Authors: Arturo Gil
 @Time: April 2023
-
+@Revision: October 2026, ported to the ZMQ api. Scans are returned as LaserScan objects.
 """
+import numpy as np
+
+
+class LaserScan():
+    """
+    A single 2D laser scan. ranges, angles and intensities are arrays with one element per beam.
+    Coppelia does not simulate intensities, thus they are None unless provided.
+    """
+    def __init__(self, ranges, angles, intensities=None, timestamp=None):
+        self.ranges = ranges
+        self.angles = angles
+        self.intensities = intensities
+        self.timestamp = timestamp
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def to_cartesian(self, max_range=None):
+        """
+        Returns an (N, 2) array with the XY coordinates of the beams in the sensor reference frame.
+        If max_range is given, the beams with larger (or invalid) ranges are removed.
+        """
+        points = np.column_stack((self.ranges * np.cos(self.angles),
+                                  self.ranges * np.sin(self.angles)))
+        if max_range is not None:
+            valid = np.isfinite(self.ranges) & (self.ranges < max_range)
+            points = points[valid]
+        return points
+
+    def transform(self, pose, max_range=None):
+        """
+        Returns an (N, 2) array with the XY coordinates of the beams in the global reference frame.
+        pose = [x, y, theta] is the pose of the sensor.
+        """
+        points = self.to_cartesian(max_range=max_range)
+        c = np.cos(pose[2])
+        s = np.sin(pose[2])
+        R = np.array([[c, -s], [s, c]])
+        return np.dot(points, R.T) + np.array(pose[0:2])
 
 
 class LaserScanner2D():
-    def __init__(self, simulation):
+    def __init__(self, simulation, layout='xyz', angle_min=-np.pi/2, angle_max=np.pi/2):
+        """
+        layout: how the floats are packed in the laserdata signal.
+            'xyz': x, y, z of each detected point in the sensor frame (as in the youBot2.ttt environment).
+            'ranges': a range for each beam, evenly spaced between angle_min and angle_max.
+        """
         self.simulation = simulation
         self.handle = None
+        self.layout = layout
+        self.angle_min = angle_min
+        self.angle_max = angle_max
 
     def start(self, name='/youBot/LaserScanner2D'):
-        errorCode, handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
     def get_laser_data(self):
         """
-        This reads the laserdata signal in Coppelia and returns it.
-        The laserdata signal must be defined as in the Youbot2.ttt environment.
+        This reads the laserdata signal in Coppelia and returns it as a LaserScan.
+        The laserdata signal must be defined as in the Youbot2.ttt environment (a string signal with the packed floats).
+        The floats are decoded directly from the signal bytes (no copy), None is returned if the signal is not found.
+        """
+        data = self.simulation.sim.getStringSignal('laserdata')
+        if data is None:
+            return None
+        timestamp = self.simulation.sim.getSimulationTime()
+        return self.decode(data, timestamp=timestamp)
+
+    def decode(self, data, timestamp=None):
+        """
+        Build a LaserScan from the bytes of the laserdata signal (packed little endian float32).
         """
-        error, data = self.simulation.sim.simxGetStringSignal('laserdata')
-        # TODO: after unpacking the floats, some more-readable data structure should be built.
-        data = self.simulation.sim.simxUnpackFloats(data)
-        return data
+        floats = np.frombuffer(data, dtype='<f4')
+        if self.layout == 'xyz':
+            points = floats.reshape(-1, 3)
+            ranges = np.hypot(points[:, 0], points[:, 1])
+            angles = np.arctan2(points[:, 1], points[:, 0])
+        elif self.layout == 'ranges':
+            ranges = floats
+            angles = np.linspace(self.angle_min, self.angle_max, len(ranges))
+        else:
+            raise Exception('Unknown laser data layout: ' + str(self.layout))
+        return LaserScan(ranges=ranges, angles=angles, timestamp=timestamp)
@@ -13,9 +13,7 @@ from artelib import rotationmatrix
 from artelib import homogeneousmatrix
 from artelib import vector
 from artelib import euler
-from artelib.euler import Euler
 from artelib.homogeneousmatrix import HomogeneousMatrix
-from artelib.vector import Vector
 
 
 class CoppeliaObject():
@@ -25,7 +23,7 @@ class CoppeliaObject():
 
     def start(self, name='/CoppeliaObject'):
         # Get the handles of the relevant objects
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
     def set_position(self, position):
@@ -38,6 +36,7 @@ class CoppeliaObject():
         elif isinstance(position, homogeneousmatrix.HomogeneousMatrix):
             position = position.pos
         self.simulation.sim.setObjectPosition(self.handle, -1, position.tolist())
+        self.simulation.invalidate_pose(self.handle)
         self.simulation.wait()
 
     def set_orientation(self, orientation):
@@ -50,6 +49,7 @@ class CoppeliaObject():
         elif isinstance(orientation, euler.Euler):
             abg = orientation.abg
         self.simulation.sim.setObjectOrientation(self.handle, -1, abg.tolist())
+        self.simulation.invalidate_pose(self.handle)
         self.simulation.wait()
 
     def set_position_and_orientation(self, *args):
@@ -73,6 +73,7 @@ class CoppeliaObject():
 
         self.simulation.sim.setObjectPosition(self.handle, -1, position.tolist())
         self.simulation.sim.setObjectOrientation(self.handle, -1, orientation.tolist())
+        self.simulation.invalidate_pose(self.handle)
         self.simulation.wait()
 
     def get_position(self):
@@ -85,12 +86,9 @@ class CoppeliaObject():
 
     def get_transform(self):
         """
-        Returns a homogeneous transformation matrix
+        Returns a homogeneous transformation matrix (a single remote call, see Simulation.get_object_matrix)
         """
-        p = self.get_position()
-        o = self.get_orientation()
-        T = HomogeneousMatrix(Vector(p), Euler(o))
-        return T
+        return HomogeneousMatrix(np.array(self.simulation.get_object_matrix(self.handle)))
 
     def wait(self, steps=1):
         self.simulation.wait(steps=steps)
@@ -101,7 +99,7 @@ class Sphere(CoppeliaObject):
         CoppeliaObject.__init__(self, simulation=simulation)
 
     def start(self, name='/Sphere'):
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
 
@@ -111,7 +109,7 @@ class ReferenceFrame(CoppeliaObject):
 
     def start(self, name='/ReferenceFrame'):
         # Get the handles of the relevant objects
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
     def show_target_point(self, target_position, target_orientation, wait_time=0.5):
@@ -132,7 +130,7 @@ class Cuboid(CoppeliaObject):
 
     def start(self, name='/Cuboid'):
         # Get the handles of the relevant objects
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
 
@@ -146,6 +144,71 @@ class Dummy(CoppeliaObject):
         self.handle = handle
 
 
+class ObjectCollection():
+    """
+    A set of objects whose poses are read (and written) with a single remote call, e.g. the pieces of a pallet
+    (/Cuboid, /Cuboid[1], /Cuboid[2]...).
+    """
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.handles = None
+
+    def start(self, base_name='/Cuboid', n=1, names=None):
+        """
+        Use base_name and n for the copies base_name, base_name[1], ..., base_name[n-1], or a list of names.
+        """
+        if names is None:
+            self.handles = self.simulation.get_indexed_objects(base_name, n)
+        else:
+            self.handles = self.simulation.get_objects(names)
+
+    def get_transforms(self):
+        """
+        Returns the poses of all the objects with respect to the world, as an (N, 4, 4) array.
+        """
+        code = 'local r = {} for i, h in ipairs({%s}) do local m = sim.getObjectMatrix(h, sim.handle_world) ' \
+               'for j = 1, 12 do r[#r + 1] = m[j] end end return r' % ','.join([str(h) for h in self.handles])
+        try:
+            m = np.array(self.simulation.execute_lua(code), dtype=float)
+        except Exception as e:
+            # one call per object
+            self.simulation.lua_fallback('ObjectCollection.get_transforms', e)
+            return np.array([self.simulation.get_object_matrix(h) for h in self.handles])
+        T = np.zeros((len(self.handles), 4, 4))
+        T[:, 0:3, :] = m.reshape(-1, 3, 4)
+        T[:, 3, 3] = 1
+        return T
+
+    def get_transform(self, i):
+        return HomogeneousMatrix(self.get_transforms()[i])
+
+    def set_transforms(self, transforms):
+        """
+        Sets the poses of all the objects. transforms: (N, 4, 4) array or list of HomogeneousMatrix.
+        The dynamic objects are reset (their speeds are set to zero), e.g. to restore a pallet.
+        """
+        T = np.array([t.toarray() if isinstance(t, HomogeneousMatrix) else t for t in transforms], dtype=float)
+        matrices = ['{%s}' % ','.join([repr(float(x)) for x in T[i, 0:3, :].ravel()]) for i in range(len(T))]
+        code = 'local hs = {%s} local ms = {%s} for i, h in ipairs(hs) do ' \
+               'sim.setObjectMatrix(h, sim.handle_world, ms[i]) sim.resetDynamicObject(h) end' % \
+               (','.join([str(h) for h in self.handles]), ','.join(matrices))
+        try:
+            self.simulation.execute_lua(code)
+        except Exception as e:
+            self.simulation.lua_fallback('ObjectCollection.set_transforms', e)
+            for i in range(len(T)):
+                self.simulation.sim.setObjectMatrix(self.handles[i], -1, T[i, 0:3, :].ravel().tolist())
+                self.simulation.sim.resetDynamicObject(self.handles[i])
+        for h in self.handles:
+            self.simulation.invalidate_pose(h)
+
+    def set_positions_and_orientations(self, positions, orientations):
+        """
+        Sets the positions (Vector or list) and orientations (Euler, RotationMatrix or Quaternion) of all the objects.
+        """
+        self.set_transforms([HomogeneousMatrix(positions[i], orientations[i]) for i in range(len(positions))])
+
+
 def get_object_transform(simulation, base_name, piece_index):
     """
     Returns the position and orientation of th ith Cuboid in Coppelia
@@ -153,10 +216,6 @@ def get_object_transform(simulation, base_name, piece_index):
     Used to get the transformation matrix of collection of objects with consecutive indices
     """
     obj = CoppeliaObject(simulation=simulation)
-    if piece_index == 0:
-        name = base_name
-    else:
-        name = base_name + '[' + str(piece_index) + ']'
-    print('LOOKING FOR OBJECT TRANSFORM', name)
-    obj.start(name)
+    # the handle is resolved only the first time (see Simulation.get_object)
+    obj.handle = simulation.get_object(base_name, index=piece_index)
     return obj.get_transform()
@@ -13,7 +13,6 @@ from artelib.homogeneousmatrix import HomogeneousMatrix
 from artelib.path_planning import filter_path, path_trapezoidal_i
 from artelib.seriallink import SerialRobot
 from robots.robot import Robot
-import matplotlib.pyplot as plt
 
 
 class OneDOFRobot(Robot):
@@ -31,6 +30,9 @@ class OneDOFRobot(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([500])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([2500])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges. joints 4 and 6 can be configured as unlimited
         # default joint limits:
         # q1 (+-180), q2 (-90,110), q3 (-230, 50), q4 (+-200), q5 (+-115), q6 (+-400)
@@ -68,7 +70,7 @@ class OneDOFRobot(Robot):
         armjoints = []
         # Get the handles of the relevant objects
         # robotbase = self.simulation.sim.getObject(base_name)
-        q1 = self.simulation.sim.getObject(base_name + '/' + joint_name + '1')
+        q1 = self.simulation.get_object(base_name + '/' + joint_name + '1')
         armjoints.append(q1)
         # must store the joints
         self.joints = armjoints
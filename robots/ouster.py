@@ -7,19 +7,28 @@ Classes to manage a OS1 LIDAR in Coppelia simulations (a LiDAR sensor)
 @Time: April 2021
 """
 import numpy as np
-import open3d as o3d
+from artelib.pointcloud_storage import PointCloudReader
 
 
 class Ouster():
     def __init__(self, simulation):
         self.simulation = simulation
         self.handle = None
-        self.pointcloud = o3d.geometry.PointCloud()
+        self.pointcloud = None
 
     def start(self, name='OS1'):
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
+    def get_pointcloud(self):
+        """
+        The Open3D point cloud is created on first use, so that open3d is only imported when needed.
+        """
+        if self.pointcloud is None:
+            import open3d as o3d
+            self.pointcloud = o3d.geometry.PointCloud()
+        return self.pointcloud
+
     def get_laser_data(self):
         """
         This reads the laserdata signal in Coppelia and returns it.
@@ -31,21 +40,42 @@ class Ouster():
         if data != None:
             # reshape to 3D points
             data = np.reshape(data, (-1, 3))
-            self.pointcloud.points = o3d.utility.Vector3dVector(data)
+            self.from_points(data)
             return data
         else:
             return None
 
     def from_file(self, filename):
+        import open3d as o3d
         self.pointcloud = o3d.io.read_point_cloud(filename, print_progress=True)
 
     def from_points(self, points):
-        self.pointcloud.points = o3d.utility.Vector3dVector(points)
+        import open3d as o3d
+        self.get_pointcloud().points = o3d.utility.Vector3dVector(points)
 
     def save_pointcloud(self, output_filename):
-        o3d.io.write_point_cloud(output_filename, self.pointcloud)
+        import open3d as o3d
+        o3d.io.write_point_cloud(output_filename, self.get_pointcloud())
+
+    def append_to_store(self, writer, timestamp=None):
+        """
+        Appends the current pointcloud as a new scan to a PointCloudWriter (see artelib.pointcloud_storage).
+        Use it to save long recordings instead of writing a PCD file per scan.
+        """
+        points = np.asarray(self.get_pointcloud().points)
+        return writer.append(points, timestamp=timestamp)
+
+    def from_store(self, filename, scan):
+        """
+        Loads a single scan from a point cloud container, without reading the rest of the file.
+        """
+        reader = PointCloudReader(filename)
+        points = reader.read_scan(scan)
+        reader.close()
+        self.from_points(points.astype(np.float64))
 
     def draw_pointcloud(self):
-        o3d.visualization.draw_geometries([self.pointcloud])
+        import open3d as o3d
+        o3d.visualization.draw_geometries([self.get_pointcloud()])
 
 
@@ -23,6 +23,9 @@ class Planar4DOF(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([180, 180, 180, 180])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([1000, 1000, 1000, 1000])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges
         joint_ranges = np.array([[-90, -90, -90, -90],
                                  [90,   90,  90,  90]])
@@ -14,7 +14,7 @@ class ProxSensor():
         self.proxsensor = None
 
     def start(self, name='/conveyor/prox_sensor'):
-        prox_sensor = self.simulation.sim.getObject(name)
+        prox_sensor = self.simulation.get_object(name)
         self.proxsensor = prox_sensor
 
     def is_activated(self):
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Record and replay the remote calls to Coppelia.
+
+RecordingSimulation is used as robots.simulation.Simulation. After start(), every call to simulation.sim.* and
+simulation.client.* is logged with its arguments, its result and its latency. The log is saved (gzip + pickle) when
+the simulation is stopped.
+
+ReplaySimulation reads the log and returns the recorded results in the same order, without Coppelia. The Python side
+of an application (kinematics, planning, control, image processing...) can then be run and benchmarked in a
+reproducible way. If the application performs a different sequence of calls, or calls a function with different
+arguments (floats and arrays are compared with a tolerance), an exception is raised (strict=True). With
+realtime=True, the recorded latency of each call is also reproduced.
+
+Usage (see tests/replay_benchmark.py):
+    simulation = RecordingSimulation('palletizing.pkl.gz')   # instead of Simulation(), with Coppelia running
+    ...
+    simulation = ReplaySimulation('palletizing.pkl.gz')      # Coppelia is not needed
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import gzip
+import pickle
+import time
+import numpy as np
+from robots.simulation import Simulation
+
+
+class Recorder():
+    def __init__(self):
+        # (name, args, kwargs, result, latency)
+        self.calls = []
+        # values of the attributes that are not functions (e.g. sim.handle_world)
+        self.constants = {}
+
+    def save(self, filename):
+        with gzip.open(filename, 'wb') as file:
+            pickle.dump({'calls': self.calls, 'constants': self.constants}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class RecordingProxy():
+    """
+    Replaces an object (sim or client) and logs the calls to its functions in the recorder.
+    """
+    def __init__(self, target, prefix, recorder):
+        self.target = target
+        self.prefix = prefix
+        self.recorder = recorder
+        self.functions = {}
+
+    def __getattr__(self, name):
+        function = self.functions.get(name)
+        if function is not None:
+            return function
+        attribute = getattr(self.target, name)
+        key = self.prefix + name
+        if not callable(attribute):
+            self.recorder.constants[key] = attribute
+            return attribute
+        calls = self.recorder.calls
+
+        def record(*args, **kwargs):
+            t0 = time.perf_counter()
+            result = attribute(*args, **kwargs)
+            calls.append((key, args, kwargs, result, time.perf_counter() - t0))
+            return result
+        self.functions[name] = record
+        return record
+
+
+class ReplayProxy():
+    """
+    Returns the recorded results of the calls in order.
+    """
+    def __init__(self, prefix, replay):
+        self.prefix = prefix
+        self.replay = replay
+        self.functions = {}
+
+    def __getattr__(self, name):
+        function = self.functions.get(name)
+        if function is not None:
+            return function
+        key = self.prefix + name
+        if key in self.replay.constants:
+            return self.replay.constants[key]
+        replay = self.replay
+
+        def play(*args, **kwargs):
+            return replay.next(key, args, kwargs)
+        self.functions[name] = play
+        return play
+
+
+def same_arguments(a, b, tolerance=1e-6):
+    """
+    Compares the arguments of two calls. Floats and arrays are compared with a tolerance.
+    """
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a = np.asarray(a)
+        b = np.asarray(b)
+        if a.shape != b.shape:
+            return False
+        if a.dtype.kind in 'biuf' and b.dtype.kind in 'biuf':
+            return bool(np.allclose(a, b, rtol=0, atol=tolerance))
+        return all([same_arguments(x, y, tolerance) for x, y in zip(a.ravel(), b.ravel())])
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all([same_arguments(x, y, tolerance) for x, y in zip(a, b)])
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all([same_arguments(a[k], b[k], tolerance) for k in a])
+    if isinstance(a, (float, np.floating)) or isinstance(b, (float, np.floating)):
+        if isinstance(a, (bool, str, type(None))) or isinstance(b, (bool, str, type(None))):
+            return False
+        return abs(a - b) <= tolerance
+    return a == b
+
+
+class Replay():
+    def __init__(self, filename, strict=True, realtime=False, tolerance=1e-6):
+        with gzip.open(filename, 'rb') as file:
+            data = pickle.load(file)
+        self.calls = data['calls']
+        self.constants = data['constants']
+        self.strict = strict
+        self.realtime = realtime
+        self.tolerance = tolerance
+        self.index = 0
+
+    def next(self, key, args, kwargs=None):
+        if self.index >= len(self.calls):
+            raise Exception('REPLAY: NO MORE RECORDED CALLS. CALLED: ' + key)
+        name, recorded_args, recorded_kwargs, result, latency = self.calls[self.index]
+        if self.strict and name != key:
+            raise Exception('REPLAY: CALL %d IS %s, BUT %s WAS RECORDED' % (self.index, key, name))
+        if self.strict and not same_arguments((args, kwargs or {}), (recorded_args, recorded_kwargs), self.tolerance):
+            raise Exception('REPLAY: CALL %d (%s) WITH ARGUMENTS %r %r, BUT %r %r WERE RECORDED' %
+                            (self.index, key, args, kwargs or {}, recorded_args, recorded_kwargs))
+        self.index += 1
+        if self.realtime:
+            time.sleep(latency)
+        return result
+
+    def remaining(self):
+        return len(self.calls) - self.index
+
+
+class RecordingSimulation(Simulation):
+    def __init__(self, filename):
+        Simulation.__init__(self)
+        self.filename = filename
+        self.recorder = Recorder()
+
+    def start(self):
+        Simulation.start(self)
+        self.sim = RecordingProxy(self.sim, 'sim.', self.recorder)
+        self.client = RecordingProxy(self.client, 'client.', self.recorder)
+
+    def stop(self):
+        Simulation.stop(self)
+        self.save()
+
+    def save(self):
+        self.recorder.save(self.filename)
+        print('SAVED ', len(self.recorder.calls), ' REMOTE CALLS TO ', self.filename)
+
+
+class ReplaySimulation(Simulation):
+    def __init__(self, filename, strict=True, realtime=False, tolerance=1e-6):
+        Simulation.__init__(self)
+        self.replay = Replay(filename, strict=strict, realtime=realtime, tolerance=tolerance)
+
+    def start(self):
+        self.sim = ReplayProxy('sim.', self.replay)
+        self.client = ReplayProxy('client.', self.replay)
+        print('REPLAYING ', len(self.replay.calls), ' REMOTE CALLS')
+
+    def stop(self):
+        Simulation.stop(self)
+        if self.replay.remaining() > 0:
+            print('REPLAY: ', self.replay.remaining(), ' RECORDED CALLS WERE NOT USED')
@@ -9,14 +9,16 @@ Base Robot Class
 import numpy as np
 from artelib.homogeneousmatrix import HomogeneousMatrix
 from artelib.path_planning import path_planning_line_factors, filter_path, time_trapezoidal_path_i, path_trapezoidal_i, \
-    path_planning_line_constant_speed
+    path_planning_line_constant_speed, path_plan_isochronous_time_optimal, path_plan_blended
 # from artelib.plottools import plot_vars, plot, plot3d
 # from artelib.tools import compute_w_between_orientations, euler2rot, rot2quaternion, buildT, compute_w_between_R, \
 #     null_space, diff_w_central, w_central, null_space_projector, compute_kinematic_errors, rot2euler, quaternion2rot, \
 #     q2euler, buildT
-import matplotlib.pyplot as plt
 # from robots.objects import ReferenceFrame
 from artelib.tools import angular_w_between_quaternions
+from artelib.trajectories import path_plan_isochronous_profile, quintic, time_quintic
+from artelib.joint_control import JointPID
+from artelib.odometry import DifferentialOdometry
 from artelib.vector import Vector
 
 
@@ -27,6 +29,8 @@ class Robot():
         # a list of joint handles to move the robot
         self.joints = None
         self.max_joint_speeds = None
+        # max joint accelerations (rad/s^2). If defined, the movements are planned in minimum time
+        self.max_joint_accelerations = None
         self.joint_ranges = None
         # parameters of the inverse kinematics algorithm
         self.max_iterations_inverse_kinematics = None
@@ -43,8 +47,26 @@ class Robot():
         self.max_error_dist_inversekinematics = None
         self.max_error_orient_inversekinematics = None
         self.do_apply_joint_limits = None
+        # speed controller of the joints used by apply_speed_joint_control (any object with reset() and
+        # compute(q_ref, qd_ref, q) methods). If None, a JointPID is built with joint_gains [kp, ki, kd] (one row per
+        # joint) or with the default gains kp=5.5, ki=0, kd=0.4 for all joints
+        self.joint_controller = None
+        self.joint_gains = None
+        # controller built by get_joint_controller from joint_gains, its gains and its time step
+        self.built_joint_controller = None
+        self.built_joint_gains = None
+        self.built_joint_delta_time = None
+        # rigid body dynamics (artelib.dynamics.RobotDynamics) used by the torque control methods
+        self.dynamics = None
+        # steps/time of the last precision phase (apply_position_joint_control) and whether it converged
+        self.settle_steps = 0
+        self.settle_time = 0.0
+        self.settle_converged = False
         # wait these iterations before a WARNING is issued
         self.max_iterations_joint_target = 100
+        # wheel odometry of the mobile robots (see start_odometry) and simulation time step used to integrate it
+        self.odometry = None
+        self.delta_time = None
 
         # base reference system transformation
         self.T0 = HomogeneousMatrix(np.eye(4))
@@ -106,11 +128,12 @@ class Robot():
             qd_actual[i] = self.simulation.sim.getJointVelocity(self.joints[i])
         return qd_actual
 
-    def moveAbsJ(self, q_target, qdfactor=1.0, precision=True, endpoint=True):
+    def moveAbsJ(self, q_target, qdfactor=1.0, precision=True, endpoint=True, profile='trapezoidal'):
         """
         Commands the robot to the specified joint target positions.
         The targets are filtered and the robot is not commanded whenever a single joint is out of range.
         A path is planned considering the qdmax factor which ranges from 0 (zero speed) to 1.0 (full joint speed).
+        profile: 'trapezoidal', 'quintic' or 'scurve' (jerk limited). The smooth profiles always end at rest.
         """
         # remove joints out of range and get the closest joint
         total, partial = self.check_joints(q_target)
@@ -119,7 +142,10 @@ class Robot():
             delta = np.linalg.norm(q_target-q_current)
             # only plan if some of the joints are very far from the desired q_target
             if delta > self.epsilonq:
-                qs, qds = self.path_plan_isochronous_trapezoidal(q_target, qdfactor=qdfactor, endpoint=endpoint)
+                if profile == 'trapezoidal':
+                    qs, qds = self.path_plan_isochronous_trapezoidal(q_target, qdfactor=qdfactor, endpoint=endpoint)
+                else:
+                    qs, qds = self.path_plan_isochronous_smooth(q_target, qdfactor=qdfactor, profile=profile)
                 # apply the computed profile in joint and speeds
                 self.apply_speed_joint_control(qs, qds)
                 if precision:
@@ -191,6 +217,47 @@ class Robot():
         for i in range(n_movements):
             self.moveAbsJ(q_target=q_path[:, i], qdfactor=qdfactor, precision=precision, endpoint=endpoint)
 
+    def moveAbsPathBlended(self, q_path, qdfactor=1.0, zone=0.05, precision=True):
+        """
+        Commands the robot through a set of joint positions (a DOF x n array) in a single continuous movement.
+        The robot does not stop at the intermediate positions. Instead, the segments are joined with blends that
+        start at a distance zone (rad) from each intermediate position (see path_plan_blended).
+        The robot stops at the last position.
+        The robot is not commanded whenever a single joint of any position is out of range (see check_joints).
+        """
+        q_path = np.array(q_path)
+        for i in range(q_path.shape[1]):
+            total, partial = self.check_joints(q_path[:, i])
+            if not total:
+                print('moveAbsPathBlended ERROR: target joints out of range at position', i)
+                return
+        q_current = self.get_joint_positions()
+        q_path = np.hstack((q_current[:, None], q_path))
+        qdmax, qddmax, _ = self.get_joint_limits(qdfactor=qdfactor)
+        t, qs, qds = path_plan_blended(q_path, qdmax, qddmax, zone=zone)
+        self.apply_speed_joint_control(qs, qds)
+        if precision:
+            self.apply_position_joint_control(qs[:, -1], precision=True)
+        self.command_zero_target_velocities()
+
+    def moveJPath(self, target_positions, target_orientations, qdfactor=1.0, zone=0.05, extended=True, precision=True):
+        """
+        Commands the robot through a set of target positions and orientations in a single continuous movement.
+        The inverse kinematics of each target is computed and the solution closest to the previous one is selected.
+        Next, the joint positions are followed with moveAbsPathBlended.
+        """
+        q = self.get_joint_positions()
+        q_path = []
+        for i in range(len(target_positions)):
+            q_target = self.inversekinematics(q0=q, target_position=target_positions[i],
+                                              target_orientation=target_orientations[i], extended=extended)
+            qs = filter_path(self, q, [q_target])
+            if qs.size == 0:
+                raise Exception('INVERSE KINEMATICS ERROR. IS THE TARGET REACHABLE?')
+            q = qs[:, 0]
+            q_path.append(q)
+        self.moveAbsPathBlended(np.array(q_path).T, qdfactor=qdfactor, zone=zone, precision=precision)
+
     def command_zero_target_velocities(self):
         for i in range(len(self.joints)):
             self.simulation.sim.setJointTargetVelocity(self.joints[i], 0)
@@ -202,16 +269,13 @@ class Robot():
         caution: additive control considering the error on each of the joints
         qs and qds are the target joint and speed references to be followed
         """
-        delta_time = 0.05
         n_samples = qs.shape[1]
         # closed loop part
-        # using a global pid control for all joints
-        kpe = 5.5
-        kde = 0.4
-        kps = 0.2
+        # feedforward control with a PID correction on the error of each joint
+        controller = self.get_joint_controller()
+        controller.reset()
         qreal = []
         qdreal = []
-        eqi_1 = 0
         for i in range(n_samples):
             q_current = self.get_joint_positions()
             qd_current = self.get_joint_speeds()
@@ -219,24 +283,15 @@ class Robot():
             self.qd_path.append(qd_current)
             qreal.append(q_current)
             qdreal.append(qd_current)
-            # correct by a small amount based on the error
-            qi = qs[:, i]
-            qdi = qds[:, i]
-            eqi = qi-q_current
-            # eqdi = qdi-qd_current
-            deqi = (eqi-eqi_1)/delta_time
-            eqi_1 = eqi
-            # add a small quantity based on the error on each joint
-            # (feedforward control with compensation)
-            u = qdi + kpe*eqi + kde*deqi #+ kps*eqdi + kpe*eqi
+            u = controller.compute(qs[:, i], qds[:, i], q_current)
             self.set_joint_target_velocities(u)
-            self.simulation.client.step()
+            self.simulation.step()
 
         # last speed command
         qdi = qds[:, i]
         u = qdi #+ kps*eqdi + kpe*eqi
         self.set_joint_target_velocities(u)
-        self.simulation.client.step()
+        self.simulation.step()
 
         q_current = self.get_joint_positions()
         qd_current = self.get_joint_speeds()
@@ -261,29 +316,151 @@ class Robot():
         # plt.plot(range(n_samples + 1), qdreal)
         # plt.show()
 
-    def apply_position_joint_control(self, q_target, precision=True):
+    def set_joint_torques(self, tau):
+        """
+        CAUTION: the joints must be in torque/force control mode (see set_joint_control_modes).
+        """
+        for i in range(len(tau)):
+            self.simulation.sim.setJointTargetForce(self.joints[i], tau[i])
+
+    def get_joint_control_modes(self):
+        """
+        Dynamic control mode of each joint (sim.jointdynctrl_force, sim.jointdynctrl_position...).
+        """
+        sim = self.simulation.sim
+        return [sim.getObjectInt32Param(joint, sim.jointintparam_dynctrlmode) for joint in self.joints]
+
+    def set_joint_control_modes(self, modes):
+        sim = self.simulation.sim
+        for i in range(len(self.joints)):
+            sim.setObjectInt32Param(self.joints[i], sim.jointintparam_dynctrlmode, modes[i])
+
+    def apply_torque_joint_control(self, qs, qds, qdds, kp=100.0, kd=20.0, mode='computed_torque'):
+        """
+        Follows the references qs, qds, qdds (DOF x n) commanding the joint torques. The joints are in force mode
+        during the motion and their previous control modes are restored at the end.
+        mode='computed_torque': tau = M(q)(qdd + kp*e + kd*ed) + h(q, qd). Computed with a single call to the
+                                inverse dynamics (RNEA) at each step, since RNEA(q, qd, v) = M(q)v + h(q, qd).
+        mode='feedforward': the torques and the mass matrices of the whole trajectory are computed in a single
+                            (vectorized) call and a PD correction is added at each step:
+                            tau = tau_ref + M_ref(kp*e + kd*ed).
+        """
+        if self.dynamics is None:
+            raise Exception('The dynamics of the robot are not defined (self.dynamics)')
+        n_samples = qs.shape[1]
+        if mode == 'feedforward':
+            tau_ref = self.dynamics.inverse_dynamics(qs.T, qds.T, qdds.T)
+            M_ref = self.dynamics.mass_matrix(qs.T)
+        # the joints are switched to force mode (the position control is disabled) and the previous modes are
+        # restored on exit, holding the joints at the last position
+        sim = self.simulation.sim
+        modes = self.get_joint_control_modes()
+        self.set_joint_control_modes([sim.jointdynctrl_force]*len(self.joints))
+        try:
+            for i in range(n_samples):
+                q_current = self.get_joint_positions()
+                qd_current = self.get_joint_speeds()
+                self.q_path.append(q_current)
+                self.qd_path.append(qd_current)
+                e = qs[:, i] - q_current
+                ed = qds[:, i] - qd_current
+                if mode == 'feedforward':
+                    tau = tau_ref[i] + np.dot(M_ref[i], kp*e + kd*ed)
+                else:
+                    tau = self.dynamics.inverse_dynamics(q_current, qd_current, qdds[:, i] + kp*e + kd*ed)
+                self.set_joint_torques(tau)
+                self.simulation.step()
+        finally:
+            q_current = self.get_joint_positions()
+            for i in range(len(self.joints)):
+                sim.setJointTargetPosition(self.joints[i], float(q_current[i]))
+                sim.setJointTargetVelocity(self.joints[i], 0)
+            self.set_joint_control_modes(modes)
+
+    def moveAbsJTorque(self, q_target, qdfactor=1.0, kp=100.0, kd=20.0, mode='computed_torque'):
+        """
+        Moves the robot to q_target following a quintic trajectory with torque control (see
+        apply_torque_joint_control).
+        """
+        if self.dynamics is None:
+            raise Exception('moveAbsJTorque needs the dynamics of the robot (self.dynamics), not defined for this '
+                            'robot')
+        q_current = self.get_joint_positions()
+        qdmax, qddmax, _ = self.get_joint_limits(qdfactor=qdfactor)
+        T = np.amax(time_quintic(q_target - q_current, qdmax, qddmax))
+        T = 0.05*max(np.ceil(T/0.05), 1)
+        t, qs, qds, qdds = quintic(q_current, q_target, T, delta_time=0.05)
+        self.apply_torque_joint_control(qs, qds, qdds, kp=kp, kd=kd, mode=mode)
+
+    def get_joint_controller(self):
+        """
+        Returns joint_controller. The JointPID built from joint_gains is built again if joint_gains change (e.g. when
+        the gains are tuned after start()) or if the simulation time step changes. A controller assigned directly to
+        joint_controller is always used.
+        """
+        n = len(self.joints)
+        if self.joint_gains is None:
+            gains = np.tile([5.5, 0.0, 0.4], (n, 1))
+        else:
+            gains = np.array(self.joint_gains, dtype=float)[0:n]
+        delta_time = 0.05 if self.simulation is None else self.simulation.get_simulation_time_step()
+        changed = not np.array_equal(gains, self.built_joint_gains) or delta_time != self.built_joint_delta_time
+        if self.joint_controller is None or (self.joint_controller is self.built_joint_controller and changed):
+            self.joint_controller = JointPID(kp=gains[:, 0], ki=gains[:, 1], kd=gains[:, 2], delta_time=delta_time)
+            self.built_joint_controller = self.joint_controller
+            self.built_joint_gains = gains
+            self.built_joint_delta_time = delta_time
+        return self.joint_controller
+
+    def apply_position_joint_control(self, q_target, precision=True, max_iterations=50, horizon=4):
         """
         Apply a set of computed speeds profiles to the joints
         try to follow qs by applying a corrected version of qds
         caution: additive control considering the error on each of the joints
+        The gain of each joint is scheduled so that its error is predicted to fall below the threshold in horizon
+        steps (never lower than 5.5, never higher than 0.6/delta_time). The loop ends when the error and the error
+        predicted for the next step (considering the current joint speeds) are below the threshold. Only the error of
+        the next step is predicted, not the number of remaining steps.
+        The number of simulation steps performed and the time needed are stored in settle_steps and settle_time, and
+        settle_converged is False if max_iterations were performed before the threshold was met.
         """
         if precision:
             delta_threshold = 0.001
         else:
             delta_threshold = 0.1
-        k = 5.5
-        for i in range(50):
+        delta_time = 0.05
+        n = len(self.joints)
+        k_min = 5.5
+        k_max = 0.6/delta_time
+        qdmax = self.max_joint_speeds[0:n]
+        # threshold for each of the joints
+        ei_threshold = delta_threshold/np.sqrt(n)
+        steps = 0
+        converged = False
+        for i in range(max_iterations + 1):
             q_current = self.get_joint_positions()
             qd_current = self.get_joint_speeds()
             self.q_path.append(q_current)
             self.qd_path.append(qd_current)
             e = q_target - q_current
             delta = np.linalg.norm(e)
-            if delta < delta_threshold:
+            delta_next = np.linalg.norm(e - qd_current*delta_time)
+            if delta < delta_threshold and delta_next < delta_threshold:
+                converged = True
                 break
-            u = k * e
+            if steps == max_iterations:
+                break
+            # gain to reduce the error of each joint below the threshold in horizon steps: (1-k*dt)^horizon
+            ratio = np.clip(ei_threshold/np.maximum(np.abs(e), 1e-12), 0.0, 1.0)
+            k = np.clip((1 - ratio**(1/horizon))/delta_time, k_min, k_max)
+            u = np.clip(k * e, -qdmax, qdmax)
             self.set_joint_target_velocities(u)
-            self.simulation.client.step()
+            self.simulation.step()
+            steps += 1
+        self.settle_steps = steps
+        self.settle_time = steps*delta_time
+        self.settle_converged = converged
+        return self.settle_steps
 
     def get_min_distance_to_objects(self):
         """
@@ -292,8 +469,46 @@ class Robot():
         error, distance = self.simulation.sim.getFloatSignal('min_distance_to_objects')
         return distance
 
+    def start_odometry(self, pose=None, method='rk4'):
+        """
+        Starts integrating the wheel speeds at every simulation step (see wait).
+        CAUTION: the odometry is only integrated inside Robot.wait. The steps performed by other calls (for example
+        simulation.wait or simulation.step) are not integrated.
+        pose: initial pose [x, y, theta] of the robot.
+        """
+        self.odometry = self.build_odometry(pose=pose, method=method)
+        self.delta_time = self.simulation.get_simulation_time_step()
+
+    def build_odometry(self, pose=None, method='rk4'):
+        """
+        Differential drive by default (wheel_radius and width). The derived classes may return other models.
+        """
+        return DifferentialOdometry(wheel_radius=self.wheel_radius, width=self.width, pose=pose, method=method)
+
+    def get_wheel_speeds(self):
+        """
+        Wheel speeds used by the odometry, [wl, wr] for a differential robot. The derived classes map their joints.
+        The velocities are read in a single remote call (see Simulation.get_joint_velocities).
+        """
+        return self.simulation.get_joint_velocities(self.joints)
+
+    def update_odometry(self):
+        return self.odometry.update(self.get_wheel_speeds(), self.delta_time)
+
+    def get_odometry_pose(self):
+        return self.odometry.pose
+
     def wait(self, steps=1):
-        self.simulation.wait(steps=steps)
+        """
+        Wait n simulation steps. The odometry is updated after each step if it has been started (a single remote
+        call to read the wheel speeds per step).
+        """
+        if self.odometry is None:
+            self.simulation.wait(steps=steps)
+            return
+        for i in range(steps):
+            self.simulation.wait()
+            self.update_odometry()
 
     def wait_time(self, seconds):
         self.simulation.wait_time(seconds=seconds)
@@ -548,6 +763,7 @@ class Robot():
         return q_path, qd_path
 
     def plot_trajectories(self):
+        import matplotlib.pyplot as plt
         plt.figure()
         q_path = np.array(self.q_path)
         qd_path = np.array(self.qd_path)
@@ -652,6 +868,31 @@ class Robot():
         qds = np.array(qds).T
         return qs, qds
 
+    def get_joint_limits(self, qdfactor=1.0):
+        """
+        Max speeds, accelerations and jerks of the joints. If not defined in the derived class, the max acceleration
+        is reached in 0.2 s (as in path_trapezoidal_i) and the max jerk in 0.1 s.
+        """
+        n = len(self.joints)
+        qdmax = qdfactor*self.max_joint_speeds[0:n]
+        if self.max_joint_accelerations is not None:
+            qddmax = self.max_joint_accelerations[0:n]
+        else:
+            qddmax = qdmax/0.2
+        qdddmax = qddmax/0.1
+        return qdmax, qddmax, qdddmax
+
+    def path_plan_isochronous_smooth(self, q_target, qdfactor, profile='quintic'):
+        """
+        Plan an isochronous path from the current joint positions to q_target, starting and ending at rest, with a
+        quintic or a jerk limited (scurve) profile.
+        """
+        q_current = self.get_joint_positions()
+        qdmax, qddmax, qdddmax = self.get_joint_limits(qdfactor=qdfactor)
+        t, qs, qds = path_plan_isochronous_profile(q_current, q_target, qdmax, qddmax, qdddmax=qdddmax,
+                                                   profile=profile)
+        return qs, qds
+
     def path_plan_isochronous_trapezoidal(self, q_target, qdfactor, endpoint):
         """
         Plan an isochronous path in joint coordinates considering only a continuous speed.
@@ -662,6 +903,12 @@ class Robot():
         # get current positions and speeds
         q_current = self.get_joint_positions()
         qd_current = self.get_joint_speeds()
+        # if the robot starts and ends at rest, use the max speeds and accelerations of the joints
+        if endpoint and self.max_joint_accelerations is not None and np.all(np.abs(qd_current) < 0.01):
+            n = len(self.joints)
+            t, qs, qds = path_plan_isochronous_time_optimal(q_current, q_target, qdfactor*self.max_joint_speeds[0:n],
+                                                             self.max_joint_accelerations[0:n])
+            return qs, qds
         # find the time to complete the movement considering that
         # each joint works at a factor of its max speed
         t_times = []
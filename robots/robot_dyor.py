@@ -12,15 +12,12 @@ from robots.robot import Robot
 class RobotDyor(Robot):
     def __init__(self, simulation):
         Robot.__init__(self, simulation=simulation)
+        # wheel geometry (m). Please check these values if the scene is modified
+        self.wheel_radius = 0.035
+        self.width = 0.2
 
     def start(self, base_name='/ROBOT_DYOR'):
-        robotbase = self.simulation.sim.getObject(base_name)
-        wheel1 = self.simulation.sim.getObject(base_name + '/' + 'motor_L')
-        wheel2 = self.simulation.sim.getObject(base_name + '/' + 'motor_R')
-        wheeljoints = []
-        wheeljoints.append(wheel1)
-        wheeljoints.append(wheel2)
-        self.joints = wheeljoints
+        self.joints = self.simulation.get_objects([base_name + '/motor_L', base_name + '/motor_R'])
 
     def forward(self):
         wheel_speeds = [5, 5]
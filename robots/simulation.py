@@ -3,11 +3,27 @@
 """
 Stablish a connection with Coppelia.
 
+The handles of the objects are stored in a registry (by path), so that each path is resolved only once. The paths
+that are not in the registry are resolved in a single remote call (get_objects). The registry is cleared when the
+simulation is started or a scene is loaded.
+
+get_object_matrix reads the pose of an object with a single remote call. If the pose cache is enabled, the poses are
+stored until the next simulation step (see step), so that repeated reads within the same step are free.
+
+In stepping mode, each simulation step needs a request to Coppelia (client.step), so waiting n steps exactly costs
+n round trips. wait(steps, exact=False) lets the simulation run on the server instead (fewer requests, but the number
+of steps is not exact). wait_time computes the number of steps from the simulation time step (read once), instead of
+reading the simulation time before each step.
+wait_until finishes as soon as a Python condition is met (checked before each step) and wait_signal as soon as a
+signal is set by a script in the scene (read before each step).
+
+To reset a scene between runs without stopping the simulation, see robots.episodes.
+
 @Authors: Arturo Gil
 @Time: April 2021
 """
 import time
-from coppeliasim_zmqremoteapi_client import *
+import numpy as np
 
 
 class Simulation():
@@ -15,11 +31,22 @@ class Simulation():
         self.sim = None
         self.client = None
         self.simulation_speed = 3
+        # handle of each path
+        self.handles = {}
+        # number of simulation steps performed with step() and poses (4x4 arrays) read during the current step
+        self.steps = 0
+        self.pose_cache = None
+        # simulation time step (s), read once
+        self.time_step = None
+        # number of times that each batched (Lua) call could not be executed and was replaced by one call per item
+        self.lua_fallbacks = {}
 
     def start(self):
         """
         Connect python to the server running on Coppelia.
         """
+        # imported here, so that the rest of the classes can be used without the client (e.g. when replaying)
+        from coppeliasim_zmqremoteapi_client import RemoteAPIClient
         # Python connect to the V-REP client and start simulation
         self.client = RemoteAPIClient()
         self.sim = self.client.getObject('sim')
@@ -32,35 +59,234 @@ class Simulation():
         else:
             # try to stop the simulation if is in a zombie state
             self.sim.stopSimulation()
-            time.sleep(3)
+            self.wait_stopped()
             self.sim.startSimulation()
+        self.invalidate_handles()
+        self.time_step = None
         # apply stepping True after the simulation is actually created
         self.client.setStepping(True)
         # Modify simulation speed to get a nicer result
         # self.sim.setInt32Param(self.sim.intparam_speedmodifier, self.simulation_speed)
         print('CONNECTED TO COPPELIA!')
 
+    def wait_stopped(self, timeout=5.0):
+        """
+        Waits (polling the simulation state) until the simulation is stopped, or timeout seconds.
+        """
+        t0 = time.time()
+        while self.sim.getSimulationState() != self.sim.simulation_stopped:
+            if time.time() - t0 > timeout:
+                print('WARNING: THE SIMULATION DID NOT STOP IN ', timeout, ' s')
+                break
+            time.sleep(0.02)
+
+    def load_scene(self, filename):
+        """
+        Loads a scene. The handles of the previous scene are removed from the registry.
+        """
+        self.sim.loadScene(filename)
+        self.invalidate_handles()
+        self.time_step = None
+
+    def invalidate_handles(self):
+        self.handles = {}
+
+    def get_object(self, path, index=None):
+        """
+        Returns the handle of the object. If index is given, the handle of path[index] (index 0 is path itself, as in
+        the names of the copies of an object in Coppelia).
+        """
+        if index is not None and index > 0:
+            path = path + '[' + str(index) + ']'
+        handle = self.handles.get(path)
+        if handle is None:
+            handle = self.sim.getObject(path)
+            self.handles[path] = handle
+        return handle
+
+    def execute_lua(self, code):
+        """
+        Executes Lua code in Coppelia (a single remote call) and returns the value returned by the code.
+        The value is returned inside a table {pyarte = true, v = value}, so that it can be told apart from the result
+        code that some versions of Coppelia also return (result, value).
+        """
+        code = 'local function f() %s end return {pyarte = true, v = f()}' % code
+        result = self.sim.executeScriptString(code + '@lua', self.sim.scripttype_sandboxscript)
+        if isinstance(result, (list, tuple)) and len(result) == 2 and isinstance(result[1], dict):
+            result = result[1]
+        if not isinstance(result, dict) or not result.get('pyarte'):
+            raise Exception('execute_lua: unexpected result from executeScriptString: ' + repr(result))
+        return result.get('v')
+
+    def lua_fallback(self, name, error):
+        """
+        Counts the fallbacks of the batched call name. The error is printed the first time.
+        """
+        if name not in self.lua_fallbacks:
+            print('WARNING: ' + name + ': THE LUA CODE COULD NOT BE EXECUTED. USING ONE REMOTE CALL PER ITEM: ',
+                  error)
+        self.lua_fallbacks[name] = self.lua_fallbacks.get(name, 0) + 1
+
+    def get_objects(self, paths):
+        """
+        Returns the handles of a list of paths. The paths that are not in the registry are resolved in a single call
+        (see execute_lua). If the code cannot be executed, they are resolved one by one and the fallback is reported
+        (see lua_fallback).
+        """
+        missing = [path for path in paths if path not in self.handles]
+        if len(missing) > 1:
+            code = 'local r = {} for i, p in ipairs({%s}) do r[i] = sim.getObject(p) end return r' % \
+                   ','.join([repr(path) for path in missing])
+            try:
+                handles = self.execute_lua(code)
+                if len(handles) != len(missing):
+                    raise Exception('%d handles returned for %d paths' % (len(handles), len(missing)))
+                for path, handle in zip(missing, handles):
+                    self.handles[path] = int(handle)
+            except Exception as e:
+                self.lua_fallback('get_objects', e)
+        return [self.get_object(path) for path in paths]
+
+    def get_indexed_objects(self, path, n):
+        """
+        Handles of path, path[1], ..., path[n-1].
+        """
+        paths = [path] + [path + '[' + str(i) + ']' for i in range(1, n)]
+        return self.get_objects(paths)
+
+    def set_joint_target_velocities(self, handles, speeds):
+        """
+        Sets the target velocities of a list of joints in a single call (see execute_lua). If the code cannot be
+        executed, one call per joint is used and the fallback is reported (see lua_fallback).
+        """
+        code = 'local hs = {%s} local vs = {%s} for i, h in ipairs(hs) do sim.setJointTargetVelocity(h, vs[i]) end' % \
+               (','.join([str(h) for h in handles]), ','.join([repr(float(v)) for v in speeds]))
+        try:
+            self.execute_lua(code)
+        except Exception as e:
+            self.lua_fallback('set_joint_target_velocities', e)
+            for h, v in zip(handles, speeds):
+                self.sim.setJointTargetVelocity(h, float(v))
+
+    def get_joint_velocities(self, handles):
+        """
+        Returns the velocities of a list of joints, read in a single call (see execute_lua). If the code cannot be
+        executed, one call per joint is used and the fallback is reported (see lua_fallback).
+        """
+        code = 'local r = {} for i, h in ipairs({%s}) do r[i] = sim.getJointVelocity(h) end return r' % \
+               ','.join([str(h) for h in handles])
+        try:
+            speeds = self.execute_lua(code)
+            if len(speeds) != len(handles):
+                raise Exception('%d velocities returned for %d joints' % (len(speeds), len(handles)))
+        except Exception as e:
+            self.lua_fallback('get_joint_velocities', e)
+            speeds = [self.sim.getJointVelocity(h) for h in handles]
+        return np.array(speeds, dtype=float)
+
+    def enable_pose_cache(self, enabled=True):
+        """
+        CAUTION: with the cache enabled, the objects must only be moved by the simulation steps (or by the set methods
+        of CoppeliaObject, that remove the object from the cache).
+        """
+        self.pose_cache = {} if enabled else None
+
+    def get_object_matrix(self, handle):
+        """
+        Returns the pose (4x4 array) of the object with respect to the world, with a single remote call.
+        """
+        if self.pose_cache is not None:
+            T = self.pose_cache.get(handle)
+            if T is not None:
+                return T
+        m = self.sim.getObjectMatrix(handle, -1)
+        T = np.array([[m[0], m[1], m[2], m[3]],
+                      [m[4], m[5], m[6], m[7]],
+                      [m[8], m[9], m[10], m[11]],
+                      [0.0, 0.0, 0.0, 1.0]])
+        if self.pose_cache is not None:
+            self.pose_cache[handle] = T
+        return T
+
+    def invalidate_pose(self, handle):
+        if self.pose_cache is not None:
+            self.pose_cache.pop(handle, None)
+
+    def step(self):
+        """
+        Perform a simulation step. The cached poses are not valid after the step.
+        """
+        self.client.step()
+        self.steps += 1
+        if self.pose_cache:
+            self.pose_cache = {}
+
     def stop(self):
         print('STOPPING SIMULATION!')
         self.sim.stopSimulation()
 
-    def wait(self, steps=1):
+    def wait(self, steps=1, exact=True, period=0.005):
         """
-        Wait n simulation steps.
+        Wait n simulation steps. Returns the number of steps performed.
+        exact=True: each step is a request to Coppelia (client.step), so waiting n steps costs n round trips. The remote
+        API has no request that advances exactly n steps.
+        exact=False: the stepping mode is disabled and the simulation runs on the server until the simulation time has
+        advanced n steps (read every period seconds of wall time). Long waits need fewer requests, but the simulation
+        may run some steps beyond n, the steps are computed from the simulation time and the number of requests
+        depends on the wall time, so the run cannot be replayed in strict mode (robots.remote_recorder).
         """
-        for i in range(0, steps):
-            self.client.step()
+        if exact or steps <= 1:
+            for i in range(0, steps):
+                self.step()
+            return steps
+        delta_time = self.get_simulation_time_step()
+        t0 = self.sim.getSimulationTime()
+        self.client.setStepping(False)
+        try:
+            while self.sim.getSimulationTime() - t0 < (steps - 0.5) * delta_time:
+                time.sleep(period)
+        finally:
+            self.client.setStepping(True)
+        performed = int(round((self.sim.getSimulationTime() - t0) / delta_time))
+        self.steps += performed
+        if self.pose_cache:
+            self.pose_cache = {}
+        return performed
 
-    def wait_time(self, seconds=1):
+    def wait_time(self, seconds=1, exact=True):
         """
-        Wait in seconds
+        Wait in seconds. The number of steps is computed with the simulation time step (see wait).
         """
-        t1 = self.sim.getSimulationTime()
-        while True:
-            t2 = self.sim.getSimulationTime()
-            if (t2-t1) >= seconds:
-                break
-            self.client.step()
+        steps = int(np.ceil(seconds / self.get_simulation_time_step() - 1e-9))
+        return self.wait(steps=steps, exact=exact)
+
+    def wait_until(self, condition, max_steps=100):
+        """
+        Performs simulation steps until condition() is True (checked before each step) or max_steps are performed.
+        Returns the number of steps performed.
+        CAUTION: the condition is evaluated in Python, so each step needs the requests of the condition and the step.
+        To wait for a condition evaluated in Coppelia, set a signal from a script in the scene and use wait_signal.
+        """
+        for i in range(max_steps):
+            if condition():
+                return i
+            self.step()
+        return max_steps
+
+    def wait_signal(self, name, value=None, max_steps=100):
+        """
+        Performs simulation steps until the integer signal name is set in Coppelia (or until it is equal to value, if
+        given), or until max_steps simulation steps have been performed. Returns the number of steps performed.
+        The signal is read before each step (one request for the signal and one for the step), so that the number of
+        steps is exact and the run can be replayed (robots.remote_recorder). The remote API does not offer a call that
+        blocks until a signal is set, and a Lua script executed remotely would block the simulation.
+        """
+        def condition():
+            signal = self.sim.getInt32Signal(name)
+            return signal is not None and (value is None or signal == value)
+        return self.wait_until(condition, max_steps=max_steps)
 
     def get_simulation_time_step(self):
-        return self.sim.getSimulationTimeStep()
+        if self.time_step is None:
+            self.time_step = self.sim.getSimulationTimeStep()
+        return self.time_step
@@ -14,6 +14,7 @@ from artelib import homogeneousmatrix
 from artelib.homogeneousmatrix import HomogeneousMatrix
 from artelib.inverse_kinematics import delta_q
 from artelib.seriallink import SerialRobot
+from artelib.dynamics import RobotDynamics, uniform_link_inertias
 from artelib.tools import compute_kinematic_errors
 from robots.robot import Robot
 from kinematics.kinematics_ur5 import eval_symbolic_jacobian_UR5
@@ -30,6 +31,9 @@ class RobotUR5(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([180, 180, 180, 180, 180, 180, 180])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([800, 800, 800, 800, 800, 800])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges
         joint_ranges = np.array([[-360, -360, -360, -360, -360, -360],
                                  [360,   360,  360,  360,  360,  360]])
@@ -51,25 +55,16 @@ class RobotUR5(Robot):
         self.serialrobot.append(th=-np.pi / 2, d=0.11, a=0, alpha=-np.pi / 2, link_type='R')
         self.serialrobot.append(th=0, d=0.09465, a=0, alpha=np.pi / 2, link_type='R')
         self.serialrobot.append(th=-np.pi / 2, d=0.08295, a=0, alpha=0, link_type='R')
+        # inertial parameters: masses of the links (kg). The centers of mass and inertia tensors are approximated by
+        # uniform cylinders between the origins of the DH systems
+        masses = np.array([3.7, 8.393, 2.275, 1.219, 1.219, 0.1879])
+        coms, inertias = uniform_link_inertias(self.serialrobot, masses)
+        self.dynamics = RobotDynamics(self.serialrobot, masses, coms, inertias)
 
 
     def start(self, base_name='/UR5', joint_name='joint'):
-        robotbase = self.simulation.sim.getObject(base_name)
-        q1 = self.simulation.sim.getObject(base_name + '/' + joint_name + '1')
-        q2 = self.simulation.sim.getObject(base_name + '/' + joint_name + '2')
-        q3 = self.simulation.sim.getObject(base_name + '/' + joint_name + '3')
-        q4 = self.simulation.sim.getObject(base_name + '/' + joint_name + '4')
-        q5 = self.simulation.sim.getObject(base_name + '/' + joint_name + '5')
-        q6 = self.simulation.sim.getObject(base_name + '/' + joint_name + '6')
-
-        joints = []
-        joints.append(q1)
-        joints.append(q2)
-        joints.append(q3)
-        joints.append(q4)
-        joints.append(q5)
-        joints.append(q6)
-        self.joints = joints
+        # handles resolved in a single call
+        self.joints = self.simulation.get_objects([base_name + '/' + joint_name + str(i) for i in range(1, 7)])
 
     def get_symbolic_jacobian(self, q):
         J, Jv, Jw = eval_symbolic_jacobian_UR5(q)
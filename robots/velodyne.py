@@ -15,7 +15,7 @@ class Velodyne():
         self.handle = None
 
     def start(self, name='velodyneVPL_16'):
-        handle = self.simulation.sim.getObject(name)
+        handle = self.simulation.get_object(name)
         self.handle = handle
 
     def get_laser_data(self):
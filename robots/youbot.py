@@ -8,6 +8,7 @@ Please open the scenes/youbot.ttt scene before running this script.
 
 """
 from robots.robot import Robot
+from artelib.odometry import MecanumOdometry
 import numpy as np
 
 
@@ -23,18 +24,19 @@ class YouBotBase(Robot):
         # complete all data from base class
         self.epsilonq = 0.005
         self.r = 0.045 # mecanum wheel radius/swedish
-        # self.b =
+        # half distance between front and rear wheels and half distance between left and right wheels
+        self.lx = 0.2355
+        self.ly = 0.15
 
     def start(self, base_name='/youBot', joint_name='youBotArmJoint'):
         armjoints = []
         # Get the handles of the relevant objects
-        robotbase = self.simulation.sim.getObject(base_name)
-        youbotref = self.simulation.sim.getObject('/youBot/youBot_ref')
-        # handles to the wheels
-        fl = self.simulation.sim.getObject(base_name + '/rollingJoint_fl')
-        rl = self.simulation.sim.getObject(base_name + '/rollingJoint_rl')
-        rr = self.simulation.sim.getObject(base_name + '/rollingJoint_rr')
-        fr = self.simulation.sim.getObject(base_name + '/rollingJoint_fr')
+        # handles of the base, the reference and the wheels, resolved in a single call
+        robotbase, youbotref, fl, rl, rr, fr = self.simulation.get_objects([base_name, '/youBot/youBot_ref',
+                                                                            base_name + '/rollingJoint_fl',
+                                                                            base_name + '/rollingJoint_rl',
+                                                                            base_name + '/rollingJoint_rr',
+                                                                            base_name + '/rollingJoint_fr'])
         wheeljoints = [fl, rl, rr, fr]
 
         # must store the joints
@@ -59,11 +61,30 @@ class YouBotBase(Robot):
         self.simulation.sim.setJointTargetVelocity(self.wheeljoints[3], -forwardspeed + leftrigthspeed + rotspeed)
 
     def get_true_position_and_orientation(self):
-        error, position = self.simulation.sim.getObjectPosition(objectHandle=self.dummy, relativeToObjectHandle=-1)
-        error, orientation = self.simulation.sim.simxGetObjectOrientation(objectHandle=self.dummy,
-                                             relativeToObjectHandle=-1)
+        position = self.simulation.sim.getObjectPosition(self.dummy, -1)
+        orientation = self.simulation.sim.getObjectOrientation(self.dummy, -1)
         return position, orientation
 
+    def get_wheel_matrix(self):
+        """
+        Matrix that maps the speed of the base [vx, vy, w] (m/s, m/s, rad/s) to the speeds of the wheels
+        [fl, rl, rr, fr].
+        It is built from the wheel directions used in set_base_speed. In set_base_speed, positive leftrigthspeed moves
+        the robot to the right and positive rotspeed turns clockwise.
+        """
+        M = np.array([[1, -1, -1],
+                      [-1, 1, -1],
+                      [-1, -1, 1],
+                      [-1, 1, 1]])
+        scale = np.diag([1, -1, -(self.lx + self.ly)])
+        return np.dot(M, scale) / self.r
+
+    def build_odometry(self, pose=None, method='rk4'):
+        return MecanumOdometry(wheel_matrix=self.get_wheel_matrix(), pose=pose, method=method)
+
+    def get_wheel_speeds(self):
+        return self.simulation.get_joint_velocities(self.wheeljoints)
+
 
 class YouBotArm(Robot):
     def __init__(self, simulation):
@@ -78,6 +99,9 @@ class YouBotArm(Robot):
         # maximum joint speeds (rad/s)
         max_joint_speeds = np.array([100, 100, 100, 100, 100, 100])
         self.max_joint_speeds = max_joint_speeds * np.pi / 180.0
+        # max joint accelerations (deg/s^2)
+        max_joint_accelerations = np.array([300, 300, 300, 300, 300, 300])
+        self.max_joint_accelerations = max_joint_accelerations * np.pi / 180.0
         # max and min joint ranges. joints 4 and 6 can be configured as unlimited
         # default joint limits:
         # q1 (+-180), q2 (-90,110), q3 (-230, 50), q4 (+-200), q5 (+-115), q6 (+-400)
@@ -88,24 +112,10 @@ class YouBotArm(Robot):
 
 
     def start(self, base_name='/youBot', joint_name='youBotArmJoint'):
-        armjoints = []
-        # Get the handles of the relevant objects
-        robotbase = self.simulation.sim.getObject(base_name)
-
-        q1 = self.simulation.sim.getObject(base_name + '/' + joint_name + '0')
-        q2 = self.simulation.sim.getObject(base_name + '/' + joint_name + '1')
-        q3 = self.simulation.sim.getObject(base_name + '/' + joint_name + '2')
-        q4 = self.simulation.sim.getObject(base_name + '/' + joint_name + '3')
-        q5 = self.simulation.sim.getObject(base_name + '/' + joint_name + '4')
-        # handles to the armjoints
-        armjoints.append(q1)
-        armjoints.append(q2)
-        armjoints.append(q3)
-        armjoints.append(q4)
-        armjoints.append(q5)
-
+        # Get the handles of the base and the arm joints (resolved in a single call)
+        handles = self.simulation.get_objects([base_name] + [base_name + '/' + joint_name + str(i) for i in range(5)])
         # must store the joints
-        self.joints = armjoints
-        self.base = robotbase
+        self.joints = handles[1:]
+        self.base = handles[0]
         self.joint_directions = [1, -1, -1, -1, 1]
 
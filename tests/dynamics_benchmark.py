@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Evaluations per second of the dynamics of the UR5 robot (artelib.dynamics): inverse dynamics (RNEA), mass matrix
+(CRBA) and forward dynamics, evaluating one sample per call and a whole batch of samples in a single call.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import time
+import numpy as np
+from robots.ur5 import RobotUR5
+
+
+def rate(function, n_samples, repetitions=3):
+    best = np.inf
+    for k in range(repetitions):
+        t0 = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - t0)
+    return n_samples / best
+
+
+def benchmark():
+    robot = RobotUR5(simulation=None)
+    dynamics = robot.dynamics
+    rng = np.random.default_rng(0)
+    for B in [1, 100, 10000]:
+        q = rng.uniform(-np.pi, np.pi, (B, 6))
+        qd = rng.normal(size=(B, 6))
+        qdd = rng.normal(size=(B, 6))
+        print('BATCH OF ', B, ' SAMPLES')
+        print('    RNEA: %.0f evaluations/s' % rate(lambda: dynamics.inverse_dynamics(q, qd, qdd), B))
+        print('    CRBA: %.0f evaluations/s' % rate(lambda: dynamics.mass_matrix(q), B))
+        print('    Forward dynamics: %.0f evaluations/s' % rate(lambda: dynamics.forward_dynamics(q, qd, qdd), B))
+    # one call per sample
+    n = 1000
+    q = rng.uniform(-np.pi, np.pi, (n, 6))
+
+    def single():
+        for i in range(n):
+            dynamics.inverse_dynamics(q[i], q[i], q[i])
+    print('RNEA, one sample per call: %.0f evaluations/s' % rate(single, n))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Benchmark of the grid planners in artelib.grid_planning on large random maps (2000x2000 cells by default).
+The time to compute the cost map (distance transform) and the time of A* and Dijkstra are printed.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import time
+import numpy as np
+from artelib.grid_planning import astar, dijkstra, clearance_cost, simplify_path
+
+
+def random_map(n, n_obstacles, seed=0):
+    """
+    A square map with random rectangular obstacles. The corners are kept free.
+    """
+    rng = np.random.default_rng(seed)
+    occupied = np.zeros((n, n), dtype=bool)
+    for i in range(n_obstacles):
+        r, c = rng.integers(0, n, 2)
+        h, w = rng.integers(n // 100, n // 20, 2)
+        occupied[r:r + h, c:c + w] = True
+    occupied[0:n // 20, 0:n // 20] = False
+    occupied[-n // 20:, -n // 20:] = False
+    return occupied
+
+
+def benchmark(n=2000, n_obstacles=400, run_dijkstra=False):
+    occupied = random_map(n, n_obstacles)
+    start = (5, 5)
+    goal = (n - 5, n - 5)
+    print('MAP: ', n, 'x', n, ' OBSTACLE CELLS: ', np.sum(occupied))
+
+    t0 = time.perf_counter()
+    cost_map = clearance_cost(occupied, robot_radius=3, influence_radius=10)
+    t1 = time.perf_counter()
+    print('Clearance cost map: ', t1 - t0, ' s')
+
+    t0 = time.perf_counter()
+    path = astar(occupied, start, goal, cost_map=cost_map)
+    t1 = time.perf_counter()
+    print('A* with cost map: ', t1 - t0, ' s. Path cells: ', len(path))
+
+    t0 = time.perf_counter()
+    path = astar(occupied, start, goal)
+    t1 = time.perf_counter()
+    print('A*: ', t1 - t0, ' s. Path cells: ', len(path))
+
+    t0 = time.perf_counter()
+    waypoints = simplify_path(occupied, path)
+    t1 = time.perf_counter()
+    print('Path simplification: ', t1 - t0, ' s. Waypoints: ', len(waypoints))
+
+    if run_dijkstra:
+        t0 = time.perf_counter()
+        path = dijkstra(occupied, start, goal)
+        t1 = time.perf_counter()
+        print('Dijkstra: ', t1 - t0, ' s. Path cells: ', len(path))
+
+
+if __name__ == "__main__":
+    benchmark(n=500, n_obstacles=100, run_dijkstra=True)
+    benchmark(n=2000, n_obstacles=400)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Measures the time needed to import the robots and the main modules of artelib. Each import is executed in a new
+Python interpreter (so that the modules are not cached) several times and the minimum time is reported.
+It also reports whether the heavy optional modules (matplotlib, open3d, cv2, PIL) are loaded by the import. They
+should only be loaded when plotting, using point clouds or processing images.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import os
+import subprocess
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['matplotlib', 'open3d', 'cv2', 'PIL']
+IMPORTS = ['import numpy',
+           'from artelib.homogeneousmatrix import HomogeneousMatrix',
+           'from robots.abbirb140 import RobotABBIRB140',
+           'from robots.ur5 import RobotUR5',
+           'from robots.camera import Camera']
+
+SCRIPT = '''
+import sys, time
+t0 = time.perf_counter()
+%s
+t = time.perf_counter() - t0
+print(t)
+print('LOADED:' + ','.join([m for m in %s if m in sys.modules]))
+'''
+
+
+def import_time(statement, repetitions=5):
+    """
+    Returns the min time (s) of the import and the heavy modules that were loaded.
+    """
+    times = []
+    loaded = ''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    for i in range(repetitions):
+        output = subprocess.run([sys.executable, '-c', SCRIPT % (statement, HEAVY_MODULES)], cwd=ROOT, env=env,
+                                capture_output=True, text=True)
+        if output.returncode != 0:
+            return None, output.stderr.strip().split('\n')[-1]
+        lines = output.stdout.strip().split('\n')
+        times.append(float(lines[-2]))
+        loaded = lines[-1][len('LOADED:'):]
+    return np.min(times), loaded
+
+
+if __name__ == "__main__":
+    print('%-60s %10s   %s' % ('IMPORT', 'TIME(ms)', 'HEAVY MODULES LOADED'))
+    for statement in IMPORTS:
+        t, loaded = import_time(statement)
+        if t is None:
+            print('%-60s %10s   %s' % (statement, 'ERROR', loaded))
+        else:
+            print('%-60s %10.1f   %s' % (statement, 1000 * t, loaded))
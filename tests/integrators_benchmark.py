@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Accuracy and speed of the integrators in artelib.integrators:
+- Error of Euler, RK4 and RK45 (adaptive) for a harmonic oscillator with a known solution.
+- Forward dynamics of a batch of UR5 arms holding their position with a computed torque controller.
+  The real time factor is the simulated time (of all the arms) divided by the computation time.
+- Kinematics of a batch of mobile bases.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import time
+import numpy as np
+from artelib.integrators import integrate, integrate_adaptive, arm_dynamics, planar_base
+from robots.ur5 import RobotUR5
+
+
+def oscillator(t, x):
+    return np.stack((x[..., 1], -x[..., 0]), axis=-1)
+
+
+def accuracy():
+    print('HARMONIC OSCILLATOR, 10 s')
+    x0 = np.array([1.0, 0.0])
+    exact = np.array([np.cos(10), -np.sin(10)])
+    for method in ['euler', 'rk4']:
+        for h in [0.1, 0.01]:
+            t, xs = integrate(oscillator, x0, 0, 10, h, method=method)
+            print('    %s h=%.2f: %d steps, error %.2e' % (method, h, len(t) - 1, np.linalg.norm(xs[-1] - exact)))
+    for rtol in [1e-4, 1e-8]:
+        t, xs, rejected = integrate_adaptive(oscillator, x0, 0, 10, rtol=rtol, atol=rtol)
+        print('    rk45 rtol=%.0e: %d steps (%d rejected), error %.2e' % (rtol, len(t) - 1, rejected,
+                                                                       np.linalg.norm(xs[-1] - exact)))
+
+
+def arms(B=100, T=2.0, h=0.01):
+    robot = RobotUR5(simulation=None)
+    dynamics = robot.dynamics
+    rng = np.random.default_rng(0)
+    q_ref = rng.uniform(-np.pi, np.pi, (B, 6))
+
+    def controller(t, q, qd):
+        return dynamics.inverse_dynamics(q, qd, 25 * (q_ref - q) - 10 * qd)
+
+    x0 = np.hstack((q_ref + 0.1 * rng.normal(size=(B, 6)), np.zeros((B, 6))))
+    t0 = time.perf_counter()
+    t, xs = integrate(arm_dynamics(dynamics, controller), x0, 0, T, h, method='rk4')
+    elapsed = time.perf_counter() - t0
+    print('UR5 FORWARD DYNAMICS, %d ARMS, %.1f s, RK4 h=%.3f' % (B, T, h))
+    print('    computation time: %.2f s, real time factor: %.1f' % (elapsed, B * T / elapsed))
+    print('    max final error: %.2e rad' % np.amax(np.abs(xs[-1][:, 0:6] - q_ref)))
+
+
+def bases(B=10000, T=10.0, h=0.05):
+    rng = np.random.default_rng(0)
+    u = rng.normal(size=(B, 3))
+    t0 = time.perf_counter()
+    t, xs = integrate(planar_base(lambda t: u), np.zeros((B, 3)), 0, T, h, method='rk4')
+    elapsed = time.perf_counter() - t0
+    print('MOBILE BASE KINEMATICS, %d BASES, %.1f s, RK4 h=%.3f' % (B, T, h))
+    print('    computation time: %.3f s, real time factor: %.0f' % (elapsed, B * T / elapsed))
+
+
+if __name__ == "__main__":
+    accuracy()
+    arms()
+    bases()
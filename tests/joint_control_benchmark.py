@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Benchmark of the joint speed controllers (artelib.joint_control.JointPID) on a simple model of speed controlled
+joints (JointModel). The IRB140 follows a minimum time trajectory and, next, a precision phase with a proportional
+control until the error is lower than 0.001 rad. For each set of gains, the RMS and max tracking errors and the
+total time (trajectory + precision phase) are printed.
+The last line uses as feedforward the mean speed between samples, (q[i+1]-q[i])/delta_time, instead of the planned
+speed at each sample.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.joint_control import JointPID, JointModel
+from artelib.path_planning import path_plan_isochronous_time_optimal
+from robots.abbirb140 import RobotABBIRB140
+
+
+def run(controller, qs, qds, tau, qdmax, delta_time=0.05, max_settle_steps=100):
+    model = JointModel(qs.shape[0], tau=tau, qdmax=qdmax, delta_time=delta_time)
+    model.q = qs[:, 0].copy()
+    controller.reset()
+    errors = []
+    for i in range(qs.shape[1] - 1):
+        u = controller.compute(qs[:, i], qds[:, i], model.q)
+        model.step(u)
+        # the command at sample i takes the joints to the reference at sample i+1
+        errors.append(qs[:, i + 1] - model.q)
+    errors = np.array(errors)
+    # precision phase
+    settle = 0
+    for settle in range(max_settle_steps):
+        e = qs[:, -1] - model.q
+        if np.linalg.norm(e) < 0.001:
+            break
+        model.step(5.5 * e)
+    rms = np.sqrt(np.mean(np.sum(errors ** 2, axis=1)))
+    max_error = np.amax(np.linalg.norm(errors, axis=1))
+    total_time = (qs.shape[1] + settle) * delta_time
+    return rms, max_error, total_time
+
+
+def benchmark():
+    robot = RobotABBIRB140(simulation=None)
+    n = 6
+    qdmax = robot.max_joint_speeds
+    q0 = np.zeros(n)
+    q1 = np.array([-np.pi / 2, np.pi / 8, np.pi / 8, np.pi / 8, np.pi / 8, np.pi / 8])
+    t, qs, qds = path_plan_isochronous_time_optimal(q0, q1, qdmax, robot.max_joint_accelerations)
+    controllers = {'default (kp=5.5, kd=0.4)': JointPID(kp=5.5, ki=0, kd=0.4),
+                   'P (kp=5.5)': JointPID(kp=5.5, ki=0, kd=0),
+                   'no feedforward': JointPID(kp=5.5, ki=0, kd=0.4, kff=0.0),
+                   'high gain (kp=10)': JointPID(kp=10, ki=0, kd=0.4),
+                   'PID + anti windup': JointPID(kp=5.5, ki=5.0, kd=0.4, integral_limit=0.05, output_limit=qdmax)}
+    for tau in [0.01, 0.05, 0.1]:
+        print('JOINT TIME CONSTANT: ', tau, ' s. TRAJECTORY TIME: ', t[-1], ' s')
+        for name, controller in controllers.items():
+            rms, max_error, total_time = run(controller, qs, qds, tau=tau, qdmax=qdmax)
+            print('    %-26s RMS error: %.5f  max error: %.5f  total time: %.2f s' % (name, rms, max_error,
+                                                                                   total_time))
+        qds_mean = np.hstack((np.diff(qs, axis=1) / 0.05, np.zeros((n, 1))))
+        rms, max_error, total_time = run(JointPID(kp=5.5, ki=0, kd=0.4), qs, qds_mean, tau=tau, qdmax=qdmax)
+        print('    %-26s RMS error: %.5f  max error: %.5f  total time: %.2f s' % ('default, mean speed', rms,
+                                                                               max_error, total_time))
+
+
+if __name__ == "__main__":
+    benchmark()
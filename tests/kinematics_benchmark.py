@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Micro-benchmarks of the kinematics of artelib and the robots: direct kinematics, manipulator Jacobian, inverse
+kinematics of each robot, quaternions (rot2quaternion, slerp), trapezoidal profiles, filter_path and
+inversekinematics_line.
+
+Each case is run with a fixed random seed. After some warm-up calls, the time per call of each repetition (of at least
+50 ms) is measured. The repetitions are interleaved: each round measures all the cases once, so that a period of high
+load of the machine affects a round and not all the repetitions of a case. The statistics (min, median, mean, std, in
+microseconds) are saved in tests/kinematics_benchmark_results.json and compared with a stored baseline. The minimum time
+is compared, since it is the least affected by the load of the machine. The ratios are normalized by the ratio of a
+reference case (a loop of small numpy operations), so that a machine that is globally slower (or loaded) does not
+produce false regressions. The cases that are more than a 30 % slower than the baseline are reported as regressions.
+
+Usage:
+    python tests/kinematics_benchmark.py             # run and compare with the baseline
+    python tests/kinematics_benchmark.py baseline    # run and store the results as the new baseline
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+from artelib.euler import Euler
+from artelib.path_planning import random_q, filter_path, path_trapezoidal_i
+from artelib.tools import rot2quaternion, slerp
+from artelib.vector import Vector
+from robots.abbirb140 import RobotABBIRB140
+from robots.abbirb4600 import RobotABBIRB4600
+from robots.kukalbr import RobotKUKALBR
+from robots.ur5 import RobotUR5
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(DIRECTORY, 'kinematics_benchmark_results.json')
+BASELINE_FILE = os.path.join(DIRECTORY, 'kinematics_benchmark_baseline.json')
+TOLERANCE = 0.3
+
+
+def calibrate(function, calls, warmup=3, min_time=0.05):
+    """
+    Returns the number of calls of a repetition: all the inputs i in [0, calls) are used the same number of times and
+    the repetition lasts at least min_time seconds. The output of the function (prints) is discarded.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        for i in range(warmup):
+            function(i % calls)
+        t_call = (time.perf_counter() - t0) / warmup
+    return calls * int(np.ceil(min_time / max(t_call * calls, 1e-9)))
+
+
+def measure_once(function, calls, number):
+    """
+    Returns the time per call (us) of a repetition of number calls.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        for i in range(number):
+            function(i % calls)
+        return (time.perf_counter() - t0) / number * 1e6
+
+
+def statistics(times, number):
+    times = np.array(times)
+    return {'calls': number,
+            'repetitions': len(times),
+            'min_us': float(np.min(times)),
+            'median_us': float(np.median(times)),
+            'mean_us': float(np.mean(times)),
+            'std_us': float(np.std(times))}
+
+
+def reference(i):
+    """
+    Fixed workload used to normalize the speed of the machine.
+    """
+    A = np.eye(4) + 0.001 * i
+    for k in range(10):
+        A = np.dot(A, A) / np.linalg.norm(A)
+    return A
+
+
+def random_targets(robot, n):
+    """
+    Reachable targets: the poses of the robot at n random joint positions.
+    """
+    targets = []
+    for i in range(n):
+        T = robot.directkinematics(random_q(robot))
+        targets.append((T.pos(), T.R()))
+    return targets
+
+
+def cases():
+    """
+    Returns the list of (name, function(i), calls) to be measured.
+    """
+    np.random.seed(0)
+    irb140 = RobotABBIRB140(simulation=None)
+    irb4600 = RobotABBIRB4600(simulation=None)
+    ur5 = RobotUR5(simulation=None)
+    kuka = RobotKUKALBR(simulation=None)
+    robots = [('irb140', irb140), ('irb4600', irb4600), ('ur5', ur5), ('kukalbr', kuka)]
+    n = 100
+    result = [('reference', reference, n)]
+    for name, robot in robots:
+        qs = [random_q(robot) for i in range(n)]
+        result.append(('%s.serialrobot.directkinematics' % name,
+                       lambda i, robot=robot, qs=qs: robot.serialrobot.directkinematics(qs[i]), n))
+        result.append(('%s.directkinematics' % name, lambda i, robot=robot, qs=qs: robot.directkinematics(qs[i]), n))
+        result.append(('%s.manipulator_jacobian' % name,
+                       lambda i, robot=robot, qs=qs: robot.manipulator_jacobian(qs[i]), n))
+    # inverse kinematics
+    targets = random_targets(irb140, n)
+    result.append(('irb140.inversekinematics',
+                   lambda i: irb140.inversekinematics(targets[i][0], targets[i][1], extended=True), n))
+    targets4600 = random_targets(irb4600, n)
+    result.append(('irb4600.inversekinematics',
+                   lambda i: irb4600.inversekinematics(targets4600[i][0], targets4600[i][1], extended=True), n))
+    targets_ur5 = random_targets(ur5, n)
+    result.append(('ur5.inversekinematics', lambda i: ur5.inversekinematics(targets_ur5[i][0], targets_ur5[i][1]), n))
+    targets_kuka = random_targets(kuka, 10)
+    q0_kuka = np.zeros(7)
+    result.append(('kukalbr.inversekinematics',
+                   lambda i: kuka.inversekinematics(targets_kuka[i][0], targets_kuka[i][1], q0_kuka), 10))
+    # quaternions
+    Rs = [irb140.directkinematics(random_q(irb140)).R() for i in range(n)]
+    Qs = [R.Q() for R in Rs]
+    result.append(('rot2quaternion', lambda i: rot2quaternion(Rs[i].toarray()), n))
+    result.append(('slerp', lambda i: slerp(Qs[i], Qs[(i + 1) % n], 0.3), n))
+    # planning
+    qA = np.random.uniform(-np.pi, np.pi, n)
+    qB = np.random.uniform(-np.pi, np.pi, n)
+    result.append(('path_trapezoidal_i', lambda i: path_trapezoidal_i(qA[i], qB[i], 0.0, 2.0, endpoint=True), n))
+    q0 = np.array([0, 0, 0, 0, np.pi / 2, 0])
+    qs_ik = [irb140.inversekinematics(targets[i][0], targets[i][1], extended=True) for i in range(n)]
+    result.append(('filter_path', lambda i: filter_path(irb140, q0, [np.copy(q) for q in qs_ik[0:10]]), 10))
+    line_position = Vector([0.5, 0.1, 0.4])
+    line_orientation = Euler([0, np.pi, 0])
+    result.append(('irb140.inversekinematics_line',
+                   lambda i: irb140.inversekinematics_line(q0, line_position, line_orientation), 3))
+    return result
+
+
+def compare(results, baseline):
+    regressions = []
+    speed = results['reference']['min_us'] / baseline['reference']['min_us']
+    print('SPEED OF THE MACHINE (REFERENCE CASE) WITH RESPECT TO THE BASELINE: %.2f' % (1 / speed))
+    print('%-40s %12s %12s %8s' % ('CASE', 'MIN(us)', 'BASELINE', 'RATIO'))
+    for name in results:
+        t = results[name]['min_us']
+        if name not in baseline:
+            print('%-40s %12.1f %12s %8s' % (name, t, '-', '-'))
+            continue
+        ratio = t / baseline[name]['min_us'] / speed
+        flag = ''
+        if ratio > 1 + TOLERANCE:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        print('%-40s %12.1f %12.1f %8.2f%s' % (name, t, baseline[name]['min_us'], ratio, flag))
+    return regressions
+
+
+def benchmark(save_baseline=False, repetitions=15):
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        all_cases = cases()
+    numbers = [calibrate(function, calls) for name, function, calls in all_cases]
+    times = [[] for case in all_cases]
+    for k in range(repetitions):
+        for i in range(len(all_cases)):
+            name, function, calls = all_cases[i]
+            times[i].append(measure_once(function, calls, numbers[i]))
+    for i in range(len(all_cases)):
+        name = all_cases[i][0]
+        results[name] = statistics(times[i], numbers[i])
+        print('%-40s min %10.1f us  median %10.1f us  std %8.1f us' % (name, results[name]['min_us'],
+                                                                      results[name]['median_us'],
+                                                                      results[name]['std_us']))
+    data = {'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'results': results}
+    with open(RESULTS_FILE, 'w') as file:
+        json.dump(data, file, indent=2)
+    if save_baseline:
+        with open(BASELINE_FILE, 'w') as file:
+            json.dump(data, file, indent=2)
+        print('BASELINE SAVED IN ', BASELINE_FILE)
+        return []
+    if not os.path.exists(BASELINE_FILE):
+        print('NO BASELINE FOUND. RUN: python tests/kinematics_benchmark.py baseline')
+        return []
+    with open(BASELINE_FILE, 'r') as file:
+        baseline = json.load(file)['results']
+    regressions = compare(results, baseline)
+    if len(regressions) > 0:
+        print('REGRESSIONS: ', regressions)
+    else:
+        print('NO REGRESSIONS FOUND')
+    return regressions
+
+
+if __name__ == "__main__":
+    regressions = benchmark(save_baseline=len(sys.argv) > 1 and sys.argv[1] == 'baseline')
+    sys.exit(1 if len(regressions) > 0 else 0)
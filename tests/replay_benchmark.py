@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# encoding: utf-8
+r"""
+Records the remote calls of an application and replays them without Coppelia (robots.remote_recorder).
+
+The application must create its Simulation with robots.simulation.Simulation(). This script replaces that class
+before importing the application, so that the application does not need to be modified.
+
+Record (with Coppelia running and the scene of the application open):
+    python tests/replay_benchmark.py record practicals/applications/irb140_palletizing_color.py pick_and_place \
+        palletizing.pkl.gz
+Replay and measure the time of the Python side of the application:
+    python tests/replay_benchmark.py replay practicals/applications/irb140_palletizing_color.py pick_and_place \
+        palletizing.pkl.gz
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import importlib.util
+import sys
+import time
+import robots.simulation
+from robots.remote_recorder import RecordingSimulation, ReplaySimulation
+
+
+def load_application(filename):
+    spec = importlib.util.spec_from_file_location('application', filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(mode, filename, function_name, recording, repetitions=3):
+    if mode == 'record':
+        robots.simulation.Simulation = lambda: RecordingSimulation(recording)
+        repetitions = 1
+    else:
+        robots.simulation.Simulation = lambda: ReplaySimulation(recording)
+    application = load_application(filename)
+    times = []
+    for i in range(repetitions):
+        t0 = time.perf_counter()
+        getattr(application, function_name)()
+        times.append(time.perf_counter() - t0)
+    print('EXECUTION TIMES (s): ', times)
+    print('BEST: ', min(times))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] not in ['record', 'replay']:
+        print('USAGE: replay_benchmark.py record|replay application.py function recording.pkl.gz')
+        sys.exit(1)
+    run(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4])
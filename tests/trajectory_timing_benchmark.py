@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script does not need a Coppelia Scene.
+
+Compares the cycle time of the joint movements (moveAbsJ/moveJ) of the IRB140 palletizing practical
+(practicals/applications/solutions/irb140_palletizing_solution.py) when planned with:
+    - the trapezoidal profile with fixed acceleration times Ta=Td=0.2 s (time_trapezoidal_path_i).
+    - the minimum time profile considering the max speeds and accelerations of the joints
+      (path_plan_isochronous_time_optimal).
+The linear movements (moveL) are not considered, since they are equal in both cases.
+
+@Authors: Arturo Gil
+@Time: October 2026
+"""
+import numpy as np
+from artelib.euler import Euler
+from artelib.homogeneousmatrix import HomogeneousMatrix
+from artelib.path_planning import compute_3D_coordinates, filter_path, time_trapezoidal_path_i, \
+    path_plan_isochronous_time_optimal
+from artelib.rotationmatrix import RotationMatrix
+from artelib.vector import Vector
+from robots.abbirb140 import RobotABBIRB140
+
+
+def closest_ik(robot, q_current, position, orientation):
+    q_target = robot.inversekinematics(target_position=position, target_orientation=orientation, q0=q_current,
+                                       extended=True)
+    return filter_path(robot, q_current, [q_target])[:, 0]
+
+
+def palletizing_joint_moves(robot, n_pieces=24):
+    """
+    Returns the list of (q_start, q_target, qdfactor) of the joint movements of the palletizing practical.
+    """
+    q_pick0 = np.array([0, 0, 0, 0, np.pi / 2, 0])
+    q_place0 = np.zeros(6)
+    tp1 = Vector([0.6, 0.04, 0.3])
+    to1 = Euler([0, np.pi, 0])
+    T0m = HomogeneousMatrix(Vector([-0.15, -0.65, 0.15]), Euler([0, 0, 0]))
+    moves = []
+    q = q_pick0
+    for i in range(n_pieces):
+        # pick: moveAbsJ(q0) + moveJ(tp1), the moveL keep the robot at tp1
+        moves.append((q, q_pick0, 1.0))
+        q_tp1 = closest_ik(robot, q_pick0, tp1, to1)
+        moves.append((q_pick0, q_tp1, 1.2))
+        # place: moveAbsJ(zeros) + moveJ(T0)
+        moves.append((q_tp1, q_place0, 1.0))
+        pi = compute_3D_coordinates(index=i, n_x=3, n_y=4, n_z=2, piece_length=0.08, piece_gap=0.02)
+        T0 = T0m * HomogeneousMatrix(pi + np.array([0, 0, 2.5 * 0.08]), Euler([0, np.pi, 0]))
+        q = closest_ik(robot, q_place0, T0.pos(), T0.R())
+        moves.append((q_place0, q, 1.0))
+    return moves
+
+
+def benchmark():
+    robot = RobotABBIRB140(simulation=None)
+    robot.set_TCP(HomogeneousMatrix(Vector([0, 0, 0.19]), RotationMatrix(np.eye(3))))
+    moves = palletizing_joint_moves(robot)
+    delta_time = 0.05
+    total_fixed = 0.0
+    total_optimal = 0.0
+    max_speed_ratio = 0.0
+    max_acceleration_ratio = 0.0
+    for q_start, q_target, qdfactor in moves:
+        qdmax = qdfactor * robot.max_joint_speeds
+        times = [time_trapezoidal_path_i(q_start[i], q_target[i], 0.0, qdmax[i], endpoint=True) for i in range(6)]
+        total_fixed += np.amax(times)
+        t, qs, qds = path_plan_isochronous_time_optimal(q_start, q_target, qdmax, robot.max_joint_accelerations,
+                                                        delta_time=delta_time)
+        total_optimal += t[-1]
+        # check the limits
+        max_speed_ratio = max(max_speed_ratio, np.amax(np.abs(qds) / qdmax[:, None]))
+        if qds.shape[1] > 1:
+            qdds = np.diff(qds, axis=1) / delta_time
+            max_acceleration_ratio = max(max_acceleration_ratio,
+                                         np.amax(np.abs(qdds) / robot.max_joint_accelerations[:, None]))
+    print('PALLETIZING: ', len(moves), ' joint movements')
+    print('Fixed Ta=Td=0.2 s trapezoidal profile. Total time: ', total_fixed, ' s')
+    print('Minimum time profile. Total time: ', total_optimal, ' s')
+    print('Cycle time reduction: ', 100 * (total_fixed - total_optimal) / total_fixed, ' %')
+    print('Max speed/max_joint_speeds: ', max_speed_ratio)
+    print('Max acceleration/max_joint_accelerations (finite differences): ', max_acceleration_ratio)
+
+
+if __name__ == "__main__":
+    benchmark()